@@ -0,0 +1,574 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+#
+# Persistent per-host connection broker.
+#
+# Every oracle_* task pays a full database logon (dedicated server fork, authentication, NLS setup)
+# before it runs a single lookup. When ANSIBLE_ORACLE_BROKER is set in the task environment,
+# oracleConnection does not connect by itself, it leases an already authenticated session from
+# a broker process running on the target host under the same OS user.
+#
+# The broker listens on a Unix socket in a private directory (mode 0700) in $TMPDIR,
+# keeps idle sessions keyed by connect descriptor/user/mode and exits after the idle timeout.
+# Oracle Client reads TNS_ADMIN and NLS_* once per process, so one broker is started per set of their values
+# (the socket name carries a digest of them) and a task never gets sessions set up with another environment.
+# Sessions which executed PL/SQL or a statement of oracle_sql, issued ALTER SESSION or SET ROLE (container switch,
+# NLS, roles, package state, ...) are never reused.
+# The broker can be stopped at the end of a playbook using the oracle_broker module.
+#
+# Everything the daemon needs must be imported at module level, the module payload
+# (AnsiballZ) is removed from disk while the broker is still running.
+#
+
+import errno
+import fcntl
+import hashlib
+import os
+import pickle
+import re
+import socket
+import struct
+import tempfile
+import threading
+import time
+
+try:
+    import cx_Oracle
+except ImportError:
+    cx_oracle_exists = False
+else:
+    cx_oracle_exists = True
+
+from ansible_collections.ibre5041.ansible_oracle_modules.plugins.module_utils.oracle_session import connect_session, session_settings, apply_session_settings, is_call_timeout
+
+
+BROKER_ENV = 'ANSIBLE_ORACLE_BROKER'
+BROKER_IDLE_ENV = 'ANSIBLE_ORACLE_BROKER_IDLE'
+BROKER_IDLE_TIMEOUT = 300
+BROKER_START_TIMEOUT = 10
+
+# Session state changes which must not leak into the next task, PL/SQL can change any of them
+DIRTY_SESSION_RE = re.compile(r'^\s*(alter\s+session|set\s+role|begin|declare|call)\s', re.IGNORECASE)
+
+# Environment read by Oracle Client once per process, besides NLS_* variables
+BROKER_CLIENT_ENV = ('TNS_ADMIN', 'ORA_SDTZ', 'ORA_TZFILE')
+
+# Version of requests understood by the broker, part of the socket name, so a task never talks to an older broker
+BROKER_PROTOCOL = 2
+
+
+def broker_enabled():
+    return os.environ.get(BROKER_ENV, '').lower() in ('1', 'true', 'yes', 'on')
+
+
+def broker_idle_timeout():
+    try:
+        return int(os.environ.get(BROKER_IDLE_ENV, BROKER_IDLE_TIMEOUT))
+    except ValueError:
+        return BROKER_IDLE_TIMEOUT
+
+
+def broker_dir():
+    return os.path.join(tempfile.gettempdir(), 'ansible-oracle-broker-{}'.format(os.geteuid()))
+
+
+def broker_environment():
+    """ Client environment the broker process must share with the task """
+    return sorted((k, v) for k, v in os.environ.items() if k in BROKER_CLIENT_ENV or k.startswith('NLS_'))
+
+
+def broker_socket_path():
+    digest = hashlib.sha256(repr((BROKER_PROTOCOL, broker_environment())).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(broker_dir(), 'broker-{}.sock'.format(digest))
+
+
+def broker_socket_paths():
+    """ Sockets of all brokers of this user, one per client environment """
+    try:
+        names = os.listdir(broker_dir())
+    except OSError:
+        return []
+    return sorted(os.path.join(broker_dir(), n) for n in names if n.startswith('broker-') and n.endswith('.sock'))
+
+
+def ensure_broker_dir():
+    """ Create private broker directory, refuse to use a directory owned by somebody else """
+    path = broker_dir()
+    try:
+        os.mkdir(path, 0o700)
+    except OSError as e:
+        if e.errno != errno.EEXIST:
+            raise
+    st = os.lstat(path)
+    if st.st_uid != os.geteuid() or st.st_mode & 0o077:
+        raise OSError(errno.EPERM, 'Insecure broker directory', path)
+    return path
+
+
+class brokerError(object):
+    """ Mimics cx_Oracle _Error, so DatabaseError raised by the broker client is handled like a local one """
+
+    def __init__(self, code, message):
+        self.code = code
+        self.message = message
+
+    def __str__(self):
+        return self.message
+
+
+class brokerUnavailable(Exception):
+    pass
+
+
+def send_message(sock, message):
+    data = pickle.dumps(message, protocol=2)
+    sock.sendall(struct.pack('!I', len(data)) + data)
+
+
+def recv_message(sock):
+    header = _recv_exactly(sock, 4)
+    if header is None:
+        return None
+    (length,) = struct.unpack('!I', header)
+    data = _recv_exactly(sock, length)
+    if data is None:
+        return None
+    return pickle.loads(data)
+
+
+def _recv_exactly(sock, length):
+    chunks = []
+    while length:
+        chunk = sock.recv(min(length, 65536))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        length -= len(chunk)
+    return b''.join(chunks)
+
+
+class brokerClient:
+    """ Connection to the broker, holds one leased database session until closed """
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.version = None
+        self.reused = False
+
+    @classmethod
+    def connect(cls, timeout=BROKER_START_TIMEOUT):
+        """ Connect to running broker, spawn a new one when none is listening """
+        path = broker_socket_path()
+        try:
+            ensure_broker_dir()
+            return cls(cls._open_socket(path))
+        except (OSError, socket.error):
+            pass
+
+        try:
+            spawn_broker(broker_idle_timeout())
+        except OSError as e:
+            raise brokerUnavailable('Could not start connection broker: {}'.format(e))
+
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                return cls(cls._open_socket(path))
+            except (OSError, socket.error):
+                time.sleep(0.05)
+        raise brokerUnavailable('Connection broker did not start within {}s'.format(timeout))
+
+    @staticmethod
+    def _open_socket(path):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(path)
+        except (OSError, socket.error):
+            sock.close()
+            raise
+        return sock
+
+    def call(self, op, **kwargs):
+        kwargs['op'] = op
+        try:
+            send_message(self.sock, kwargs)
+            response = recv_message(self.sock)
+        except (OSError, socket.error) as e:
+            response = None
+            reason = 'Connection broker failed: {}'.format(e)
+        else:
+            reason = 'Connection broker closed connection'
+        if response is None:
+            if self.version is None:
+                raise brokerUnavailable(reason)
+            # The leased session is lost, report it like any other database error
+            raise cx_Oracle.DatabaseError(brokerError(0, reason))
+        if 'error' in response:
+            code, message = response['error']
+            raise cx_Oracle.DatabaseError(brokerError(code, message))
+        return response
+
+    def lease(self, connect_args, mode, oracle_home=None, oracle_sid=None, settings=None):
+        """ Lease authenticated session, raises cx_Oracle.DatabaseError when logon fails """
+        response = self.call('lease', connect_args=connect_args, mode=mode,
+                             oracle_home=oracle_home, oracle_sid=oracle_sid, settings=settings)
+        self.version = response['version']
+        self.reused = response['reused']
+        return self
+
+    def select(self, sql, params, fetchone=False, arraysize=None):
+        response = self.call('select', sql=sql, params=params, fetchone=fetchone, arraysize=arraysize)
+        return response['columns'], response['rows']
+
+    def open_cursor(self, sql, params, arraysize=None, prefetchrows=None):
+        """ Execute query, return its column names, rows are fetched by fetch() arraysize rows per request """
+        return self.call('open', sql=sql, params=params, arraysize=arraysize, prefetchrows=prefetchrows)['columns']
+
+    def fetch(self):
+        """ Next batch of rows of the query executed by open_cursor(), empty list at the end """
+        return self.call('fetch')['rows']
+
+    def close_cursor(self):
+        self.call('close')
+
+    def ddl(self, sql):
+        self.call('ddl', sql=sql)
+
+    def executemany(self, sql, rows):
+        response = self.call('executemany', sql=sql, rows=rows)
+        return response['rowcounts'], response['errors']
+
+    def statement(self, sql, params=None):
+        return self.call('statement', sql=sql, params=params)['output_lines']
+
+    def close(self):
+        try:
+            self.sock.close()
+        except (OSError, socket.error):
+            pass
+
+
+def query_brokers(op='status'):
+    """ Send administrative request (status, shutdown) to every running broker, return list of their responses """
+    responses = []
+    for path in broker_socket_paths():
+        response = query_broker(op, path)
+        if response is not None:
+            responses.append(response)
+    return responses
+
+
+def query_broker(op='status', path=None):
+    """ Send administrative request (status, shutdown) to a running broker, return None when none is running """
+    path = path or broker_socket_path()
+    if not os.path.exists(path):
+        return None
+    try:
+        sock = brokerClient._open_socket(path)
+    except (OSError, socket.error):
+        return None
+    try:
+        send_message(sock, {'op': op})
+        return recv_message(sock)
+    finally:
+        sock.close()
+
+
+def spawn_broker(idle_timeout):
+    """ Double fork a detached broker daemon, returns in the calling process once the first child exited """
+    pid = os.fork()
+    if pid:
+        os.waitpid(pid, 0)
+        return
+    try:
+        os.setsid()
+        if os.fork():
+            os._exit(0)
+        os.chdir('/')
+        os.umask(0o077)
+        # Ansible waits for EOF on module stdout/stderr, release them
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        os.closerange(3, 1024)
+        brokerServer(broker_socket_path(), idle_timeout).serve()
+    finally:
+        os._exit(0)
+
+
+def _output_type_handler(cursor, name, default_type, size, precision, scale):
+    # LOB locators are not picklable, fetch them as plain values
+    if default_type == cx_Oracle.CLOB:
+        return cursor.var(cx_Oracle.LONG_STRING, arraysize=cursor.arraysize)
+    if default_type == cx_Oracle.BLOB:
+        return cursor.var(cx_Oracle.LONG_BINARY, arraysize=cursor.arraysize)
+
+
+class brokerSession:
+
+    def __init__(self, conn, digest):
+        self.conn = conn
+        self.digest = digest
+        self.dirty = False
+        self.last_used = time.time()
+        self.cursor = None  # query of the client opened by open request
+
+
+class brokerServer:
+    """ Broker daemon, one thread per client, sessions kept idle until idle_timeout """
+
+    def __init__(self, path, idle_timeout):
+        self.path = path
+        self.idle_timeout = idle_timeout
+        self.idle = {}          # key -> [brokerSession]
+        self.clients = 0
+        self.last_activity = time.time()
+        self.lock = threading.Lock()
+        self.connect_lock = threading.Lock()
+        self.running = True
+
+    def serve(self):
+        lock_file = open(self.path + '.lock', 'w')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except (OSError, IOError):
+            return  # Another broker won the race
+
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.path)
+        os.chmod(self.path, 0o600)
+        listener.listen(16)
+        listener.settimeout(1)
+
+        try:
+            while self.running:
+                try:
+                    sock, _ = listener.accept()
+                except socket.timeout:
+                    self.expire_idle()
+                    continue
+                with self.lock:
+                    self.clients += 1
+                    self.last_activity = time.time()
+                t = threading.Thread(target=self.handle_client, args=(sock,))
+                t.daemon = True
+                t.start()
+        finally:
+            listener.close()
+            os.unlink(self.path)
+            self.close_all()
+            lock_file.close()
+
+    def expire_idle(self):
+        now = time.time()
+        with self.lock:
+            for key in list(self.idle):
+                for session in [s for s in self.idle[key] if now - s.last_used > self.idle_timeout]:
+                    self.idle[key].remove(session)
+                    self.close_session(session)
+                if not self.idle[key]:
+                    del self.idle[key]
+            if not self.clients and now - self.last_activity > self.idle_timeout:
+                self.running = False
+
+    def close_all(self):
+        with self.lock:
+            for sessions in self.idle.values():
+                for session in sessions:
+                    self.close_session(session)
+            self.idle = {}
+
+    @staticmethod
+    def close_session(session):
+        try:
+            session.conn.close()
+        except Exception:
+            pass
+
+    def handle_client(self, sock):
+        key = session = None
+        try:
+            while True:
+                request = recv_message(sock)
+                if request is None:
+                    break
+                op = request.get('op')
+                try:
+                    if op == 'lease':
+                        key, session, response = self.lease(request)
+                    elif op in ('status', 'shutdown'):
+                        response = self.status()
+                        if op == 'shutdown':
+                            self.running = False
+                    elif session is None:
+                        response = {'error': (0, 'No database session leased')}
+                    elif op == 'select':
+                        response = self.select(session, request)
+                    elif op == 'open':
+                        response = self.open_cursor(session, request)
+                    elif op == 'fetch':
+                        response = self.fetch(session)
+                    elif op == 'close':
+                        response = self.close_cursor(session)
+                    elif op == 'ddl':
+                        response = self.ddl(session, request)
+                    elif op == 'statement':
+                        response = self.statement(session, request)
+                    elif op == 'executemany':
+                        response = self.executemany(session, request)
+                    else:
+                        response = {'error': (0, 'Unknown broker request {}'.format(op))}
+                except cx_Oracle.DatabaseError as e:
+                    error = e.args[0]
+                    if session is not None and is_call_timeout(error):
+                        session.dirty = True  # cancelled call may leave the session in unknown state
+                    response = {'error': (getattr(error, 'code', 0), getattr(error, 'message', str(error)))}
+                send_message(sock, response)
+        except (OSError, socket.error, EOFError, pickle.PickleError):
+            pass
+        finally:
+            sock.close()
+            self.release(key, session)
+
+    def status(self):
+        with self.lock:
+            return {'pid': os.getpid(),
+                    'clients': self.clients - 1,  # without the client asking
+                    'idle_sessions': sum(len(s) for s in self.idle.values()),
+                    'idle_timeout': self.idle_timeout}
+
+    def lease(self, request):
+        connect_args = tuple(request['connect_args'])
+        mode = request['mode']
+        oracle_home = request.get('oracle_home')
+        oracle_sid = request.get('oracle_sid')
+        settings = request.get('settings') or session_settings()
+        # The password is part of connect_args, it is never used as key, only its digest is compared
+        digest = hashlib.sha256(repr(connect_args).encode('utf-8')).hexdigest()
+        user = connect_args[0] if connect_args else None
+        dsn = connect_args[2] if len(connect_args) > 2 else None
+        key = (user, dsn, mode, oracle_home, oracle_sid)
+
+        with self.lock:
+            sessions = self.idle.get(key, [])
+            while sessions:
+                session = sessions.pop()
+                if session.digest == digest:
+                    apply_session_settings(session.conn, settings)
+                    return key, session, {'version': session.conn.version, 'reused': True}
+                self.close_session(session)
+
+        # ORACLE_SID/ORACLE_HOME decide which instance is used for bequeath connections
+        with self.connect_lock:
+            for name, value in (('ORACLE_HOME', oracle_home), ('ORACLE_SID', oracle_sid)):
+                if value:
+                    os.environ[name] = value
+            conn = connect_session(connect_args, mode, settings)
+        conn.autocommit = True
+        conn.outputtypehandler = _output_type_handler
+        return key, brokerSession(conn, digest), {'version': conn.version, 'reused': False}
+
+    def release(self, key, session):
+        with self.lock:
+            self.clients -= 1
+            self.last_activity = time.time()
+            if session is None:
+                return
+            self.close_cursor(session)
+            if session.dirty:
+                self.close_session(session)
+                return
+            session.last_used = time.time()
+            self.idle.setdefault(key, []).append(session)
+
+    @staticmethod
+    def select(session, request):
+        with session.conn.cursor() as cursor:
+            if request.get('arraysize'):
+                cursor.arraysize = request['arraysize']
+            cursor.execute(request['sql'], request.get('params') or {})
+            columns = [description[0] for description in cursor.description]
+            if request.get('fetchone'):
+                rows = cursor.fetchone()
+            else:
+                rows = cursor.fetchall()
+        return {'columns': columns, 'rows': rows}
+
+    @staticmethod
+    def open_cursor(session, request):
+        """ Execute query on the cursor of the client, its rows are sent batch by batch on fetch requests """
+        brokerServer.close_cursor(session)
+        cursor = session.conn.cursor()
+        try:
+            if request.get('arraysize'):
+                cursor.arraysize = request['arraysize']
+            if request.get('prefetchrows') is not None and hasattr(cursor, 'prefetchrows'):  # cx_Oracle 8+
+                cursor.prefetchrows = request['prefetchrows']
+            cursor.execute(request['sql'], request.get('params') or {})
+        except cx_Oracle.DatabaseError:
+            cursor.close()
+            raise
+        session.cursor = cursor
+        return {'columns': [description[0] for description in cursor.description]}
+
+    @staticmethod
+    def fetch(session):
+        if session.cursor is None:
+            return {'error': (0, 'No open cursor')}
+        rows = session.cursor.fetchmany()
+        if not rows:
+            brokerServer.close_cursor(session)
+        return {'rows': rows}
+
+    @staticmethod
+    def close_cursor(session):
+        if session.cursor is not None:
+            try:
+                session.cursor.close()
+            except cx_Oracle.DatabaseError:
+                pass
+            session.cursor = None
+        return {}
+
+    @staticmethod
+    def ddl(session, request):
+        if DIRTY_SESSION_RE.match(request['sql']):
+            session.dirty = True
+        with session.conn.cursor() as cursor:
+            cursor.execute(request['sql'])
+        return {}
+
+    @staticmethod
+    def executemany(session, request):
+        with session.conn.cursor() as cursor:
+            cursor.executemany(request['sql'], request['rows'], batcherrors=True, arraydmlrowcounts=True)
+            errors = [(error.offset, error.code, error.message) for error in cursor.getbatcherrors()]
+            rowcounts = cursor.getarraydmlrowcounts()
+        return {'rowcounts': rowcounts, 'errors': errors}
+
+    @staticmethod
+    def statement(session, request):
+        statement = request['sql']
+        session.dirty = True  # arbitrary statement or PL/SQL of oracle_sql
+        output_lines = []
+        with session.conn.cursor() as cursor:
+            if 'dbms_output.put_line' in statement.lower():
+                cursor.callproc('dbms_output.enable', [None])
+                cursor.execute(statement, request.get('params') or {})
+                chunk_size = 100
+                lines_var = cursor.arrayvar(str, chunk_size)
+                num_lines_var = cursor.var(int)
+                num_lines_var.setvalue(0, chunk_size)
+                while True:
+                    cursor.callproc('dbms_output.get_lines', (lines_var, num_lines_var))
+                    num_lines = num_lines_var.getvalue()
+                    output_lines.extend(lines_var.getvalue()[:num_lines])
+                    if num_lines < chunk_size:
+                        break
+            else:
+                cursor.execute(statement, request.get('params') or {})
+        return {'output_lines': output_lines}
@@ -0,0 +1,182 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+#
+# Clusterware resource model shared by oracle_homes, oracle_gi_facts and crsstat.py (role oracle_crs_19c).
+#
+# A single `crsctl stat res -f` returns static attributes (like -p) together with state of every resource
+# instance (like -v); -p and -v are mutually exclusive in crsctl syntax, so calling it once per resource type
+# or per SID is replaced by one call per host, indexed by name, type, server, DB_UNIQUE_NAME and instance name.
+#
+# This file has no Ansible dependencies, crsstat.py imports it when copied next to it.
+#
+
+import re
+import socket
+import subprocess
+
+CRSCTL_TIMEOUT = 30
+
+# Attributes describing a single resource instance (one per server for local resources, per cardinality for cluster ones)
+INSTANCE_ATTRIBUTES = ('ID', 'LAST_SERVER', 'STATE', 'TARGET', 'STATE_DETAILS', 'INTERNAL_STATE', 'CARDINALITY_ID',
+                       'DEGREE_ID', 'LAST_STATE_CHANGE', 'RESTART_COUNT', 'FAILURE_COUNT', 'INSTANCE_COUNT')
+
+INSTANCE_NAME_ATTRIBUTES = ('GEN_USR_ORA_INST_NAME', 'USR_ORA_INST_NAME')
+
+SERVERNAME_RE = re.compile(r'^(\w+)@SERVERNAME\((.+)\)$')
+
+
+class crsResource:
+    """ Clusterware resource: attributes as dictionary and list of instances (dictionaries of INSTANCE_ATTRIBUTES) """
+
+    def __init__(self, name):
+        self.name = name
+        self.attributes = {'NAME': name}
+        self.instances = []
+
+    def __getitem__(self, key):
+        return self.attributes[key]
+
+    def get(self, key, default=None):
+        return self.attributes.get(key, default)
+
+    @property
+    def type(self):
+        return self.attributes.get('TYPE')
+
+    @property
+    def basetype(self):
+        """ 'local' for resources running on every server (CARDINALITY_ID is server name), 'cluster' otherwise """
+        for instance in self.instances:
+            cardinality = instance.get('CARDINALITY_ID', '')
+            if cardinality and not cardinality.isdigit():
+                return 'local'
+        return 'cluster'
+
+    def servers(self):
+        """ Names of servers where an instance of the resource runs or ran last time """
+        result = []
+        for instance in self.instances:
+            server = instance_server(instance)
+            if server and server not in result:
+                result.append(server)
+        return result
+
+    def instance_names(self):
+        """ {server or None: instance name} from (GEN_)USR_ORA_INST_NAME(@SERVERNAME(server)) attributes """
+        names = {}
+        for key, value in self.attributes.items():
+            if not value:
+                continue
+            m = SERVERNAME_RE.match(key)
+            if m and m.group(1) in INSTANCE_NAME_ATTRIBUTES:
+                names[m.group(2)] = value
+            elif key in INSTANCE_NAME_ATTRIBUTES:
+                names.setdefault(None, value)
+        return names
+
+
+def instance_server(instance):
+    """ Server of resource instance: from STATE (ONLINE on node1) or LAST_SERVER """
+    state = instance.get('STATE', '').split()
+    if len(state) >= 3 and state[1] == 'on':
+        return state[2]
+    return instance.get('LAST_SERVER') or None
+
+
+def instance_state(instance):
+    """ State of resource instance without server name, e.g. ONLINE, INTERMEDIATE """
+    state = instance.get('STATE', '').split()
+    return state[0] if state else ''
+
+
+class crsModel:
+    """ Resources of Clusterware/Oracle Restart parsed from output of crsctl stat res -f """
+
+    def __init__(self, resources=None):
+        self.resources = {}
+        self.by_type = {}
+        self.by_server = {}
+        self.by_db_unique_name = {}
+        self.by_instance_name = {}
+        for resource in resources or []:
+            self.add(resource)
+
+    @classmethod
+    def load(cls, crsctl, timeout=CRSCTL_TIMEOUT):
+        """ Execute crsctl once, model is empty when crsctl fails or does not finish in timeout seconds """
+        proc = subprocess.Popen([crsctl, 'stat', 'res', '-f'], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        try:
+            (stdout, stderr) = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            (stdout, stderr) = proc.communicate()
+        return cls.parse(stdout.decode('utf-8', 'replace'))
+
+    @classmethod
+    def parse(cls, text):
+        """
+        Parse NAME=VALUE blocks separated by empty lines. Blocks repeating NAME of a resource, or blocks without NAME
+        (verbose output), describe further instances of the previous resource.
+        """
+        resources = {}
+        resource = None
+        for block in re.split(r'\n\s*\n', text.replace('\r', '')):
+            attributes = {}
+            for line in block.splitlines():
+                if '=' in line:
+                    key, value = line.split('=', 1)
+                    attributes[key.strip()] = value.strip()
+            if not attributes:
+                continue
+            name = attributes.get('NAME')
+            if name:
+                if name not in resources:
+                    resources[name] = crsResource(name)
+                resource = resources[name]
+            if resource is None:
+                continue
+            for key, value in attributes.items():
+                if key not in INSTANCE_ATTRIBUTES:
+                    resource.attributes.setdefault(key, value)
+            instance = dict((key, attributes[key]) for key in INSTANCE_ATTRIBUTES if key in attributes)
+            if instance.get('STATE') or instance.get('LAST_SERVER'):
+                resource.instances.append(instance)
+        return cls(resources.values())
+
+    def add(self, resource):
+        self.resources[resource.name] = resource
+        self.by_type.setdefault(resource.type, []).append(resource)
+        for server in resource.servers():
+            self.by_server.setdefault(server, []).append(resource)
+        if resource.get('DB_UNIQUE_NAME'):
+            self.by_db_unique_name[resource['DB_UNIQUE_NAME'].upper()] = resource
+        for name in resource.instance_names().values():
+            self.by_instance_name.setdefault(name, []).append(resource)
+
+    def __len__(self):
+        return len(self.resources)
+
+    def resource(self, name):
+        return self.resources.get(name)
+
+    def of_type(self, *types):
+        """ Resources of given types, in order of names """
+        return sorted((r for t in types for r in self.by_type.get(t, [])), key=lambda r: r.name)
+
+    def on_server(self, server=None):
+        """ Resources having an instance on server (default: this host) """
+        if server is None:
+            server = socket.gethostname().split('.')[0]
+        return list(self.by_server.get(server, []))
+
+    def database(self, db_unique_name):
+        return self.by_db_unique_name.get(db_unique_name.upper())
+
+    def instance(self, instance_name, types=('ora.database.type', 'ora.asm.type')):
+        """ Resource of database (or ASM) having instance named instance_name, None when not found """
+        for resource in self.by_instance_name.get(instance_name, []):
+            if resource.type in types:
+                return resource
+        return None
@@ -12,14 +12,271 @@ import glob
 import subprocess
 import socket
 from pwd import getpwuid
-from xml.dom import minidom
+from xml.etree.ElementTree import iterparse
 from collections import namedtuple
 import json
+import stat
+import sys
+import tempfile
+import time
+from functools import lru_cache
+
+PROC_ROOT = '/proc'
+PMON_PREFIXES = ('ora_pmon_', 'asm_pmon_')
+
+#
+# Discovery cache: homes and SIDs found by list_crs_instances(), list_processes() and parse_oratab() are stored
+# in $TMPDIR/ansible-oracle-discovery-<euid>/discovery.json (mode 0600). The cache is used by discover()
+# as long as oratab, inventory.xml, ocr.loc, olr.loc, oraInst.loc were not modified, the set of pmon PIDs
+# is the same and the cache is younger than max. age. Then neither orabase nor crsctl is executed.
+# Running instances looked up for bequeath connections are cached in instances.json of the same directory.
+# ANSIBLE_ORACLE_DISCOVERY_CACHE in task environment: max. age in seconds, 0 disables the cache.
+#
+DISCOVERY_CACHE_ENV = 'ANSIBLE_ORACLE_DISCOVERY_CACHE'
+DISCOVERY_CACHE_MAX_AGE = 600
+DISCOVERY_FORMAT = 1
+
+try:
+    import cx_Oracle
+except ImportError:
+    cx_oracle_exists = False
+else:
+    cx_oracle_exists = True
+
+try:
+    from ansible_collections.ibre5041.ansible_oracle_modules.plugins.module_utils.oracle_crs import crsModel
+except ImportError:
+    crsModel = None
+
+# crsModel per crsctl path, CRS is queried once per module run
+CRS_MODELS = {}
+
+# Executed by probe_db_status() as oracle owner, prints result as JSON
+STATUS_PROBE = '''
+import json
+try:
+    import cx_Oracle
+except ImportError:
+    print(json.dumps({'driver': False}))
+    raise SystemExit(0)
+r = {'driver': True}
+try:
+    conn = cx_Oracle.connect('/', mode=cx_Oracle.SYSDBA)
+    cursor = conn.cursor()
+    cursor.execute('select status from v$instance')
+    r['STATUS'], = cursor.fetchone()
+    if r['STATUS'] in ('MOUNTED', 'OPEN'):
+        cursor.execute('select open_mode, database_role from v$database')
+        r['OPEN_MODE'], r['DATABASE_ROLE'] = cursor.fetchone()
+        cursor.execute("select count(*) from v$archive_dest where status = 'VALID' and target = 'STANDBY'")
+        r['ORA_DG_ON'], = cursor.fetchone()
+except cx_Oracle.Error as e:
+    r['error'] = str(e).strip()
+print(json.dumps(r))
+'''
+
+
+class dbStatusError(Exception):
+    """ Status of an instance could not be queried (database error, probe or sqlplus could not be executed) """
+
+
+def pmon_processes(proc_root=PROC_ROOT):
+    """
+    Yield (piddir, cmd_line) of database and ASM pmon processes.
+
+    Only /proc/<pid>/comm (max. 15 chars, does not touch memory of the process) is read for every process,
+    cmdline is read for pmon candidates only. On busy hosts with tens of thousands of dedicated servers
+    and parallel slaves this is much cheaper than reading cmdline of each process.
+    comm of pmon is truncated (ora_pmon_ + 6 chars), so ORACLE_SID is always taken from cmdline.
+    """
+    try:
+        entries = os.listdir(proc_root)
+    except EnvironmentError:
+        return
+    for pid in entries:
+        if not pid.isdigit():
+            continue
+        piddir = os.path.join(proc_root, pid)
+        try:
+            with open(os.path.join(piddir, 'comm')) as x:
+                comm = x.read()
+        except EnvironmentError:
+            continue  # process has gone
+        if not comm.startswith(PMON_PREFIXES):
+            continue
+        try:
+            with open(os.path.join(piddir, 'cmdline')) as x:
+                cmd_line = x.read().rstrip("\x00")
+        except EnvironmentError:
+            continue
+        if cmd_line.startswith(PMON_PREFIXES):
+            yield piddir, cmd_line
+
+
+@lru_cache(maxsize=None)
+def read_orabasetab(ORACLE_HOME):
+    """
+    Return (ORACLE_BASE, HOME_NAME, read_only) of ORACLE_HOME from $ORACLE_HOME/install/orabasetab, None when missing.
+    Line format is ORACLE_HOME:ORACLE_BASE:HOME_NAME:Y|N: where Y marks read-only Oracle home.
+    """
+    entries = []
+    try:
+        with open(os.path.join(ORACLE_HOME, 'install', 'orabasetab')) as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                fields = line.split(':') + ['', '', '', '']
+                if fields[1]:
+                    entries.append(fields)
+    except EnvironmentError:
+        return None
+    for fields in entries:
+        if fields[0].rstrip('/') == ORACLE_HOME.rstrip('/'):
+            break
+    else:
+        if not entries:
+            return None
+        fields = entries[0]  # home was moved or referenced by a symlink
+    return fields[1], fields[2], fields[3].upper() == 'Y'
+
+
+def run_home_binary(ORACLE_HOME, name):
+    """ Return first line of output of $ORACLE_HOME/bin/<name> (orabase, orabasehome) """
+    binary = os.path.join(ORACLE_HOME, 'bin', name)
+    result = None
+    if os.access(binary, os.X_OK):
+        proc = subprocess.Popen([binary], stdout=subprocess.PIPE, env={'ORACLE_HOME': ORACLE_HOME})
+        for line in iter(proc.stdout.readline, ''):
+            if line.strip():
+                result = line.strip().decode()
+            else:
+                break
+    return result
+
+
+@lru_cache(maxsize=None)
+def oracle_base(ORACLE_HOME):
+    """ ORACLE_BASE of ORACLE_HOME, from orabasetab, $ORACLE_HOME/bin/orabase is executed only when orabasetab is missing """
+    orabasetab = read_orabasetab(ORACLE_HOME)
+    if orabasetab:
+        return orabasetab[0]
+    return run_home_binary(ORACLE_HOME, 'orabase')
+
+
+@lru_cache(maxsize=None)
+def oracle_base_home(ORACLE_HOME):
+    """
+    ORACLE_BASE_HOME of ORACLE_HOME (directory holding dbs/, network/admin), like $ORACLE_HOME/bin/orabasehome:
+    $ORACLE_BASE/homes/<HOME_NAME> for read-only Oracle home, ORACLE_HOME otherwise
+    """
+    orabasetab = read_orabasetab(ORACLE_HOME)
+    if orabasetab:
+        ORACLE_BASE, HOME_NAME, read_only = orabasetab
+        return os.path.join(ORACLE_BASE, 'homes', HOME_NAME) if read_only and HOME_NAME else ORACLE_HOME
+    return run_home_binary(ORACLE_HOME, 'orabasehome')
+
+
+# Names of COMP elements of comps.xml which decide home_type
+HOME_TYPES = {'oracle.client': 'client', 'oracle.server': 'server', 'oracle.crs': 'crs', 'oracle.tg': 'gateway'}
+
+
+def inventory_homes(path):
+    """ Yield LOC of HOME elements of central inventory.xml, homes flagged REMOVED="T" are skipped """
+    for event, elem in iterparse(path, events=('start', 'end')):
+        if event == 'end':
+            elem.clear()
+        elif elem.tag == 'HOME' and elem.get('LOC') and elem.get('REMOVED', '').upper() != 'T':
+            yield elem.get('LOC')
+
+
+def comps_home_type(path):
+    """
+    Return home_type of ORACLE_HOME from its comps.xml: parsing stops at the first oracle.client/server/crs/tg COMP element,
+    otherwise NAME of the last COMP element is returned. Raises ValueError when there is no COMP element.
+    """
+    name = None
+    for event, elem in iterparse(path, events=('start', 'end')):
+        if event == 'end':
+            elem.clear()
+        elif elem.tag == 'COMP':
+            name = elem.get('NAME')
+            if name in HOME_TYPES:
+                return HOME_TYPES[name]
+    if name is None:
+        raise ValueError('No COMP element in {}'.format(path))
+    return name
+
+
+def discovery_cache_max_age():
+    value = os.environ.get(DISCOVERY_CACHE_ENV, '')
+    if value.lower() in ('false', 'no', 'off'):
+        return 0
+    try:
+        return int(value) if value else DISCOVERY_CACHE_MAX_AGE
+    except ValueError:
+        return DISCOVERY_CACHE_MAX_AGE
+
+
+def private_cache_dir(name):
+    """ Directory $TMPDIR/ansible-oracle-<name>-<euid> for cache files, refuse to use the directory when it is not ours """
+    path = os.path.join(tempfile.gettempdir(), 'ansible-oracle-%s-%d' % (name, os.geteuid()))
+    try:
+        os.mkdir(path, 0o700)
+    except OSError:
+        pass
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.geteuid() or stat.S_IMODE(st.st_mode) & 0o077:
+        raise OSError('Insecure cache directory %s' % path)
+    return path
+
+
+def write_private_json(path, data):
+    """ Write data as JSON atomically, readable by the owner only """
+    fd, tmp = tempfile.mkstemp(prefix='.tmp', dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, default=str)
+        os.rename(tmp, path)
+    except Exception:
+        os.unlink(tmp)
+        raise
+
+
+def discovery_cache_path():
+    return os.path.join(private_cache_dir('discovery'), 'discovery.json')
+
+
+def instances_cache_path():
+    return os.path.join(private_cache_dir('discovery'), 'instances.json')
+
+
+def load_instances_cache(max_age, proc_root=PROC_ROOT):
+    """
+    {ORACLE_SID: ORACLE_HOME} stored by running_instances(cache=True), None when the cache is older than max_age
+    or one of the cached pmon processes is gone. Only /proc/<pid>/cmdline of cached PIDs is read, no /proc scan,
+    so an instance started later is found when the cache expires.
+    """
+    try:
+        with open(instances_cache_path()) as f:
+            data = json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+    if data.get('format') != DISCOVERY_FORMAT or time.time() - data.get('created', 0) > max_age:
+        return None
+    for pid, cmd_line in data['pmon'].items():
+        try:
+            with open(os.path.join(proc_root, pid, 'cmdline')) as x:
+                if x.read().rstrip("\x00") != cmd_line:
+                    return None  # PID reused
+        except EnvironmentError:
+            return None
+    return data['instances']
 
 
 class oracle_homes():
 
-    def __init__(self, module=None):
+    def __init__(self, module=None, cache=False):
         self.facts_item = {}
         self.running_only = False
         self.open_only = False
@@ -35,6 +292,11 @@ class oracle_homes():
         self.orabase = None
         self.crsctl = None
         self.module = module  # possible reference onto AnsibleModule
+        self.cache_max_age = discovery_cache_max_age() if cache else 0
+        self.fingerprint = None
+        self.discovered = False
+        self.from_cache = False
+        self.parse_time = {}  # seconds spent parsing XML inventory files
 
         # Check whether CRS/HAS is installed
         try:
@@ -75,15 +337,78 @@ class oracle_homes():
                         (_, oraInventory,) = line.strip().split('=')
                         self.ora_inventory = oraInventory
 
-            from xml.dom import minidom
-            inv_tree = minidom.parse(os.path.join(self.ora_inventory, 'ContentsXML', 'inventory.xml'))
-            homes = inv_tree.getElementsByTagName('HOME')
+        except:
+            pass
+
+        if self.cache_max_age and self.load_cache():
+            return
+        self.parse_inventory()
+
+    def parse_inventory(self):
+        try:
+            path = os.path.join(self.ora_inventory, 'ContentsXML', 'inventory.xml')
+            started = time.time()
+            homes = list(inventory_homes(path))
+            self.parse_time[path] = round(time.time() - started, 6)
             for home in homes:
-                # TODO: skip for deleted ORACLE_HOME
-                self.add_home(home.attributes['LOC'].value)
+                self.add_home(home)
         except:
             pass
 
+    def discovery_fingerprint(self):
+        """ mtimes and sizes of files describing the installation and PIDs of running pmon processes """
+        files = ['/etc/oratab', '/etc/oracle/ocr.loc', '/etc/oracle/olr.loc', '/etc/oraInst.loc']
+        if self.ora_inventory:
+            files.append(os.path.join(self.ora_inventory, 'ContentsXML', 'inventory.xml'))
+        fingerprint = {}
+        for path in files:
+            try:
+                st = os.stat(path)
+                fingerprint[path] = [st.st_mtime_ns, st.st_size]
+            except OSError:
+                fingerprint[path] = None
+        fingerprint['pmon'] = sorted(os.path.basename(piddir) for piddir, _ in pmon_processes())
+        return fingerprint
+
+    def load_cache(self):
+        """ Populate homes and facts_item from the discovery cache, True when the cache is valid """
+        try:
+            self.fingerprint = self.discovery_fingerprint()
+            with open(discovery_cache_path()) as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return False
+        if data.get('format') != DISCOVERY_FORMAT or data.get('fingerprint') != self.fingerprint \
+                or time.time() - data.get('created', 0) > self.cache_max_age:
+            return False
+        self.homes = data['homes']
+        self.facts_item = data['facts_item']
+        self.discovered = self.from_cache = True
+        return True
+
+    def save_cache(self):
+        """ Write the discovery cache atomically, readable by the owner only """
+        try:
+            write_private_json(discovery_cache_path(),
+                               {'format': DISCOVERY_FORMAT, 'fingerprint': self.fingerprint, 'created': time.time(),
+                                'homes': self.homes, 'facts_item': self.facts_item})
+        except (IOError, OSError) as e:
+            self.module_warn('Discovery cache not written: {}'.format(e))
+
+    def discover(self):
+        """
+        list_crs_instances(), list_processes() and parse_oratab(),
+        when the object was created with cache=True the result is taken from/stored into discovery cache
+        """
+        if self.discovered:
+            return
+        self.list_crs_instances()
+        self.list_processes()
+        self.parse_oratab()
+        self.discovered = True
+        if self.cache_max_age and self.fingerprint is not None:
+            self.save_cache()
+
     def module_warn(self, msg):
         if self.module:
             self.module.warn(msg)
@@ -117,7 +442,11 @@ class oracle_homes():
                     attributes.update({key: value})
             except ValueError as e:
                 break
+        return self.crs_database(attributes)
 
+    def crs_database(self, attributes):
+        """ Return Database tuple of CRS resource attributes, None when ORACLE_SID is unknown """
+        attributes = dict((key, value) for key, value in attributes.items() if value)
         crsname = ORACLE_HOME = ORACLE_SID = DB_UNIQUE_NAME = None
         try:
             crsname = attributes['NAME'].split('.')[1]
@@ -168,7 +497,7 @@ class oracle_homes():
             return None
 
 
-    def list_processes(self):
+    def list_processes(self, proc_root=PROC_ROOT):
         """
         # Emulate trick form tanelpoder
         # https://tanelpoder.com/2011/02/28/finding-oracle-homes-with/
@@ -181,23 +510,13 @@ class oracle_homes():
         #
         # It s basically looking up all PMON process IDs and then using /proc/PID/exe link to find out where is the oracle binary of a running process located
         #
+        # pmon processes are found by pmon_processes(), proc_root is used by tests and benchmarks only
         """
-        for cmd_line_file in glob.glob('/proc/[0-9]*/cmdline'):
+        for piddir, cmd_line in pmon_processes(proc_root):
             ORACLE_SID = ORACLE_HOME = None
-            try:
-                with open(cmd_line_file) as x:
-                    cmd_line = x.read().rstrip("\x00")
-                    if not cmd_line.startswith('ora_pmon_') and not cmd_line.startswith('asm_pmon_'):
-                        continue
-                    _, _, ORACLE_SID = cmd_line.split('_', 2)
-
-                    piddir = os.path.dirname(cmd_line_file)
-                    exefile = os.path.join(piddir, 'exe')
-
-            except FileNotFoundError as e: # Python3
-            #except EnvironmentError as e: # Python2
-                #print("Missing file ignored: {} ({})".format(cmd_line_file, e))
-                continue
+            _, _, ORACLE_SID = cmd_line.split('_', 2)
+            cmd_line_file = os.path.join(piddir, 'cmdline')
+            exefile = os.path.join(piddir, 'exe')
 
             try:
                 if not os.path.islink(exefile):
@@ -213,22 +532,13 @@ class oracle_homes():
 
                 if self.crsctl:
                     if cmd_line.startswith('asm'):
-                        dfiltertype = 'ora.asm.type'
                         ORACLE_HOME = self.crs_home
                         self.add_sid(ORACLE_SID=ORACLE_SID, ORACLE_HOME=ORACLE_HOME, running=True)
                         continue
-                    dfiltertype = 'ora.database.type'
-                    dfilter = '((TYPE = {}) and ((GEN_USR_ORA_INST_NAME = {}) or (USR_ORA_INST_NAME = {}))'. \
-                        format(dfiltertype, ORACLE_SID, ORACLE_SID)
-                    proc = subprocess.Popen([self.crsctl, 'stat', 'res', '-p', '-w', dfilter], stdout=subprocess.PIPE)
-                    try:
-                        (stdout, stderr) = proc.communicate(timeout=10)
-                    except subprocess.TimeoutExpired:
-                        proc.kill()
-                        (stdout, stderr) = proc.communicate()
-                    lines = stdout.decode('utf-8').splitlines()
-                    while lines:
-                        db = self.parse_crs_output(lines)
+                    model = self.crs_model()
+                    resource = model.instance(ORACLE_SID, types=('ora.database.type',)) if model else None
+                    if resource:
+                        db = self.crs_database(resource.attributes)
                         if db:
                             ORACLE_HOME = db.ORACLE_HOME
                             self.add_sid(ORACLE_SID=db.ORACLE_SID,
@@ -251,38 +561,64 @@ class oracle_homes():
             self.add_sid(ORACLE_SID=ORACLE_SID, ORACLE_HOME=ORACLE_HOME, running=True)
 
 
-    def list_crs_instances(self):
-        if self.crsctl:
-            for dfiltertype in ['ora.database.type', 'ora.asm.type']:# NOTE does not report ORACLE_HOME
-                dfilter = '(TYPE = {})'.format(dfiltertype)
-                proc = subprocess.Popen([self.crsctl, 'stat', 'res', '-p', '-w', dfilter], stdout=subprocess.PIPE,
-                                        stderr=subprocess.PIPE)
-                try:
-                    (stdout, stderr) = proc.communicate(timeout=10)
-                except subprocess.TimeoutExpired:
-                    proc.kill()
-                    (stdout, stderr) = proc.communicate()
-                lines = stdout.decode('utf-8').splitlines()
-                while lines:
-                    db = self.parse_crs_output(lines)
-                    if db:
-                        self.add_sid(ORACLE_SID=db.ORACLE_SID,
-                                     ORACLE_HOME=db.ORACLE_HOME,
-                                     DB_UNIQUE_NAME=db.DB_UNIQUE_NAME,
-                                     crsname=db.crsname)
+    @staticmethod
+    def running_instances(proc_root=PROC_ROOT, cache=False):
+        """
+        Return {ORACLE_SID: ORACLE_HOME} of running database and ASM instances (pmon processes) on this host.
+        Unlike list_processes neither inventory, nor CRS, nor orabase is queried, ORACLE_HOME is None
+        when /proc/<pid>/exe is not readable (process owned by other user).
+        cache -- reuse the result stored in the discovery cache directory, see load_instances_cache()
+        """
+        max_age = discovery_cache_max_age() if cache else 0
+        if max_age:
+            instances = load_instances_cache(max_age, proc_root)
+            if instances is not None:
+                return instances
+        instances = {}
+        pmon = {}
+        for piddir, cmd_line in pmon_processes(proc_root):
+            _, _, ORACLE_SID = cmd_line.split('_', 2)
+            try:
+                oraclefile = os.readlink(os.path.join(piddir, 'exe'))
+                ORACLE_HOME = os.path.dirname(os.path.dirname(oraclefile))
+            except EnvironmentError:
+                ORACLE_HOME = None
+            instances[ORACLE_SID] = ORACLE_HOME
+            pmon[os.path.basename(piddir)] = cmd_line
+        if max_age:
+            try:
+                write_private_json(instances_cache_path(), {'format': DISCOVERY_FORMAT, 'created': time.time(),
+                                                            'pmon': pmon, 'instances': instances})
+            except (IOError, OSError):
+                pass
+        return instances
+
+    def crs_model(self, refresh=False):
+        """ crsModel of this host, crsctl is executed on first use only (or when refresh is True), None without CRS """
+        if not self.crsctl or crsModel is None:
+            return None
+        if refresh or self.crsctl not in CRS_MODELS:
+            CRS_MODELS[self.crsctl] = crsModel.load(self.crsctl)
+        return CRS_MODELS[self.crsctl]
+
+    def list_crs_instances(self, refresh=False):
+        model = self.crs_model(refresh)
+        if model:
+            for resource in model.of_type('ora.database.type', 'ora.asm.type'):
+                db = self.crs_database(resource.attributes)
+                if db:
+                    self.add_sid(ORACLE_SID=db.ORACLE_SID,
+                                 ORACLE_HOME=db.ORACLE_HOME,
+                                 DB_UNIQUE_NAME=db.DB_UNIQUE_NAME,
+                                 crsname=db.crsname)
 
     def base_from_home(self, ORACLE_HOME):
-        """ execute $ORACLE_HOME/bin/orabase to get ORACLE_BASE """
-        orabase = os.path.join(ORACLE_HOME, 'bin', 'orabase')
-        ORACLE_BASE = None
-        if os.access(orabase, os.X_OK):
-            proc = subprocess.Popen([orabase], stdout=subprocess.PIPE, env={'ORACLE_HOME': ORACLE_HOME})
-            for line in iter(proc.stdout.readline, ''):
-                if line.strip():
-                    ORACLE_BASE = line.strip().decode()
-                else:
-                    break
-        return ORACLE_BASE
+        """ ORACLE_BASE of ORACLE_HOME, see oracle_base() """
+        return oracle_base(ORACLE_HOME)
+
+    def basehome_from_home(self, ORACLE_HOME):
+        """ ORACLE_BASE_HOME of ORACLE_HOME, see oracle_base_home() """
+        return oracle_base_home(ORACLE_HOME)
 
     def add_home(self, ORACLE_HOME):
         if ORACLE_HOME and ORACLE_HOME not in self.homes:
@@ -290,23 +626,10 @@ class oracle_homes():
 
             try:
                 inventory_path = os.path.join(ORACLE_HOME, 'inventory', 'ContentsXML', 'comps.xml')
-                inv_tree = minidom.parse(inventory_path)
-                components = inv_tree.getElementsByTagName('COMP')
+                started = time.time()
+                component_name = comps_home_type(inventory_path)
+                self.parse_time[inventory_path] = round(time.time() - started, 6)
                 oracle_owner = getpwuid(os.stat(inventory_path).st_uid).pw_name
-                for comp in components:
-                    component_name = comp.attributes['NAME'].value
-                    if component_name == "oracle.client":
-                        component_name = 'client'
-                        break
-                    elif component_name == "oracle.server":
-                        component_name = "server"
-                        break
-                    elif component_name == "oracle.crs":
-                        component_name = "crs"
-                        break
-                    elif component_name == "oracle.tg":
-                        component_name = "gateway"
-                        break
             except:
                 component_name = 'unknown'
                 oracle_owner = 'unknown'
@@ -341,10 +664,20 @@ class oracle_homes():
                 , 'crsname': crsname
                 , 'running': running}
 
-    def query_db_status(self, oracle_owner, oracle_home, oracle_sid):
-        sqlplus_path = Path(oracle_home, 'bin', 'sqlplus')
-        args = [str(sqlplus_path), '-S', '/', 'as', 'sysdba']
-        pw_record = pwd.getpwnam(oracle_owner)
+    @staticmethod
+    def demote_thread_safe():
+        """ False when owner_process() demotes by preexec_fn (root on Python < 3.9), programs must not be started from threads """
+        return sys.version_info >= (3, 9) or os.getuid() != 0
+
+    def owner_process(self, oracle_owner, oracle_home, oracle_sid):
+        """
+        Return (env, kwargs) for subprocess.Popen to execute a program as oracle_owner
+        with ORACLE_HOME and ORACLE_SID set, fails the module when it is not possible.
+        """
+        try:
+            pw_record = pwd.getpwnam(oracle_owner)
+        except KeyError:
+            raise dbStatusError('Unknown oracle owner {}'.format(oracle_owner))
         user_name = pw_record.pw_name
         user_home_dir = pw_record.pw_dir
         user_uid = pw_record.pw_uid
@@ -359,15 +692,89 @@ class oracle_homes():
         env['ORACLE_SID'] = oracle_sid
 
         if os.getuid() == 0:
-            process = subprocess.Popen(args,
-                                       preexec_fn=self.demote(user_uid, user_gid, user_gids),
-                                       cwd='/', env=env, stdout=subprocess.PIPE, stdin=subprocess.PIPE)
+            if sys.version_info >= (3, 9):
+                # preexec_fn is not safe when called from threads, see demote_thread_safe()
+                demote = dict(user=user_uid, group=user_gid, extra_groups=user_gids)
+            else:
+                demote = dict(preexec_fn=self.demote(user_uid, user_gid, user_gids))
         elif os.getuid() == user_uid:
-            process = subprocess.Popen(args,
-                                       cwd='/', env=env, stdout=subprocess.PIPE, stdin=subprocess.PIPE)
+            demote = dict()
         else:
             self.module_fail_json(msg='Can not execute sqlplus(uid={})'.format(user_uid), changed=False)
+            return None, None
+        return env, demote
+
+    def query_db_status(self, oracle_owner, oracle_home, oracle_sid, timeout=10):
+        """
+        Return status of instance as list, e.g. ['OPEN', 'READ WRITE'], ['TIMEOUT'] when the instance did not respond in timeout seconds.
+        Uses probe_db_status(), sqlplus only when cx_Oracle is not available.
+        ['UNKNOWN'] with a warning when the status query failed (dbStatusError).
+        Safe to be called from several threads at once.
+        """
+        r = None
+        try:
+            if cx_oracle_exists:
+                r = self.probe_db_status(oracle_owner, oracle_home, oracle_sid, timeout)
+            if r is None:
+                r = self.sqlplus_db_status(oracle_owner, oracle_home, oracle_sid, timeout)
+        except dbStatusError as e:
+            self.module_warn('ORACLE_SID: {} status query failed: {}'.format(oracle_sid, e))
+            return ['UNKNOWN']
+        if r is None:
             return []
+        return self.db_status_list(oracle_sid, r)
+
+    def probe_db_status(self, oracle_owner, oracle_home, oracle_sid, timeout=10):
+        """
+        Query v$instance, v$database and v$archive_dest through bequeath connection / as sysdba
+        made by a short-lived python process running as oracle_owner.
+        Returns dictionary with keys STATUS, OPEN_MODE, DATABASE_ROLE, ORA_DG_ON, or {'STATUS': 'TIMEOUT'}.
+        Returns None when cx_Oracle can not be used by oracle_owner.
+        Raises dbStatusError when the query fails.
+        """
+        env, demote = self.owner_process(oracle_owner, oracle_home, oracle_sid)
+        if env is None:
+            return None
+        env['LD_LIBRARY_PATH'] = os.pathsep.join(filter(None, [os.path.join(oracle_home, 'lib'), env.get('LD_LIBRARY_PATH')]))
+        # cx_Oracle may be installed in site-packages of the user running Ansible
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [os.path.dirname(cx_Oracle.__file__), env.get('PYTHONPATH')]))
+        env.pop('TWO_TASK', None)  # bequeath
+        try:
+            process = subprocess.Popen([sys.executable, '-c', STATUS_PROBE], cwd='/', env=env,
+                                       stdout=subprocess.PIPE, stderr=subprocess.PIPE, **demote)
+        except EnvironmentError as e:
+            raise dbStatusError('Can not execute status probe: {}'.format(e))
+        try:
+            out, err = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            return {'STATUS': 'TIMEOUT'}
+        try:
+            r = json.loads(out.decode('utf-8'))
+        except ValueError:
+            self.module_warn('Status probe of {} failed: {}'.format(oracle_sid, err.decode('utf-8', 'replace').strip()))
+            return None
+        if 'error' in r:
+            raise dbStatusError(r['error'])
+        return r if r.get('driver') else None
+
+    def sqlplus_db_status(self, oracle_owner, oracle_home, oracle_sid, timeout=10):
+        """
+        Query instance status through sqlplus / as sysdba executed as oracle_owner, parses text output.
+        Returns dictionary with keys STATUS, OPEN_MODE, DATABASE_ROLE, ORA_DG_ON, or {'STATUS': 'TIMEOUT'}.
+        Raises dbStatusError when sqlplus can not be executed or does not print the status.
+        """
+        sqlplus_path = Path(oracle_home, 'bin', 'sqlplus')
+        args = [str(sqlplus_path), '-S', '/', 'as', 'sysdba']
+        env, demote = self.owner_process(oracle_owner, oracle_home, oracle_sid)
+        if env is None:
+            return None
+        try:
+            process = subprocess.Popen(args,
+                                       cwd='/', env=env, stdout=subprocess.PIPE, stdin=subprocess.PIPE, **demote)
+        except EnvironmentError as e:
+            raise dbStatusError('Can not execute {}: {}'.format(sqlplus_path, e))
 
         sql = """
         select status from v$instance;
@@ -381,7 +788,12 @@ class oracle_homes():
         delim  = False
         value  = None
         r      = {}
-        out = process.communicate(input=sql.encode(), timeout=10)
+        try:
+            out = process.communicate(input=sql.encode(), timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            return {'STATUS': 'TIMEOUT'}
         for l in out[0].decode('utf-8').splitlines():
             # module_warn("{}:{}".format(oracle_sid,l.rstrip()))
             if l.strip() in ('STATUS', 'OPEN_MODE', 'ORA_DG_ON', 'DATABASE_ROLE'):
@@ -399,6 +811,16 @@ class oracle_homes():
                 value = False
                 # module_warn(str(r))
         # module_warn("Exit code {}".format(process.returncode))
+        if 'STATUS' not in r:
+            raise dbStatusError('sqlplus did not return status of instance, exit code {}'.format(process.returncode))
+        return r
+
+    @staticmethod
+    def db_status_list(oracle_sid, r):
+        """ Convert dictionary returned by probe_db_status()/sqlplus_db_status() into status list """
+        if r['STATUS'] == 'TIMEOUT':
+            return ['TIMEOUT']
+
         if oracle_sid.startswith('+ASM') and r['STATUS'] == 'STARTED':
             return ['ASM', 'STARTED']
         elif oracle_sid.startswith('+ASM'):
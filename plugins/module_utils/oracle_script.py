@@ -0,0 +1,199 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+#
+# Splitting of SQL*Plus scripts into statements for oracle_sql.
+#
+# The script is tokenized once, the way SQL*Plus reads it: string literals ('it''s', q'[it's]', N'...'), quoted
+# identifiers, -- and /* */ comments are skipped when looking for terminators. SQL statements end with a semicolon
+# or a line holding only a slash. PL/SQL (DECLARE, BEGIN, CREATE FUNCTION/PROCEDURE/PACKAGE [BODY]/TRIGGER/TYPE ...)
+# ends only with a slash line, semicolons inside it belong to the code. So SQL and PL/SQL can be mixed in one script.
+#
+# SQL*Plus commands affecting only formatting and output (SET, PROMPT, COLUMN, ...) are not sent to the database,
+# EXEC[UTE] becomes a PL/SQL block and EXIT ends the script. Commands changing what the script does (CONNECT, nested
+# scripts @, START, substitution variables, WHENEVER ... CONTINUE, HOST) raise scriptError, so they are never skipped.
+# Like SQL*Plus with DEFINE ON, &name and &&name are substitution variables also inside string literals (not in
+# comments), SET DEFINE OFF (or SCAN OFF) makes & an ordinary character, SET DEFINE <char> changes the prefix.
+#
+# This file has no Ansible dependencies.
+#
+
+import re
+from collections import namedtuple
+
+# text -- statement without terminator (PL/SQL keeps its final "end;")
+# kind -- 'sql', 'plsql' or 'sqlplus' (SQL*Plus command, not executed)
+# line -- line number of the script where the statement starts
+scriptStatement = namedtuple('scriptStatement', ['text', 'kind', 'line'])
+
+PLSQL_RE = re.compile(r'^(declare|begin|<<|create\s+(or\s+replace\s+)?((editionable|noneditionable|editioning)\s+)?'
+                      r'(and\s+(resolve|compile)\s+(noforce\s+)?)?'
+                      r'(function|procedure|package|trigger|type|library|java)\b)', re.IGNORECASE)
+
+# Commands of SQL*Plus, recognized when a line starting a statement begins with one of them (abbreviations included)
+# Formatting and output only, ignored
+FORMAT_COMMANDS = ('set', 'spool', 'prompt', 'pro', 'rem', 'remark', 'show', 'sho', 'column', 'col', 'ttitle', 'btitle',
+                   'break', 'compute', 'pause', 'clear', 'cl', 'timing', 'describe', 'desc', 'repheader', 'repfooter')
+# Change the session, the statements executed or their text, not supported
+UNSUPPORTED_COMMANDS = ('connect', 'conn', 'disconnect', 'disc', 'start', 'sta', 'define', 'def', 'undefine', 'undef',
+                        'variable', 'var', 'print', 'accept', 'acc', 'host', 'store', 'whenever')
+FORMAT_RE = re.compile(r'^((?!set\s+(transaction|role|constraints?)\b)(%s)(\s|$)'
+                       r'|whenever\s+(sqlerror|oserror)\s+exit\b)' % '|'.join(FORMAT_COMMANDS), re.IGNORECASE)
+UNSUPPORTED_RE = re.compile(r'^(@@?|!|(%s)(\s|$))' % '|'.join(UNSUPPORTED_COMMANDS), re.IGNORECASE)
+EXIT_RE = re.compile(r'^(exit|quit)(\s|;|$)', re.IGNORECASE)
+EXEC_RE = re.compile(r'^exec(ute)?\s+(.*?);?\s*$', re.IGNORECASE | re.DOTALL)
+SET_DEFINE_RE = re.compile(r'^set\s+(def(ine)?|scan)\s+[\'"]?([^\s\'"]+)', re.IGNORECASE)
+
+DML_RE = re.compile(r'^(insert|update|delete|merge)\s', re.IGNORECASE)
+
+QUOTE_DELIMITERS = {'[': ']', '{': '}', '<': '>', '(': ')'}
+
+
+class scriptError(ValueError):
+    """ Script uses SQL*Plus command which can not be executed without SQL*Plus """
+
+
+def is_plsql(code):
+    """ True when the statement whose code (without comments and literals) starts with code is terminated by slash """
+    return bool(PLSQL_RE.match(code.lstrip()))
+
+
+def is_dml(statement):
+    """ True for INSERT, UPDATE, DELETE and MERGE statements """
+    return statement.kind == 'sql' and bool(DML_RE.match(strip_comments(statement.text)))
+
+
+def strip_comments(text):
+    """ Text of statement without leading comments """
+    while True:
+        text = text.lstrip()
+        if text.startswith('--'):
+            text = text.partition('\n')[2]
+        elif text.startswith('/*') and '*/' in text:
+            text = text.split('*/', 1)[1]
+        else:
+            return text
+
+
+def substitution_re(prefix):
+    """ Regular expression matching substitution variables (&name, &&name, &1) of SET DEFINE prefix, None when OFF """
+    return re.compile(r'%s{1,2}[\w$#]' % re.escape(prefix)) if prefix else None
+
+
+def split_statements(script):
+    """ Return list of scriptStatements of a SQL*Plus script, statements following EXIT are not returned """
+    statements = []
+    buf = []  # text of current statement
+    code = []  # text of current statement without comments and literals, decides its kind
+    kind = None
+    start = None
+    close = None  # text closing literal or comment the scanner is in
+    substitution = substitution_re('&')
+
+    def check_substitution(text, number):
+        m = substitution.search(text) if substitution else None
+        if m:
+            raise scriptError('Substitution variable at line %d is not supported (SET DEFINE OFF makes %s an ordinary '
+                              'character): %s' % (number, m.group(0)[0], text.strip()))
+
+    def emit(kind):
+        text = ''.join(buf).strip()
+        if ''.join(code).strip():
+            statements.append(scriptStatement(text, kind or ('plsql' if is_plsql(''.join(code)) else 'sql'), start))
+        del buf[:]
+        del code[:]
+
+    for number, line in enumerate(script.splitlines(True), 1):
+        stripped = line.strip()
+        if close is None:
+            if stripped == '/':
+                emit(kind)
+                kind = None
+                continue
+            if not ''.join(code).strip():
+                if not stripped:
+                    continue
+                m = EXEC_RE.match(stripped)
+                if m:
+                    check_substitution(m.group(2), number)
+                    statements.append(scriptStatement('begin %s; end;' % m.group(2).rstrip(), 'plsql', number))
+                    continue
+                if FORMAT_RE.match(stripped):
+                    m = SET_DEFINE_RE.match(stripped)
+                    if m:
+                        value = m.group(3).lower()
+                        if value == 'off':
+                            substitution = None
+                        elif value == 'on':
+                            substitution = substitution_re('&')
+                        elif len(value) == 1 and m.group(1).lower().startswith('def'):
+                            substitution = substitution_re(m.group(3))
+                    statements.append(scriptStatement(stripped, 'sqlplus', number))
+                    continue
+                if UNSUPPORTED_RE.match(stripped):
+                    raise scriptError('SQL*Plus command at line %d is not supported: %s' % (number, stripped))
+                if EXIT_RE.match(stripped):
+                    return statements
+        if start is None or not ''.join(buf).strip():
+            start = number
+
+        i = 0
+        while i < len(line):
+            if close is not None:
+                end = line.find(close, i)
+                if close != '*/':  # SQL*Plus substitutes inside literals too
+                    check_substitution(line[i:] if end < 0 else line[i:end], number)
+                if end < 0:
+                    buf.append(line[i:])
+                    break
+                if close in ("'", '"') and line.startswith(close * 2, end):  # quote doubled inside literal
+                    buf.append(line[i:end + 2])
+                    i = end + 2
+                    continue
+                buf.append(line[i:end + len(close)])
+                i = end + len(close)
+                close = None
+                continue
+            c = line[i]
+            if line.startswith('--', i):
+                buf.append(line[i:])
+                code.append('\n')
+                break
+            if line.startswith('/*', i):
+                close = '*/'
+                buf.append('/*')
+                code.append(' ')
+                i += 2
+                continue
+            m = re.match(r"[nN]?[qQ]'(.)", line[i:])
+            if m and (i == 0 or not (line[i - 1].isalnum() or line[i - 1] in '_$#')):
+                delimiter = m.group(1)
+                close = QUOTE_DELIMITERS.get(delimiter, delimiter) + "'"
+                buf.append(m.group(0))
+                code.append(' ')
+                i += len(m.group(0))
+                continue
+            if c == "'" or c == '"':
+                close = c
+                buf.append(c)
+                code.append(' ')
+                i += 1
+                continue
+            if substitution and substitution.match(line, i):
+                check_substitution(line[i:], number)
+            if c == ';':
+                if kind is None:
+                    kind = 'plsql' if is_plsql(''.join(code)) else 'sql'
+                if kind == 'sql':
+                    emit(kind)
+                    kind = None
+                    start = number
+                    i += 1
+                    continue
+            buf.append(c)
+            code.append(c)
+            i += 1
+
+    emit(kind)
+    return statements
@@ -0,0 +1,131 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+#
+# Connection factory shared by all oracle_* modules, oracleConnection and the connection broker.
+#
+# Every database logon goes through connect_session(), so connection level tuning is applied everywhere:
+# - listener refusals ORA-12516/12519/12520 (instance out of processes/sessions, or still starting) are retried
+# - statement cache size
+# - call timeout (seconds), so a single round trip can not block a fork forever
+# - end-to-end tagging: client identifier, module and action are visible in v$session, ASH and AWR
+#
+# Defaults are taken from the task environment, module parameters (when the module has them) take precedence.
+#
+
+import os
+import pwd
+import time
+
+try:
+    import cx_Oracle
+except ImportError:
+    cx_oracle_exists = False
+else:
+    cx_oracle_exists = True
+
+
+CALL_TIMEOUT_ENV = 'ANSIBLE_ORACLE_CALL_TIMEOUT'
+STMTCACHE_ENV = 'ANSIBLE_ORACLE_STMTCACHE'
+CONNECT_RETRIES_ENV = 'ANSIBLE_ORACLE_CONNECT_RETRIES'
+CLIENT_ID_ENV = 'ANSIBLE_ORACLE_CLIENT_ID'
+
+DEFAULT_STMTCACHE = 50
+DEFAULT_CONNECT_RETRIES = 3
+CONNECT_RETRY_DELAY = 0.5
+
+# TNS:listener could not find available handler / all handlers blocked / no handler available
+TRANSIENT_CONNECT_ERRORS = (12516, 12519, 12520)
+
+# ORA-01013 user requested cancel (watchdog of oracleConnection), ORA-03156 OCI call timed out (DPI-1067)
+CALL_TIMEOUT_ERRORS = (1013, 3156)
+
+# Limits of DBMS_APPLICATION_INFO / OCI attributes
+MODULE_MAX_LENGTH = 48
+ACTION_MAX_LENGTH = 32
+CLIENT_ID_MAX_LENGTH = 64
+
+
+def _setting(params, name, env, default):
+    value = params.get(name)
+    if value is None:
+        value = os.environ.get(env)
+    try:
+        return int(value) if value not in (None, '') else default
+    except ValueError:
+        return default
+
+
+def _os_user():
+    try:
+        return pwd.getpwuid(os.geteuid()).pw_name
+    except KeyError:
+        return str(os.geteuid())
+
+
+def session_settings(module=None):
+    """Return dictionary of connection settings used by connect_session() for an Ansible module instance.
+
+    call_timeout -- seconds, 0 means no limit (module param call_timeout, env ANSIBLE_ORACLE_CALL_TIMEOUT)
+    stmtcachesize -- statement cache size (env ANSIBLE_ORACLE_STMTCACHE, default 50)
+    retries -- number of retries on ORA-12516/12519/12520 (env ANSIBLE_ORACLE_CONNECT_RETRIES, default 3)
+    client_identifier, module, action -- end-to-end tags, module name and value of parameter state
+    """
+    params = module.params if module is not None else {}
+    name = getattr(module, '_name', None) or 'oracle'
+    return {
+        'call_timeout': _setting(params, 'call_timeout', CALL_TIMEOUT_ENV, 0),
+        'stmtcachesize': _setting(params, 'stmtcachesize', STMTCACHE_ENV, DEFAULT_STMTCACHE),
+        'retries': _setting(params, 'connect_retries', CONNECT_RETRIES_ENV, DEFAULT_CONNECT_RETRIES),
+        'client_identifier': (os.environ.get(CLIENT_ID_ENV) or 'ansible:%s' % _os_user())[:CLIENT_ID_MAX_LENGTH],
+        'module': ('ansible:%s' % name.split('.')[-1])[:MODULE_MAX_LENGTH],
+        'action': str(params.get('state') or '')[:ACTION_MAX_LENGTH],
+    }
+
+
+def is_call_timeout(error):
+    """True when the cx_Oracle error object reports a call cancelled because of call timeout"""
+    return getattr(error, 'code', None) in CALL_TIMEOUT_ERRORS or 'DPI-1067' in str(getattr(error, 'message', ''))
+
+
+def apply_session_settings(conn, settings):
+    """Apply statement cache size, call timeout and end-to-end tags to an open session.
+
+    Tags are sent to the database piggybacked on the next round trip, no extra round trip is made.
+    Also used for sessions reused from a pool or from the broker.
+    """
+    conn.stmtcachesize = settings['stmtcachesize']
+    try:
+        conn.callTimeout = int(settings['call_timeout'] * 1000)
+    except (AttributeError, cx_Oracle.Error):
+        pass  # Oracle Client older than 18c
+    conn.client_identifier = settings['client_identifier']
+    conn.module = settings['module']
+    conn.action = settings['action']
+
+
+def connect_session(connect_args, mode='normal', settings=None):
+    """Logon to the database, every standalone session of oracle_* modules is opened here.
+
+    connect_args -- tuple passed to cx_Oracle.connect(): ('/',), ('/@service',) or (user, password, dsn)
+    mode -- 'normal' or 'sysdba'
+    settings -- dictionary returned by session_settings() (default settings from task environment)
+    Transient listener errors are retried with exponential backoff. Raises cx_Oracle.DatabaseError.
+    """
+    if settings is None:
+        settings = session_settings()
+    kwargs = {'mode': cx_Oracle.SYSDBA} if mode == 'sysdba' else {}
+    attempt = 0
+    while True:
+        try:
+            conn = cx_Oracle.connect(*connect_args, **kwargs)
+            break
+        except cx_Oracle.DatabaseError as exc:
+            error, = exc.args
+            if getattr(error, 'code', None) not in TRANSIENT_CONNECT_ERRORS or attempt >= settings['retries']:
+                raise
+            time.sleep(CONNECT_RETRY_DELAY * 2 ** attempt)
+            attempt += 1
+    apply_session_settings(conn, settings)
+    return conn
@@ -4,6 +4,12 @@ __metaclass__ = type
 
 from ansible.module_utils.basic import os
 from ansible.module_utils.basic import *
+import re
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
 try:
     import cx_Oracle
@@ -14,20 +20,49 @@ else:
 
 from ansible.module_utils.basic import *
 
+# Number of statements shipped in one PL/SQL block by oracleConnection.flush()
+DDL_BATCH_SIZE = 100
 
-def oracle_connect(module):
+# Set this variable to 0 in task environment to disable bequeath connections to local databases
+BEQUEATH_ENV = 'ANSIBLE_ORACLE_BEQUEATH'
+
+# Set this variable in task environment (or module option perf) to get per-statement timing under perf key
+PERF_ENV = 'ANSIBLE_ORACLE_PERF'
+
+try:
+    from ansible_collections.ibre5041.ansible_oracle_modules.plugins.module_utils.oracle_session import connect_session, session_settings, apply_session_settings, is_call_timeout, CALL_TIMEOUT_ERRORS
+except ImportError:
+    pass
+
+try:
+    from ansible_collections.ibre5041.ansible_oracle_modules.plugins.module_utils.oracle_broker import brokerClient, brokerUnavailable, broker_enabled
+except ImportError:
+    def broker_enabled():
+        return False
+
+try:
+    from ansible_collections.ibre5041.ansible_oracle_modules.plugins.module_utils.oracle_homes import oracle_homes
+except ImportError:
+    oracle_homes = None
+
+
+def is_local_host(hostname):
+    """True when hostname refers to this host, no name resolution is done"""
+    if not hostname:
+        return False
+    hostname = hostname.lower()
+    local_name = socket.gethostname().lower()
+    return hostname in ('localhost', 'localhost.localdomain', '127.0.0.1', '::1', local_name, local_name.split('.')[0])
+
+
+def oracle_connect(module, service_name=None, sysdba_wallet=False):
     """
     Connect to the database using parameter provided by Ansible module instance.
+    service_name -- overrides module parameter service_name
+    sysdba_wallet -- without user/password connect AS SYSDBA using wallet ('/@service_name') instead of OS authentication ('/')
     Return: connection
     """
 
-    try:
-        import cx_Oracle
-    except ImportError:
-        cx_oracle_exists = False
-    else:
-        cx_oracle_exists = True
-
     if not cx_oracle_exists:
         module.fail_json(msg="The cx_Oracle module is required. 'pip install cx_Oracle' should do the trick. If cx_Oracle is installed, make sure ORACLE_HOME is set")
         
@@ -37,10 +72,10 @@ def oracle_connect(module):
         oracle_home = None
     hostname = module.params["hostname"]
     port = module.params["port"]
-    service_name = module.params["service_name"]
+    service_name = service_name or module.params["service_name"]
     user = module.params["user"]
     password = module.params["password"]
-    mode = module.params["mode"]
+    mode = module.params.get("mode", "normal")
 
     if oracle_home is not None:
         os.environ['ORACLE_HOME'] = oracle_home.rstrip('/')
@@ -48,30 +83,19 @@ def oracle_connect(module):
         oracle_home = os.environ['ORACLE_HOME']
 
     wallet_connect = '/@%s' % service_name
+    sysdba_connect = wallet_connect if sysdba_wallet else '/'
+
+    if not user and not password: # If neither user or password is supplied, the use of an oracle wallet is assumed
+        connect = sysdba_connect if mode == 'sysdba' else wallet_connect
+        connect_args = (connect,)
+    elif user and password:
+        connect = cx_Oracle.makedsn(host=hostname, port=port, service_name=service_name)
+        connect_args = (user, password, connect)
+    else:
+        module.fail_json(msg='Missing username or password for cx_Oracle')
 
-    sysdba_connect = '/'
     try:
-        if (not user and not password ): # If neither user or password is supplied, the use of an oracle wallet is assumed
-            if mode == 'sysdba':
-                connect = sysdba_connect
-                conn = cx_Oracle.connect(sysdba_connect, mode=cx_Oracle.SYSDBA)
-            else:
-                connect = wallet_connect
-                conn = cx_Oracle.connect(wallet_connect)
-
-        elif (user and password ):
-            if mode == 'sysdba':
-                dsn = cx_Oracle.makedsn(host=hostname, port=port, service_name=service_name)
-                connect = dsn
-                conn = cx_Oracle.connect(user, password, dsn, mode=cx_Oracle.SYSDBA)
-            else:
-                dsn = cx_Oracle.makedsn(host=hostname, port=port, service_name=service_name)
-                connect = dsn
-                conn = cx_Oracle.connect(user, password, dsn)
-
-        elif (not(user) or not(password)):
-            module.fail_json(msg='Missing username or password for cx_Oracle')
-            
+        conn = connect_session(connect_args, mode, session_settings(module))
     except cx_Oracle.DatabaseError as exc:
         error, = exc.args
         msg = 'Could not connect to database - %s, connect descriptor: %s' % (error.message, connect)
@@ -80,6 +104,27 @@ def oracle_connect(module):
     return conn
 
 
+# Bequeath connect descriptor, the server process gets ORACLE_SID and ORACLE_HOME from ENVS, not from our environment
+BEQUEATH_DSN = ("(DESCRIPTION=(ADDRESS=(PROTOCOL=BEQ)(PROGRAM={home}/bin/oracle)(ARGV0=oracle{sid})"
+                "(ARGS='(DESCRIPTION=(LOCAL=YES)(ADDRESS=(PROTOCOL=BEQ)))')(ENVS='ORACLE_HOME={home},ORACLE_SID={sid}'))"
+                "(CONNECT_DATA=(SID={sid})))")
+
+
+def bequeath_connect(module, oracle_sid, oracle_home, settings=None):
+    """
+    Connect / as sysdba to local instance oracle_sid of oracle_home, safe to be called from several threads.
+    The instance is addressed by a BEQ connect descriptor, process environment is not changed,
+    so concurrent connects to different instances do not wait for each other.
+    settings -- dictionary returned by session_settings() (default: settings of module)
+    Raises cx_Oracle.DatabaseError.
+    """
+    if settings is None:
+        settings = session_settings(module)
+    oracle_home = (oracle_home or os.environ['ORACLE_HOME']).rstrip('/')
+    dsn = BEQUEATH_DSN.format(home=oracle_home, sid=oracle_sid)
+    return connect_session(('/@' + dsn,), 'sysdba', settings)
+
+
 class oracleConnection:
     """
     Connect to the database using parameter provided by Ansible module instance.
@@ -111,35 +156,311 @@ class oracleConnection:
         wallet_connect = '/@%s' % service_name
         sysdba_connect = '/'
 
+        if not user and not password: # If neither user or password is supplied, the use of an oracle connect internal or wallet is assumed
+            if mode == 'sysdba':
+                connect = sysdba_connect
+                connect_args = (sysdba_connect,)
+            else:
+                connect = wallet_connect
+                connect_args = (wallet_connect,)
+        elif user and password: # Assume supplied user has SYSDBA role granted
+            dsn = cx_Oracle.makedsn(host=hostname, port=port, service_name=service_name)
+            connect = dsn
+            connect_args = (user, password, dsn)
+        else:
+            module.fail_json(msg='Missing username or password for cx_Oracle')
+
+        # Prefer bequeath connection when the database runs on this host, no listener is involved
+        candidates = [(connect, connect_args, None, None)]
+        if user and password and mode == 'normal':
+            # Local SYSDBA logon would be authenticated by OS group, user and password would not be checked
+            local = self.local_instance(hostname, service_name)
+            if local:
+                local_sid, local_home = local
+                candidates.insert(0, ('bequeath ORACLE_SID=%s' % local_sid, (user, password, ''), local_sid, local_home))
+
+        self.mode = mode
+        self.service_name = service_name
+        self.pool = None
+        self.pool_sessions = []  # standalone sessions used instead of SessionPool for SYSDBA
+        self.pool_lock = threading.Lock()
+
+        self.settings = session_settings(module)
+        self.call_timeout = self.settings['call_timeout']  # seconds, 0 - no limit
+        self.perf = perfRecorder() if perf_enabled(module) else None
+        if self.perf:
+            self.install_perf_hooks()
+
+        self.conn = None
+        self.broker = None
+        started = time.time()
+        for i, (connect, connect_args, local_sid, local_home) in enumerate(candidates):
+            if local_sid:
+                os.environ['ORACLE_SID'] = local_sid
+                if local_home and not self.oracle_home:
+                    self.oracle_home = local_home
+                    os.environ['ORACLE_HOME'] = local_home
+            try:
+                self.open_session(connect_args, mode)
+                break
+            except cx_Oracle.DatabaseError as exc:
+                error, = exc.args
+                if i == len(candidates) - 1:
+                    msg = 'Could not connect to database - %s, connect descriptor: %s' % (error.message, connect)
+                    module.fail_json(msg=msg, changed=False)
+                module.warn('Could not connect to database - %s, connect descriptor: %s, trying %s' % (error.message, connect, candidates[-1][0]))
+
+        self.connect_descriptor = connect
+        self.connect_args = connect_args
+        self.bequeath = bool(local_sid)
+        if self.perf:
+            self.perf.connect = round(time.time() - started, 6)
+            self.perf.connect_via = ('broker' if self.broker else 'direct') + (' bequeath' if self.bequeath else '')
+            # Reading v$mystat is a round trip itself, its cost is measured once and subtracted from every delta
+            first = self.session_round_trips()
+            self.perf.round_trips = self.session_round_trips()
+            if first is not None and self.perf.round_trips is not None:
+                self.perf.probe_round_trips = self.perf.round_trips - first
+        self.ddls = []
+        self.changed = False
+        self.deferred = False  # when True, execute_ddl only queues statements, flush() executes them
+        self.ddl_queue = []
+
+    def install_perf_hooks(self):
+        """Wrap module's exit_json/fail_json, so the perf report is returned by every module without patching it"""
+        def with_perf(function):
+            def wrapper(*args, **kwargs):
+                kwargs.setdefault('perf', self.perf_report())
+                return function(*args, **kwargs)
+            return wrapper
+        self.module.exit_json = with_perf(self.module.exit_json)
+        self.module.fail_json = with_perf(self.module.fail_json)
+
+    def record_perf(self, kind, sql, started, rows=None, arraysize=None, statements=None, measure=True):
+        """measure -- False when the work was done by other sessions (for_each_container), round trips are not reported"""
+        if self.perf is not None:
+            elapsed = time.time() - started
+            self.perf.record(kind, sql, elapsed, rows=rows, arraysize=arraysize, statements=statements,
+                             round_trips=self.measure_round_trips() if measure else None)
+
+    def session_round_trips(self):
+        """'SQL*Net roundtrips to/from client' of this session from v$mystat, None when it can not be read"""
         try:
-            if not user and not password: # If neither user or password is supplied, the use of an oracle connect internal or wallet is assumed
-                if mode == 'sysdba':
-                    connect = sysdba_connect
-                    conn = cx_Oracle.connect(sysdba_connect, mode=cx_Oracle.SYSDBA)
-                else:
-                    connect = wallet_connect
-                    conn = cx_Oracle.connect(wallet_connect)
-            elif user and password: # Assume supplied user has SYSDBA role granted
-                if mode == 'sysdba':
-                    dsn = cx_Oracle.makedsn(host=hostname, port=port, service_name=service_name)
-                    connect = dsn
-                    conn = cx_Oracle.connect(user, password, dsn, mode=cx_Oracle.SYSDBA)
-                else:
-                    dsn = cx_Oracle.makedsn(host=hostname, port=port, service_name=service_name)
-                    connect = dsn
-                    conn = cx_Oracle.connect(user, password, dsn)
-            elif not user or not password:
-                module.fail_json(msg='Missing username or password for cx_Oracle')
-        except cx_Oracle.DatabaseError as exc:
-            error, = exc.args
-            msg = 'Could not connect to database - %s, connect descriptor: %s' % (error.message, connect)
-            module.fail_json(msg=msg, changed=False)
-        self.conn = conn
+            if self.broker:
+                _, row = self.broker.select(PERF_ROUNDTRIPS_SQL, {}, fetchone=True)
+            elif self.conn is not None:
+                with self.conn.cursor() as cursor:
+                    cursor.execute(PERF_ROUNDTRIPS_SQL)
+                    row = cursor.fetchone()
+            else:
+                return None
+        except cx_Oracle.DatabaseError:
+            return None  # no access to v$mystat
+        return int(row[0]) if row else None
+
+    def measure_round_trips(self):
+        """Round trips of the session since the previous measurement, as counted by the database"""
+        value = self.session_round_trips()
+        previous, self.perf.round_trips = self.perf.round_trips, value
+        if value is None or previous is None or self.perf.probe_round_trips is None:
+            return None
+        return max(value - previous - self.perf.probe_round_trips, 0)
+
+    def perf_report(self):
+        """Timing of connect and of every statement, plus session round trips as counted by the database"""
+        report = self.perf.report()
+        report['session_round_trips'] = self.session_round_trips()
+        return report
+
+    def open_session(self, connect_args, mode):
+        """Logon, either by leasing a session from the broker or directly. Raises cx_Oracle.DatabaseError."""
+        if broker_enabled():
+            self.broker = self.lease_from_broker(connect_args, mode)
+        if self.broker:
+            self.version = self.broker.version
+            return
+        self.conn = connect_session(connect_args, mode, self.settings)
         self.conn.autocommit = True
         self.version = self.conn.version
-        self.ddls = []
-        self.changed = False
 
+    def lease_from_broker(self, connect_args, mode):
+        """Lease an authenticated session from the per-host connection broker.
+
+        Returns None (and connects directly) when the broker can not be used.
+        Logon errors reported by the broker are raised as cx_Oracle.DatabaseError.
+        """
+        try:
+            client = brokerClient.connect()
+        except brokerUnavailable as e:
+            self.module.warn('%s, connecting directly' % e)
+            return None
+        try:
+            return client.lease(connect_args, mode, oracle_home=self.oracle_home, oracle_sid=os.environ.get('ORACLE_SID'),
+                                settings=self.settings)
+        except cx_Oracle.DatabaseError:
+            client.close()
+            raise
+        except brokerUnavailable as e:
+            client.close()
+            self.module.warn('%s, connecting directly' % e)
+            return None
+
+    def local_instance(self, hostname, service_name):
+        """Return (ORACLE_SID, ORACLE_HOME) of the instance serving service_name when it runs on this host, otherwise None.
+
+        Instance is matched by name (service name without domain) against running pmon processes,
+        for RAC also the instance name with numeric suffix is accepted. ORACLE_HOME is None when it can not be detected.
+        Set ANSIBLE_ORACLE_BEQUEATH=0 to always connect through the listener.
+        """
+        if os.environ.get(BEQUEATH_ENV, '').lower() in ('0', 'false', 'no', 'off'):
+            return None
+        if not service_name or not is_local_host(hostname) or oracle_homes is None:
+            return None
+        try:
+            instances = oracle_homes.running_instances(cache=True)
+        except Exception:
+            return None
+
+        wanted = service_name.split('.')[0].upper()
+        exact = [sid for sid in instances if sid.upper() == wanted]
+        rac = [sid for sid in instances if re.match(r'^%s_?\d+$' % re.escape(wanted), sid.upper())]
+        matches = exact or rac
+        if len(matches) != 1:
+            return None
+        sid = matches[0]
+        home = instances[sid]
+        if home and self.oracle_home and os.path.realpath(home) != os.path.realpath(self.oracle_home):
+            return None  # bequeath would spawn oracle binary of a different home
+        if not home and not self.oracle_home:
+            return None
+        return sid, home
+
+
+    def pool_params(self):
+        """Return (min, max, increment) of the session pool, as given by module params pool_min, pool_max, pool_increment"""
+        params = self.module.params
+        pool_min = params.get('pool_min') or 1
+        pool_max = max(params.get('pool_max') or 4, pool_min)
+        pool_increment = params.get('pool_increment') or 1
+        return pool_min, pool_max, pool_increment
+
+    def create_pool(self):
+        """Build the cx_Oracle SessionPool used by for_each_container().
+
+        SessionPool can not authenticate AS SYSDBA, in that case standalone sessions are opened on demand
+        (at most pool_max of them) and kept for reuse.
+        """
+        if self.pool or self.mode == 'sysdba':
+            return self.pool
+        pool_min, pool_max, pool_increment = self.pool_params()
+        try:
+            if len(self.connect_args) == 3:
+                user, password, dsn = self.connect_args
+                self.pool = cx_Oracle.SessionPool(user=user, password=password, dsn=dsn,
+                                                  min=pool_min, max=pool_max, increment=pool_increment,
+                                                  threaded=True, getmode=cx_Oracle.SPOOL_ATTRVAL_WAIT)
+            else:  # wallet
+                self.pool = cx_Oracle.SessionPool(dsn=self.service_name, externalauth=True, homogeneous=False,
+                                                  min=pool_min, max=pool_max, increment=pool_increment,
+                                                  threaded=True, getmode=cx_Oracle.SPOOL_ATTRVAL_WAIT)
+            self.pool.stmtcachesize = self.settings['stmtcachesize']
+        except cx_Oracle.DatabaseError as exc:
+            error, = exc.args
+            msg = 'Could not create session pool - %s, connect descriptor: %s' % (error.message, self.connect_descriptor)
+            self.module.fail_json(msg=msg, ddls=self.ddls, changed=self.changed)
+        return self.pool
+
+    def acquire_session(self):
+        if self.create_pool():
+            conn = self.pool.acquire()
+            apply_session_settings(conn, self.settings)
+            return conn
+        with self.pool_lock:
+            if self.pool_sessions:
+                return self.pool_sessions.pop()
+        conn = connect_session(self.connect_args, 'sysdba', self.settings)
+        conn.autocommit = True
+        return conn
+
+    def release_session(self, conn):
+        if self.pool:
+            self.pool.release(conn)
+        else:
+            with self.pool_lock:
+                self.pool_sessions.append(conn)
+
+    def for_each_container(self, containers, function, concurrency=None):
+        """Run a read-only check in each container concurrently, each on its own pooled session.
+
+        containers -- list of container (PDB) names
+        function -- function(session, container), session provides execute_select() and execute_select_to_dict()
+        concurrency -- number of parallel sessions (default pool_max)
+
+        The session of this object is not affected (no ALTER SESSION SET CONTAINER is issued on it).
+        Return dictionary {container: function result}, fails the module if a check fails in any container.
+        """
+        if self.ddl_queue:
+            self.flush()
+        _, pool_max, _ = self.pool_params()
+
+        def run(container):
+            conn = self.acquire_session()
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute('alter session set container = %s' % container)
+                return function(containerSession(conn, container), container)
+            finally:
+                self.release_session(conn)
+
+        results = {}
+        errors = []
+        started = time.time()
+        with ThreadPoolExecutor(max_workers=concurrency or pool_max) as executor:
+            futures = [(container, executor.submit(run, container)) for container in containers]
+            for container, future in futures:
+                try:
+                    results[container] = future.result()
+                except cx_Oracle.DatabaseError as e:
+                    error = e.args[0]
+                    errors.append((container, error))
+        self.record_perf('for_each_container', ','.join(containers), started, statements=len(containers), measure=False)
+        if errors:
+            container, error = errors[0]
+            self.module.fail_json(msg='%s: %s' % (container, error.message), code=error.code, container=container,
+                                  ddls=self.ddls, changed=self.changed)
+        return results
+
+    @contextmanager
+    def watchdog(self, request):
+        """Limit the enclosed database call to call_timeout seconds.
+
+        Driver's callTimeout limits each round trip, this timer cancels the whole call (conn.cancel())
+        also when it consists of many round trips or when Oracle Client is older than 18c.
+        A cancelled or timed out call fails the module with timeout=True, the statement and elapsed time.
+        """
+        started = time.time()
+        timer = None
+        if self.call_timeout and self.conn is not None:
+            timer = threading.Timer(self.call_timeout, self.conn.cancel)
+            timer.daemon = True
+            timer.start()
+        try:
+            yield timer
+        except cx_Oracle.DatabaseError as e:
+            error = e.args[0]
+            if is_call_timeout(error) or (timer is not None and timer.finished.is_set()):
+                self.fail_timeout(request, started, error)
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+
+    def fail_timeout(self, request, started, error=None):
+        elapsed = round(time.time() - started, 3)
+        msg = 'Call timeout of %s seconds exceeded, statement cancelled after %s seconds' % (self.call_timeout, elapsed)
+        self.module.fail_json(msg=msg, timeout=True, call_timeout=self.call_timeout, elapsed=elapsed, request=request,
+                              code=getattr(error, 'code', None), error=getattr(error, 'message', None),
+                              ddls=self.ddls, changed=self.changed)
 
     def execute_select(self, sql, params=None, fetchone=False):
         """Execute a select query and return fetched data.
@@ -148,40 +469,145 @@ class oracleConnection:
         params -- Dictionary of bind parameters (default {})
         fetchone -- If True, fetch one row, otherwise fetch all rows (default False)
         """
+        if self.ddl_queue:
+            self.flush()
         if params is None:
             params = {}
+        started = time.time()
         try:
-            with self.conn.cursor() as cursor:
-                cursor.execute(sql, params)
-                return cursor.fetchone() if fetchone else cursor.fetchall()
+            with self.watchdog(sql):
+                if self.broker:
+                    _, rows = self.broker.select(sql, params, fetchone)
+                else:
+                    with self.conn.cursor() as cursor:
+                        cursor.execute(sql, params)
+                        rows = cursor.fetchone() if fetchone else cursor.fetchall()
         except cx_Oracle.DatabaseError as e:
             error = e.args[0]
             self.module.fail_json(msg=error.message, code=error.code, request=sql, params=params, ddls=self.ddls, changed=self.changed)
+        self.record_perf('select', sql, started, rows=(1 if rows else 0) if fetchone else len(rows))
+        return rows
 
 
-    def execute_select_to_dict(self, sql, params=None, fetchone=False):
+    def iter_select(self, sql, params=None, arraysize=None, prefetchrows=None, max_rows=None):
+        """Execute a select query and return (column_names, rows), rows is a generator.
+
+        Rows are not materialized, they are fetched from the database arraysize rows per round trip.
+        sql -- SQL query
+        params -- Dictionary of bind parameters (default {})
+        arraysize -- Number of rows fetched per round trip (default driver's arraysize)
+        prefetchrows -- Number of rows prefetched by the execute call (default driver's prefetchrows)
+        max_rows -- Fail if the query returns more rows (default unlimited)
+        """
+        if self.ddl_queue:
+            self.flush()
+        if params is None:
+            params = {}
+
+        def too_many_rows():
+            self.module.fail_json(msg='Query returned more than %d rows (max_rows)' % max_rows, request=sql, params=params,
+                                  ddls=self.ddls, changed=self.changed)
+
+        started = time.time()
+        cursor = None
+        try:
+            if self.broker:
+                # the broker keeps the cursor open, rows are sent arraysize rows per request
+                with self.watchdog(sql):
+                    columns = self.broker.open_cursor(sql, params, arraysize=arraysize, prefetchrows=prefetchrows)
+            else:
+                cursor = self.conn.cursor()
+                if arraysize:
+                    cursor.arraysize = arraysize
+                if prefetchrows is not None and hasattr(cursor, 'prefetchrows'):  # cx_Oracle 8+
+                    cursor.prefetchrows = prefetchrows
+                with self.watchdog(sql):
+                    cursor.execute(sql, params)
+                columns = [description[0] for description in cursor.description]
+                arraysize = cursor.arraysize
+        except cx_Oracle.DatabaseError as e:
+            if cursor is not None:
+                cursor.close()
+            error = e.args[0]
+            self.module.fail_json(msg=error.message, code=error.code, request=sql, params=params, ddls=self.ddls, changed=self.changed)
+        column_names = [column.lower() for column in columns]
+        fetch = cursor.fetchmany if cursor is not None else self.broker.fetch
+
+        def close():
+            if cursor is not None:
+                cursor.close()
+                return
+            try:
+                self.broker.close_cursor()
+            except cx_Oracle.DatabaseError:
+                pass  # the broker lost the session, there is nothing to close
+
+        def rows():
+            fetched = 0
+            try:
+                while True:
+                    with self.watchdog(sql):  # each fetch, time spent by the consumer does not count
+                        batch = fetch()
+                    if not batch:
+                        break
+                    fetched += len(batch)
+                    if max_rows and fetched > max_rows:
+                        too_many_rows()
+                    for row in batch:
+                        yield row
+            except cx_Oracle.DatabaseError as e:
+                error = e.args[0]
+                self.module.fail_json(msg=error.message, code=error.code, request=sql, params=params, ddls=self.ddls, changed=self.changed)
+            finally:
+                close()
+                self.record_perf('select', sql, started, rows=fetched, arraysize=arraysize)
+
+        return column_names, rows()
+
+    def execute_select_to_dict(self, sql, params=None, fetchone=False, arraysize=None, prefetchrows=None, max_rows=None, compact=False):
         """Execute a select query and return a list of dictionaries : one dictionary for each row.
 
         sql -- SQL query
         params -- Dictionary of bind parameters (default {})
+        arraysize, prefetchrows, max_rows -- See iter_select
+        compact -- Return columnar result {'columns': [names], 'rows': [tuples]} instead of list of dictionaries
         """
+        if arraysize or prefetchrows is not None or max_rows or compact:
+            column_names, rows = self.iter_select(sql, params, arraysize=arraysize, prefetchrows=prefetchrows, max_rows=max_rows)
+            if compact:
+                return {'columns': column_names, 'rows': list(rows)}
+            return [dict(zip(column_names, row)) for row in rows]
+        if self.ddl_queue:
+            self.flush()
         if params is None:
             params = {}
+        started = time.time()
         try:
-            with self.conn.cursor() as cursor:
-                cursor.execute(sql, params)
-                column_names = [description[0].lower() for description in cursor.description]  # First element is the column name.
-                if fetchone:
-                    row = cursor.fetchone()
-                    if row:
-                        return dict(zip(column_names, row))
+            with self.watchdog(sql):
+                if self.broker:
+                    columns, rows = self.broker.select(sql, params, fetchone)
+                    column_names = [column.lower() for column in columns]
+                    if fetchone:
+                        result = dict(zip(column_names, rows)) if rows else dict()
                     else:
-                        return dict()
+                        result = [dict(zip(column_names, row)) for row in rows]
                 else:
-                    return [dict(zip(column_names, row)) for row in cursor]
+                    with self.conn.cursor() as cursor:
+                        cursor.execute(sql, params)
+                        column_names = [description[0].lower() for description in cursor.description]  # First element is the column name.
+                        if fetchone:
+                            row = cursor.fetchone()
+                            if row:
+                                result = dict(zip(column_names, row))
+                            else:
+                                result = dict()
+                        else:
+                            result = [dict(zip(column_names, row)) for row in cursor]
         except cx_Oracle.DatabaseError as e:
             error = e.args[0]
             self.module.fail_json(msg=error.message, code=error.code, request=sql, params=params, ddls=self.ddls, changed=self.changed)
+        self.record_perf('select', sql, started, rows=(1 if result else 0) if fetchone else len(result))
+        return result
 
 
     def execute_ddl(self, request, no_change=False, ignore_errors = []):
@@ -192,10 +618,20 @@ class oracleConnection:
         try:
             if self.module._verbosity >= 3:
                 self.module.warn("SQL: --{}".format(request))
+            if self.deferred and not self.module.check_mode:
+                self.ddl_queue.append((request, no_change, ignore_errors))
+                return
             if not self.module.check_mode:
-                with self.conn.cursor() as cursor:
-                    cursor.execute(request)
-                    self.ddls.append(request)
+                started = time.time()
+                with self.watchdog(request):
+                    if self.broker:
+                        self.broker.ddl(request)
+                        self.ddls.append(request)
+                    else:
+                        with self.conn.cursor() as cursor:
+                            cursor.execute(request)
+                            self.ddls.append(request)
+                self.record_perf('ddl', request, started)
             else:
                 self.ddls.append('--' + request)
             if not no_change: # In case of alter session, do not set changed to True
@@ -207,22 +643,140 @@ class oracleConnection:
             else:
                 pass
 
-            
-    def execute_statement(self, statement):
+
+    def flush(self):
+        """Execute DDL requests queued by execute_ddl in deferred mode.
+
+        Statements are shipped as anonymous PL/SQL blocks of EXECUTE IMMEDIATEs (DDL_BATCH_SIZE statements per block),
+        so N statements cost one round trip instead of N. Errors listed in ignore_errors of the statement are skipped,
+        any other error stops the block and fails the module reporting the statement which failed.
+        The ddls attribute and changed flag are the same as if the statements were executed one by one.
+        """
+        queue, self.ddl_queue = self.ddl_queue, []
+        while queue:
+            if self.broker or not self._batchable(queue[0][0]):
+                self._execute_queued(*queue.pop(0))
+                continue
+            batch = []
+            while queue and len(batch) < DDL_BATCH_SIZE and self._batchable(queue[0][0]):
+                batch.append(queue.pop(0))
+            if len(batch) == 1:
+                self._execute_queued(*batch[0])
+            else:
+                self._execute_ddl_block(batch)
+
+    @staticmethod
+    def _batchable(request):
+        # Longer statements do not fit into PL/SQL varchar2 bind, session changes must not be executed in a block
+        return len(request) <= 32767 and not re.match(r'^\s*alter\s+session\s', request, re.IGNORECASE)
+
+    def _execute_queued(self, request, no_change, ignore_errors):
+        deferred, self.deferred = self.deferred, False
+        try:
+            self.execute_ddl(request, no_change=no_change, ignore_errors=ignore_errors)
+        finally:
+            self.deferred = deferred
+
+    def _execute_ddl_block(self, batch):
+        block = ['begin', ':done := 0;', ':ignored := null;']
+        params = {}
+        for i, (request, no_change, ignore_errors) in enumerate(batch):
+            params['s%d' % i] = request
+            block.append('begin execute immediate :s%d;' % i)
+            block.append('exception when others then')
+            if ignore_errors:
+                codes = ','.join(str(-abs(int(code))) for code in ignore_errors)
+                block.append("if sqlcode in (%s) then :ignored := :ignored || ',%d'; else" % (codes, i))
+                block.append(':code := -sqlcode; :msg := sqlerrm; return; end if;')
+            else:
+                block.append(':code := -sqlcode; :msg := sqlerrm; return;')
+            block.append('end;')
+            block.append(':done := %d;' % (i + 1))
+        block.append('end;')
+
+        started = time.time()
+        try:
+            with self.watchdog([b[0] for b in batch]) as timer, self.conn.cursor() as cursor:
+                done = cursor.var(int)
+                code = cursor.var(int)
+                msg = cursor.var(str, 4000)
+                ignored = cursor.var(str, 32767)
+                params.update({'done': done, 'code': code, 'msg': msg, 'ignored': ignored})
+                cursor.execute('\n'.join(block), params)
+        except cx_Oracle.DatabaseError as e:
+            error = e.args[0]
+            self.module.fail_json(msg=error.message, code=error.code, request=[b[0] for b in batch], ddls=self.ddls, changed=self.changed)
+
+        self.record_perf('ddl_block', '\n'.join(b[0] for b in batch), started, statements=len(batch))
+        skipped = set(int(i) for i in (ignored.getvalue() or '').split(',') if i)
+        for i, (request, no_change, ignore_errors) in enumerate(batch[:done.getvalue() or 0]):
+            if i in skipped:
+                continue
+            self.ddls.append(request)
+            if not no_change:
+                self.changed = True
+
+        if code.getvalue():
+            request = batch[done.getvalue() or 0][0]
+            if code.getvalue() in CALL_TIMEOUT_ERRORS or (timer is not None and timer.finished.is_set()):
+                self.fail_timeout(request, started)  # cancel was trapped by the exception handler of the block
+            self.module.fail_json(msg=msg.getvalue(), code=code.getvalue(), request=request, ddls=self.ddls, changed=self.changed)
+
+    def execute_many(self, sql, rows):
+        """Execute a DML statement once for every row of bind values (array DML), in a single round trip.
+
+        sql -- DML statement with bind variables
+        rows -- List of bind values, dictionaries (named binds) or sequences (positional binds)
+        Rows which fail do not stop the others (batcherrors). In check mode, statement is not executed.
+        Return (rowcounts, errors): number of rows affected by each row of binds,
+        and list of (offset within rows, error code, message) of failed rows.
+        """
+        if self.ddl_queue:
+            self.flush()
+        if self.module.check_mode:
+            return [0] * len(rows), []
+        started = time.time()
+        try:
+            with self.watchdog(sql):
+                if self.broker:
+                    rowcounts, errors = self.broker.executemany(sql, rows)
+                else:
+                    with self.conn.cursor() as cursor:
+                        cursor.executemany(sql, rows, batcherrors=True, arraydmlrowcounts=True)
+                        errors = [(error.offset, error.code, error.message) for error in cursor.getbatcherrors()]
+                        rowcounts = cursor.getarraydmlrowcounts()  # 0 for failed rows
+        except cx_Oracle.DatabaseError as e:
+            error = e.args[0]
+            self.module.fail_json(msg=error.message, code=error.code, request=sql, ddls=self.ddls, changed=self.changed)
+        self.record_perf('executemany', sql, started, rows=len(rows))
+        if sum(rowcounts):
+            self.changed = True
+        return rowcounts, errors
+
+    def execute_statement(self, statement, params=None):
         """Execute a statement, can be a query or a procedure and return lines of dbms_output.put_line().
 
         statement -- SQL request or PL/SQL block
+        params -- Dictionary of bind parameters (default {})
 
         In check mode, statement is not executed.
         If PL/SQL block contains put_line, the output will be returned.
         """
+        if self.ddl_queue:
+            self.flush()
         output_lines = []
+        started = time.time()
         try:
-            if not self.module.check_mode:
+            if not self.module.check_mode and self.broker:
+                with self.watchdog(statement):
+                    output_lines = self.broker.statement(statement, params)
+                self.ddls.append(statement)
+            elif not self.module.check_mode:
                 if 'dbms_output.put_line' in statement.lower():
                     with self.conn.cursor() as cursor:
                         cursor.callproc('dbms_output.enable', [None])
-                        cursor.execute(statement)
+                        with self.watchdog(statement):
+                            cursor.execute(statement, params or {})
 
                         chunk_size = 100  # Get lines by batch of 100
                         # create variables to hold the output
@@ -238,17 +792,94 @@ class oracleConnection:
                             if num_lines < chunk_size:  # if less lines than the chunk value was fetched, it's the end
                                 break
                 else:
-                    with self.conn.cursor() as cursor:                    
-                        cursor.execute(statement)
+                    with self.conn.cursor() as cursor, self.watchdog(statement):
+                        cursor.execute(statement, params or {})
                 self.ddls.append(statement)
             else:
                 self.ddls.append('--' + statement)
+                return output_lines
+            self.record_perf('statement', statement, started, rows=len(output_lines))
             return output_lines
         except cx_Oracle.DatabaseError as e:
             error = e.args[0]
             self.module.fail_json(msg=error.message, code=error.code, request=statement)
 
             
+PERF_ROUNDTRIPS_SQL = """
+select s.value
+from v$mystat s join v$statname n on n.statistic# = s.statistic#
+where n.name = 'SQL*Net roundtrips to/from client'"""
+
+
+def perf_enabled(module):
+    if module.params.get('perf'):
+        return True
+    return os.environ.get(PERF_ENV, '').lower() in ('1', 'true', 'yes', 'on')
+
+
+class perfRecorder:
+    """Per-statement timing collected by oracleConnection when perf is enabled.
+
+    round_trips of a statement is the delta of 'SQL*Net roundtrips to/from client' of the session (v$mystat)
+    read after it and after the previous one, so it includes execute, fetches, dbms_output calls and array DML
+    batches. Every measurement costs one extra round trip, which is not counted. round_trips is None when
+    v$mystat can not be read.
+    """
+
+    def __init__(self):
+        self.connect = None
+        self.connect_via = None
+        self.statements = []
+        self.round_trips = None  # session round trips at the last measurement
+        self.probe_round_trips = None  # round trips of the v$mystat query itself
+
+    def record(self, kind, sql, elapsed, rows=None, arraysize=None, statements=None, round_trips=None):
+        entry = {'kind': kind,
+                 'sql': sql if len(sql) <= 200 else sql[:200] + '...',
+                 'elapsed': round(elapsed, 6),
+                 'round_trips': round_trips}
+        if statements:
+            entry['statements'] = statements
+        if rows is not None:
+            entry['rows'] = rows
+        if arraysize:
+            entry['arraysize'] = arraysize
+        self.statements.append(entry)
+
+    def report(self):
+        return {'connect': self.connect,
+                'connect_via': self.connect_via,
+                'statement_count': len(self.statements),
+                'elapsed': round(sum(s['elapsed'] for s in self.statements), 6),
+                'statements': list(self.statements)}
+
+
+class containerSession:
+    """Pooled session switched into a container, handed to functions run by oracleConnection.for_each_container().
+
+    Methods raise cx_Oracle.DatabaseError, errors are reported by for_each_container.
+    """
+
+    def __init__(self, conn, container):
+        self.conn = conn
+        self.container = container
+        self.version = conn.version
+
+    def execute_select(self, sql, params=None, fetchone=False):
+        with self.conn.cursor() as cursor:
+            cursor.execute(sql, params or {})
+            return cursor.fetchone() if fetchone else cursor.fetchall()
+
+    def execute_select_to_dict(self, sql, params=None, fetchone=False):
+        with self.conn.cursor() as cursor:
+            cursor.execute(sql, params or {})
+            column_names = [description[0].lower() for description in cursor.description]
+            if fetchone:
+                row = cursor.fetchone()
+                return dict(zip(column_names, row)) if row else dict()
+            return [dict(zip(column_names, row)) for row in cursor]
+
+
 class dictcur(object):
     # need to monkeypatch the built-in execute function to always return a dict
     def __init__(self, cursor):
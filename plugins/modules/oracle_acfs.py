@@ -89,10 +89,10 @@ def check_volume_exists(cursor, module, msg, name, diskgroup):
     sql = '''
           select count (*) from v$asm_volume v,v$asm_diskgroup g
           where v.group_number = g.group_number
-          and lower (g.name) = \'%s\'
-          and lower (v.volume_name) = \'%s\'
-          ''' % (diskgroup.lower(),name.lower())
-    result = execute_sql_get(module, msg, cursor, sql)
+          and lower (g.name) = lower(:diskgroup)
+          and lower (v.volume_name) = lower(:name)
+          '''
+    result = execute_sql_get(module, msg, cursor, sql, {'diskgroup': diskgroup, 'name': name})
     #msg = 'Normal Result is: %s, [0] is: %s, [0][0] is: %s, len is: %s, type is: %s' % (result,result[0],result[0][0],len(result), type(result))
     #module.exit_json(msg=msg)
     if result[0][0] > 0:
@@ -106,12 +106,12 @@ def add_filesystem(cursor, module, msg, oracle_home, volume_name, diskgroup, mou
     device_sql = '''
               select volume_device from v$asm_volume v,v$asm_diskgroup g
               where v.group_number = g.group_number
-              and lower (g.name) = \'%s\'
-              and lower (v.volume_name) = \'%s\'
-              ''' % (diskgroup.lower(),volume_name.lower())
+              and lower (g.name) = lower(:diskgroup)
+              and lower (v.volume_name) = lower(:name)
+              '''
     # module.exit_json(msg=device_sql, changed=False)
 
-    _device_name = execute_sql_get(module,msg,cursor,device_sql)
+    _device_name = execute_sql_get(module,msg,cursor,device_sql, {'diskgroup': diskgroup, 'name': volume_name})
 
 
     if not _check_filesystem_exist(cursor, module, msg, oracle_home, _device_name):
@@ -208,11 +208,11 @@ def _format_filesystem(module, msg, _device_name):
 
 
 
-def execute_sql_get(module, msg, cursor, sql):
+def execute_sql_get(module, msg, cursor, sql, params=None):
 
     #module.exit_json(msg="In execute_sql_get", changed=False)
     try:
-        cursor.execute(sql)
+        cursor.execute(sql, params or {})
         result = (cursor.fetchall())
     except cx_Oracle.DatabaseError as exc:
         error, = exc.args
@@ -130,8 +130,8 @@ else:
 # Check if the diskgroup exists
 def check_diskgroup_exists(cursor, module, msg, name):
 
-    sql = 'select count(*) from gv$asm_diskgroup where lower (name) = \'%s\'' % (name.lower())
-    result = execute_sql_get(module, msg, cursor, sql)
+    sql = 'select count(*) from gv$asm_diskgroup where lower(name) = lower(:name)'
+    result = execute_sql_get(module, msg, cursor, sql, {'name': name})
     #msg = 'Normal Result is: %s, [0] is: %s, [0][0] is: %s, len is: %s, type is: %s' % (result,result[0],result[0][0],len(result), type(result))
     #module.exit_json(msg=msg)
     if result[0][0] > 0:
@@ -225,7 +225,7 @@ def ensure_diskgroup_state(cursor, module, msg, name, state, disks, attribute_na
         # Make sure properties are lower case
         attribute_name =  [x.lower() for x in attribute_name]
         attribute_value =  [y.lower() for y in attribute_value]
-        wanted_attributes = zip(attribute_name,attribute_value)
+        wanted_attributes = list(zip(attribute_name,attribute_value))
 
         # Make sure we don't try to modify read only attributes. Removing them from the wanted_attributes list
         for a in wanted_attributes:
@@ -233,7 +233,7 @@ def ensure_diskgroup_state(cursor, module, msg, name, state, disks, attribute_na
                 wanted_attributes.remove(a)
 
         # Check the current attributes
-        attribute_names_ =','.join(['\''+str(n[0])+'\'' for n in (wanted_attributes)])
+        attribute_names_ = [str(n[0]) for n in wanted_attributes]
         # Only get current attributes if we still have attributes in the wanted list
         if len(attribute_names_) != 0:
             current_properties = get_current_properties (cursor, module, msg, name, attribute_names_)
@@ -296,27 +296,27 @@ def get_current_disks(cursor, module, msg, name):
 
     sql = 'select d.path,d.name from v$asm_disk d, v$asm_diskgroup dg '
     sql += 'where dg.group_number = d.group_number '
-    sql += 'and upper(dg.name) = \'%s\'' % (name.upper())
+    sql += 'and upper(dg.name) = upper(:name)'
 
-    result = execute_sql_get(module, msg, cursor, sql)
+    result = execute_sql_get(module, msg, cursor, sql, {'name': name})
     return result
 
 def get_current_properties(cursor, module, msg, name,attribute_names_):
 
-
+    # All attributes are fetched and filtered here, an IN-list would make a distinct statement per attribute set
     sql = 'select lower(a.name),lower(a.value) from v$asm_attribute a, v$asm_diskgroup dg '
     sql += 'where dg.group_number = a.group_number '
-    sql += 'and upper(dg.name) = \'%s\' ' % (name.upper())
-    sql += 'and a.name in (%s) ' % (attribute_names_.lower())
+    sql += 'and upper(dg.name) = upper(:name)'
 
-    result = execute_sql_get(module, msg, cursor, sql)
-    return result
+    wanted = [n.lower() for n in attribute_names_]
+    result = execute_sql_get(module, msg, cursor, sql, {'name': name})
+    return [row for row in result if row[0] in wanted]
 
-def execute_sql_get(module, msg, cursor, sql):
+def execute_sql_get(module, msg, cursor, sql, params=None):
 
     #module.exit_json(msg="In execute_sql_get", changed=False)
     try:
-        cursor.execute(sql)
+        cursor.execute(sql, params or {})
         result = (cursor.fetchall())
     except cx_Oracle.DatabaseError as exc:
         error, = exc.args
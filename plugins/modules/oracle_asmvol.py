@@ -78,10 +78,10 @@ def check_vol_exists(cursor, module, msg, diskgroup, name):
     sql = '''
           select count (*) from v$asm_volume v,v$asm_diskgroup g
           where v.group_number = g.group_number
-          and lower (g.name) = \'%s\'
-          and lower (v.volume_name) = \'%s\'
-          ''' % (diskgroup.lower(),name.lower())
-    result = execute_sql_get(module, msg, cursor, sql)
+          and lower (g.name) = lower(:diskgroup)
+          and lower (v.volume_name) = lower(:name)
+          '''
+    result = execute_sql_get(module, msg, cursor, sql, {'diskgroup': diskgroup, 'name': name})
     # msg = 'Normal Result is: %s, [0] is: %s, [0][0] is: %s, len is: %s, type is: %s' % (result,result[0],result[0][0],len(result), type(result))
     # module.exit_json(msg=msg)
     if result[0][0] > 0:
@@ -141,11 +141,11 @@ def remove_vol(cursor, module, msg, diskgroup, name):
         msg = 'error in exec sql remove'
         module.fail_json(msg=msg, changed=False)
 
-def execute_sql_get(module, msg, cursor, sql):
+def execute_sql_get(module, msg, cursor, sql, params=None):
 
     #module.exit_json(msg="In execute_sql_get", changed=False)
     try:
-        cursor.execute(sql)
+        cursor.execute(sql, params or {})
         result = (cursor.fetchall())
     except cx_Oracle.DatabaseError as exc:
         error, = exc.args
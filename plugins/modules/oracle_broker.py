@@ -0,0 +1,91 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+DOCUMENTATION = '''
+---
+module: oracle_broker
+short_description: Query or stop the per-host connection broker
+description:
+  - When the environment variable ANSIBLE_ORACLE_BROKER is set, modules using oracleConnection
+    do not logon to the database by themselves, they lease an authenticated session
+    from a broker process running on the target host.
+  - The broker is started on demand by the first task, runs as the OS user executing the task,
+    listens on a Unix socket in a private directory and exits after ANSIBLE_ORACLE_BROKER_IDLE seconds (default 300) of inactivity.
+  - Sessions are kept per connect descriptor, user and mode. Sessions which executed ALTER SESSION, SET ROLE, PL/SQL
+    or statements of oracle_sql are not reused.
+  - One broker runs per set of values of TNS_ADMIN and NLS_* environment variables of the tasks.
+  - This module is used to stop all brokers of the OS user at the end of a playbook, or to query their state (broker
+    is a list with one item per broker).
+version_added: "3.2.0"
+options:
+  state:
+    description:
+      - stopped - shut down the broker (if running), closing all idle sessions
+      - query - return broker state only
+    required: False
+    default: stopped
+    choices: ['stopped', 'query']
+notes:
+  - Has to run as the same OS user as the tasks which started the broker
+author:
+  - Ivan Brezina
+'''
+
+EXAMPLES = '''
+- hosts: dbservers
+  become: yes
+  become_user: oracle
+  environment:
+    ANSIBLE_ORACLE_BROKER: 1
+    ORACLE_HOME: "{{ oracle_home }}"
+    ORACLE_SID: "{{ oracle_sid }}"
+  tasks:
+    - oracle_user:
+        mode: sysdba
+        schema: app_user
+        schema_password: Xiejfkljfssgdhd123
+
+    - oracle_grant:
+        mode: sysdba
+        grantee: app_user
+        grants:
+          - create session
+
+  post_tasks:
+    - name: Stop connection broker
+      oracle_broker:
+        state: stopped
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+
+# In these we do import from collections
+try:
+    from ansible_collections.ibre5041.ansible_oracle_modules.plugins.module_utils.oracle_broker import query_brokers
+except:
+    pass
+
+
+def main():
+    module = AnsibleModule(
+        argument_spec=dict(
+            state=dict(default='stopped', choices=['stopped', 'query'])
+        ),
+        supports_check_mode=True
+    )
+
+    state = module.params['state']
+
+    status = query_brokers('status')
+    if not status:
+        module.exit_json(msg='Connection broker is not running', changed=False, running=False)
+
+    if state == 'query' or module.check_mode:
+        module.exit_json(msg='Connection broker is running', changed=False, running=True, broker=status)
+
+    query_brokers('shutdown')
+    module.exit_json(msg='Connection broker stopped', changed=True, running=False, broker=status)
+
+
+if __name__ == '__main__':
+    main()
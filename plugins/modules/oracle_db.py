@@ -931,10 +931,8 @@ def main():
     # Unset ORACLE_SID, we will deduce it later, this should fix RAC deployments
     os.environ.pop('ORACLE_SID', None)
 
-    ohomes = oracle_homes()
-    ohomes.list_crs_instances()
-    ohomes.list_processes()
-    ohomes.parse_oratab()
+    ohomes = oracle_homes(cache=True)
+    ohomes.discover()
     #ohomes.oracle_gi_managed = False# TODO REMOVE - override GI presence for testing
 
     # Connection details for database
@@ -990,7 +988,7 @@ def main():
             if 'WARNING' in msg:
                 module.warn(msg)
             # Try to detect ORACLE_SID of the new running database
-            ohomes.list_crs_instances()
+            ohomes.list_crs_instances(refresh=True)
             ohomes.list_processes()
             ohomes.parse_oratab()
             ensure_db_state(module, ohomes, newdb=True)
@@ -30,6 +30,49 @@ options:
     required: False
     default: None
     choices: [None, 'detail', 'summary']
+  all_local_instances:
+    description:
+      - Gather facts of all database instances running on this host (connect / as sysdba to each of them)
+      - Connection parameters and ORACLE_SID are ignored, ansible_facts contain one key per ORACLE_SID
+      - Instances which could not be queried are reported in instance_errors
+    required: False
+    default: False
+    type: bool
+  instance_concurrency:
+    description: Number of instances queried in parallel when all_local_instances is set
+    required: False
+    default: 4
+    type: int
+  instance_timeout:
+    description:
+      - Seconds after which gathering of facts of a single instance is cancelled when all_local_instances is set
+      - Also used as call timeout, unless call timeout is set by ANSIBLE_ORACLE_CALL_TIMEOUT
+    required: False
+    default: 60
+    type: int
+  gather_subset:
+    description:
+      - Subsets of facts to gather, overrides boolean options selecting facts
+      - Values password_file, instance, database, tablespaces, temp, userenv, redo, standby, option, parameter, rac, pdb,
+        all and min (database and userenv); prefix "!" excludes a subset, only exclusions select all other subsets
+      - redo and standby default to summary, parameter to @modified@ when selected here
+    required: False
+    type: list
+  gather_timeout:
+    description:
+      - Seconds a single database round trip of fact gathering can take (call timeout), requires Oracle Client 18c
+    required: False
+    type: int
+  fact_cache_ttl:
+    description:
+      - Seconds facts are reused from a cache file of the remote user instead of querying the database, 0 disables cache
+      - Cache is kept per connection (ORACLE_SID and ORACLE_HOME for local connections) and set of gathered subsets,
+        facts of a local instance are gathered again when the instance was restarted (pmon process changed)
+      - Facts of a remote database (user/password or wallet connection) are validated by one query of DBID and
+        instance startup time, they are gathered again after restart, switchover or failover
+    required: False
+    default: 0
+    type: int
 notes:
   - cx_Oracle needs to be installed
   - Oracle RDBMS 10gR2 or later required
@@ -60,6 +103,24 @@ EXAMPLES = '''
   debug:
     var: database_facts
 
+- name: Facts of all running databases
+  oracle_facts:
+    all_local_instances: true
+    instance_concurrency: 8
+    tablespaces: true
+  become: yes
+  become_user: oracle
+  register: host_facts
+
+- name: Cached summary of all running databases
+  oracle_facts:
+    all_local_instances: true
+    gather_subset: ['min', 'redo', 'pdb']
+    gather_timeout: 10
+    fact_cache_ttl: 3600
+  become: yes
+  become_user: oracle
+
 - hosts: localhost
   vars:
     oraclehost: 192.168.56.101
@@ -83,8 +144,12 @@ EXAMPLES = '''
         var: dbfacts
 '''
 
+import hashlib
+import json
 import os
 import sys
+import threading
+import time
 
 
 def rows_to_dict_list(cursor):
@@ -100,18 +165,12 @@ def query_result(connection, query, params = []):
     return res
 
 
-def star_query(connection, rowsource):
-    return query_result(connection, "SELECT * FROM %s" % rowsource)
-
-
-def detect_password_file(module):
-    oracle_sid = sid = os.environ['ORACLE_SID']
-    oracle_home = sid = os.environ['ORACLE_HOME']
+def detect_password_file(module, oracle_sid=None, oracle_home=None):
+    oracle_sid = oracle_sid or os.environ['ORACLE_SID']
+    oracle_home = oracle_home or os.environ['ORACLE_HOME']
 
-    h = oracle_homes(module)
-    h.list_crs_instances()
-    h.list_processes()
-    h.parse_oratab()
+    h = oracle_homes(module, cache=True)
+    h.discover()
 
     if h.crs_home:
         srvctl = os.path.join(h.crs_home, 'bin', 'srvctl')
@@ -132,15 +191,7 @@ def detect_password_file(module):
         PASSWORD = None
 
     if not PASSWORD:
-        orabasehome = os.path.join(h.crs_home, 'bin', 'orabasehome')
-        ORABASEHOME = None
-        proc = subprocess.Popen([orabasehome], stdout=subprocess.PIPE)
-        for line in iter(proc.stdout.readline, ''):
-            if line.decode('utf-8').strip():
-                ORABASEHOME = line.decode('utf-8').strip()
-            proc.poll()
-            if line == b'':
-                break
+        ORABASEHOME = h.basehome_from_home(h.crs_home) if h.crs_home else None
 
         if ORABASEHOME:
             pwfile = os.path.join(ORABASEHOME, 'dbs', 'orapw{}'.format(oracle_sid))
@@ -150,18 +201,7 @@ def detect_password_file(module):
     return PASSWORD
 
 
-def query_database(module, conn):
-    database = star_query(conn, 'v$database')[0]
-    if 'CDB' not in database:
-        database.update({'CDB': 'NO'})
-    return database
-
-def query_instance(module, conn):
-    instance = star_query(conn, 'v$instance')[0]
-    return instance
-
-
-def query_tablespaces(module, conn):
+def sql_tablespaces(module, conn):
     if conn.version >= '12.1':
         SQL = """
         select ts.con_id, ts.name, ts.bigfile, round(sum(bytes)/1024/1024) size_mb, count(*) datafiles#
@@ -176,12 +216,10 @@ def query_tablespaces(module, conn):
         join v$datafile df on df.ts#=ts.ts# 
         group by ts.name, ts.bigfile 
         order by 1,2"""
-
-    tablespaces = query_result(conn, SQL)
-    return tablespaces
+    return SQL, {}
 
 
-def query_temp(module, conn):
+def sql_temp(module, conn):
     if conn.version >= '12.1':
         SQL = """
         select ts.con_id, ts.name, ts.bigfile, round(sum(bytes)/1024/1024) size_mb, count(*) tempfiles# 
@@ -196,12 +234,10 @@ def query_temp(module, conn):
         join v$tempfile df on df.ts#=ts.ts# 
         group by ts.name, ts.bigfile 
         order by 1,2"""
-
-    temp = query_result(conn, SQL)
-    return temp
+    return SQL, {}
 
 
-def query_userenv(module, conn):
+def sql_userenv(module, conn):
     # USERENV
     sql = """
     SELECT sys_context('USERENV','CURRENT_USER') current_user
@@ -214,55 +250,377 @@ def query_userenv(module, conn):
         sql += ", to_number(sys_context('USERENV','CURRENT_EDITION_ID')) CURRENT_EDITION_ID " \
                ", sys_context('USERENV','CURRENT_EDITION_NAME') CURRENT_EDITION_NAME "
     sql += " FROM DUAL"
-    userenv = query_result(conn, sql)[0]
-    return userenv
+    return sql, {}
 
 
-def query_redo(module, conn):
-    if module.params['redo'].lower() == 'summary':
+def sql_redo(module, conn):
+    if (module.params['redo'] or 'summary').lower() == 'summary':
         SQL = "select thread# THREAD, count(1) as COUNT, max(round(bytes/1024/1024)) as SIZE_MB" \
               ", min(group#) min_seq, max(group#) max_seq " \
               "from v$log group by THREAD#"
     else:
         SQL = "select group#, thread#, sequence#, round(bytes/1024/1024) mb, blocksize, archived, status " \
               "from v$log order by thread#,group#"
-    redolog = query_result(conn, SQL)
-    return redolog
+    return SQL, {}
 
 
-def query_standby(module, conn):
-    if module.params['standby'].lower() == 'summary':
+def sql_standby(module, conn):
+    if (module.params['standby'] or 'summary').lower() == 'summary':
         SQL = "select thread# THREAD, count(1) as COUNT, max(round(bytes/1024/1024)) as SIZE_MB" \
               ", min(group#) min_seq, max(group#) max_seq " \
               "from v$standby_log group by THREAD#"
     else:
         SQL = "select group#, thread#, sequence#, round(bytes/1024/1024) mb, blocksize, archived, status " \
               "from v$standby_log order by thread#,group#"
-    redolog = query_result(conn, SQL)
-    return redolog
+    return SQL, {}
 
 
-def query_params(module, conn):
-    params = module.params['parameter']
+def sql_params(module, conn):
+    params = module.params['parameter'] or '@modified@'
+    if isinstance(params, list) and len(params) == 1 and params[0].startswith('@'):
+        params = params[0]  # '@all@' passed to option of type list
+    binds = {}
     if isinstance(params, list):
-        p = ','.join(["'{}'".format(p.lower()) for p in params])
-        filter = ' WHERE NAME in ({})'.format(p)
+        for i, p in enumerate(params):
+            binds['param%d' % i] = p.lower()
+        filter = ' WHERE NAME in ({})'.format(','.join(':' + b for b in binds))
     elif params.lower() == '@all@':
         filter = ''
     elif params.lower() == '@modified@':
-        filter = " WHERE ISDEFAULT = FALSE"
+        filter = " WHERE ISDEFAULT = 'FALSE'"
     elif params.lower():
-        filter = " WHERE NAME = '{}'".format(params.lower())
+        binds['param0'] = params.lower()
+        filter = ' WHERE NAME = :param0'
     else:
         filter = ''
-    SQL = 'select name, value, isdefault from v$parameter ' + filter
-    resultset = query_result(conn, SQL)
+    return 'select name, value, isdefault from v$parameter' + filter, binds
+
+
+# Facts which are left out when their query fails
+OPTIONAL_FACTS = ('pdb',)
+
+# Fact subsets for gather_subset, in order of gathering
+SUBSETS = ('password_file', 'instance', 'database', 'tablespaces', 'temp', 'userenv', 'redo', 'standby', 'option',
+           'parameter', 'rac', 'pdb')
+MIN_SUBSETS = ('database', 'userenv')
+
+# DBID and startup time of instance are recorded with cached facts
+CACHE_KEY_SQL = 'SELECT d.dbid, i.startup_time FROM v$database d, v$instance i'
+FACTS_CACHE_FORMAT = 1
+
+
+def selected_subsets(module):
+    """
+    Return set of fact subsets to gather.
+    gather_subset works like for setup module: names, 'all', 'min' and exclusions '!name' (only exclusions: all but them).
+    Without gather_subset the boolean options select subsets, rac and pdb are always gathered.
+    """
+    gather_subset = module.params['gather_subset']
+    if not gather_subset:
+        selected = set(name for name in SUBSETS if name in module.params and module.params[name])
+        return selected | set(['rac', 'pdb'])
+    selected = set()
+    excluded = set()
+    for item in gather_subset:
+        name = item.strip().lstrip('!').lower()
+        if name == 'all':
+            names = SUBSETS
+        elif name == 'min':
+            names = MIN_SUBSETS
+        elif name in SUBSETS:
+            names = (name,)
+        else:
+            module.fail_json(msg='Invalid gather_subset {}, valid values are: all, min, {}'.format(item, ', '.join(SUBSETS)))
+        if item.strip().startswith('!'):
+            excluded.update(names)
+        else:
+            selected.update(names)
+    if not selected:
+        selected = set(SUBSETS)
+    return selected - excluded
+
+
+def facts_queries(module, conn, selected, cache_key=False):
+    """ Return list of (key, sql, binds) of queries of selected facts subsets """
+    queries = []
+    if 'instance' in selected:
+        queries.append(('instance', 'SELECT * FROM v$instance', {}))
+    if 'database' in selected:
+        queries.append(('database', 'SELECT * FROM v$database', {}))
+    if 'tablespaces' in selected:
+        queries.append(('tablespaces',) + sql_tablespaces(module, conn))
+    if 'temp' in selected:
+        queries.append(('temp',) + sql_temp(module, conn))
+    if 'userenv' in selected:
+        queries.append(('userenv',) + sql_userenv(module, conn))
+    if 'redo' in selected:
+        queries.append(('redo',) + sql_redo(module, conn))
+    if 'standby' in selected:
+        queries.append(('standby',) + sql_standby(module, conn))
+    if 'option' in selected:
+        queries.append(('option', 'SELECT * FROM v$option', {}))
+    if 'parameter' in selected:
+        queries.append(('parameter',) + sql_params(module, conn))
+    if 'rac' in selected:
+        queries.append(('rac', 'SELECT inst_id, instance_name, host_name, startup_time FROM gv$instance ORDER BY inst_id', {}))
+    # the view does not exist before 12.1, no rows in non-CDB
+    if 'pdb' in selected and conn.version >= '12.1':
+        queries.append(('pdb', 'SELECT con_id, rawtohex(guid) guid_hex, name, open_mode FROM v$pdbs ORDER BY name', {}))
+    if cache_key:
+        queries.append(('cache_key', CACHE_KEY_SQL, {}))
+    return queries
+
+
+def execute_queries(conn, queries):
+    """
+    Execute queries, return dictionary of results (list of rows as dictionaries) by key.
+    Since 12.1 all queries are executed by a single PL/SQL block returning implicit result sets, one round trip.
+    Otherwise, or when the client does not support implicit results, queries are executed one by one.
+    """
+    if len(queries) > 1 and conn.version >= '12.1':
+        block = ['DECLARE', '  c SYS_REFCURSOR;', 'BEGIN']
+        binds = {}
+        for key, sql, params in queries:
+            block.append('  OPEN c FOR {};'.format(sql.strip()))
+            block.append('  DBMS_SQL.RETURN_RESULT(c);')
+            binds.update(params)
+        block.append('END;')
+        cursor = conn.cursor()
+        try:
+            cursor.execute('\n'.join(block), binds)
+            results = cursor.getimplicitresults()
+            if len(results) == len(queries):
+                return dict((key, rows_to_dict_list(rs)) for (key, _, _), rs in zip(queries, results))
+        except Exception:
+            # e.g. DPI-1050 client older than 12.1, AttributeError cx_Oracle older than 7.0;
+            # an error of a query is raised again when it is executed alone
+            pass
+        finally:
+            cursor.close()
     result = {}
-    for p in resultset:
-        result[p['NAME']] = {'isdefault': p['ISDEFAULT'], 'value': p['VALUE']}
+    for key, sql, params in queries:
+        try:
+            result[key] = query_result(conn, sql, params)
+        except Exception:
+            if key not in OPTIONAL_FACTS:
+                raise
     return result
 
 
+def gather_facts(module, conn, sid, oracle_home=None, selected=None, cache_key=None):
+    """
+    Return dictionary of facts of database connected by conn, selected is set of subsets (default: selected_subsets()).
+    cache_key -- dictionary, DBID and STARTUP_TIME are stored into it when given
+    """
+    if selected is None:
+        selected = selected_subsets(module)
+    db = {'version': conn.version}
+
+    if 'password_file' in selected:
+        password_file = detect_password_file(module, sid, oracle_home)
+        db.update({'password_file': password_file})
+
+    result = execute_queries(conn, facts_queries(module, conn, selected, cache_key is not None))
+    if cache_key is not None:
+        cache_key.update(result['cache_key'][0])
+
+    if 'instance' in result:
+        db.update({'database': result['instance'][0]})
+
+    database = None
+    if 'database' in result:
+        database = result['database'][0]
+        if 'CDB' not in database:
+            database.update({'CDB': 'NO'})
+        db.update({'database': database})
+
+    for key in ('tablespaces', 'temp'):
+        if key in result:
+            db.update({key: result[key]})
+
+    if 'userenv' in result:
+        db.update({sid: {'userenv': result['userenv'][0]}})
+
+    for key in ('redo', 'standby', 'option'):
+        if key in result:
+            db.update({key: result[key]})
+
+    if 'parameter' in result:
+        parameters = {}
+        for p in result['parameter']:
+            parameters[p['NAME']] = {'isdefault': p['ISDEFAULT'], 'value': p['VALUE']}
+        db.update({'parameter': parameters})
+
+    if 'rac' in selected:
+        db.update({'rac': result['rac']})
+
+    if 'pdb' in selected:
+        if database and database['CDB'] != 'YES':
+            pdb = []
+        else:
+            pdb = result.get('pdb', [])
+        db.update({'pdb': pdb})
+    return db
+
+
+def facts_cache_path(module, identity, selected):
+    """ Cache file of facts of database identified by identity (connect string, ORACLE_SID), one per set of subsets """
+    key = json.dumps([identity, sorted(selected), module.params['redo'], module.params['standby'], module.params['parameter']])
+    return os.path.join(private_cache_dir('facts'), hashlib.sha1(key.encode()).hexdigest() + '.json')
+
+
+def cached_facts(module, path, pmon_pid=None, cache_key=None):
+    """
+    Return facts from cache file when younger than fact_cache_ttl seconds, otherwise None.
+    pmon_pid -- PID of pmon of local instance, cache of previous incarnation of the instance is not used
+    cache_key -- DBID and STARTUP_TIME (CACHE_KEY_SQL) of remote database, cache of other database or instance is not used
+    """
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+    if data.get('format') != FACTS_CACHE_FORMAT or time.time() - data.get('created', 0) > module.params['fact_cache_ttl']:
+        return None
+    if pmon_pid is not None and data.get('pmon_pid') != pmon_pid:
+        return None
+    if cache_key is not None and [str(data.get('dbid')), str(data.get('startup_time'))] != \
+            [str(cache_key.get('DBID')), str(cache_key.get('STARTUP_TIME'))]:
+        return None
+    return data['facts']
+
+
+def store_facts(module, path, facts, cache_key, pmon_pid=None):
+    try:
+        write_private_json(path, {'format': FACTS_CACHE_FORMAT, 'created': time.time(), 'dbid': cache_key.get('DBID'),
+                                  'startup_time': cache_key.get('STARTUP_TIME'), 'pmon_pid': pmon_pid, 'facts': facts})
+    except (IOError, OSError) as e:
+        module.warn('Facts cache not written: {}'.format(e))
+
+
+def pmon_pids():
+    """ {ORACLE_SID: PID of pmon} of instances running on this host """
+    return dict((cmd_line.split('_', 2)[2], os.path.basename(piddir)) for piddir, cmd_line in pmon_processes())
+
+
+def local_identity(sid, oracle_home):
+    return 'local:{}:{}'.format(sid, oracle_home or '')
+
+
+def connection_identity(module):
+    """ Return (identity, ORACLE_SID) of database the module connects to, ORACLE_SID is None for remote connections """
+    if module.params['user']:
+        return '{}@{}:{}/{}'.format(module.params['user'].lower(), module.params['hostname'], module.params['port'],
+                                    module.params['service_name']), None
+    if module.params['mode'] == 'sysdba':
+        sid = os.environ.get('ORACLE_SID')
+        return local_identity(sid, module.params['oracle_home'] or os.environ.get('ORACLE_HOME')), sid
+    return 'wallet:{}'.format(module.params['service_name']), None
+
+
+def gather_local_instances(module):
+    """
+    Gather facts of all database instances running on this host concurrently.
+    Return (facts, errors, cached), dictionaries keyed by ORACLE_SID, an error of one instance does not affect others,
+    cached is list of ORACLE_SIDs whose facts were taken from cache.
+    """
+    instances = oracle_homes.running_instances()
+    # ASM (+ASM, +APX) and GIMR (-MGMTDB) instances are skipped
+    sids = sorted(sid for sid in instances if not sid.startswith(('+', '-')))
+    timeout = module.params['instance_timeout']
+    settings = session_settings(module)
+    settings['call_timeout'] = settings['call_timeout'] or module.params['gather_timeout'] or timeout
+    selected = selected_subsets(module)
+    ttl = module.params['fact_cache_ttl']
+    pids = pmon_pids() if ttl else {}
+    started = {}
+    conns = {}
+
+    facts = {}
+    errors = {}
+    cached = []
+    for sid in list(sids):
+        if ttl:
+            db = cached_facts(module, facts_cache_path(module, local_identity(sid, instances[sid]), selected), pids.get(sid))
+            if db is not None:
+                facts[sid] = db
+                cached.append(sid)
+                sids.remove(sid)
+
+    def gather(sid):
+        started[sid] = time.time()
+        conn = bequeath_connect(module, sid, instances[sid], settings)
+        conns[sid] = conn
+        try:
+            if conn.version < "10.2":
+                raise Exception("Database version must be 10gR2 or greater")
+            cache_key = {} if ttl else None
+            db = gather_facts(module, conn, sid, instances[sid], selected, cache_key)
+            if ttl:
+                path = facts_cache_path(module, local_identity(sid, instances[sid]), selected)
+                store_facts(module, path, db, cache_key, pids.get(sid))
+            return db
+        finally:
+            conn.close()
+
+    # Workers are daemon threads, a worker stuck on a hung instance does not block module exit,
+    # another worker is started instead of it
+    queue = list(sids)
+    results = {}
+    timed_out = set()
+    cond = threading.Condition()
+
+    def worker():
+        while True:
+            with cond:
+                if not queue:
+                    return
+                sid = queue.pop(0)
+                started[sid] = time.time()
+            try:
+                result = (gather(sid), None)
+            except Exception as e:
+                result = (None, e)
+            with cond:
+                results[sid] = result
+                cond.notify()
+
+    def start_worker():
+        thread = threading.Thread(target=worker, name='oracle_facts')
+        thread.daemon = True
+        thread.start()
+
+    for i in range(min(max(1, module.params['instance_concurrency']), len(sids))):
+        start_worker()
+    with cond:
+        while len(set(results) | timed_out) < len(sids):
+            cond.wait(timeout=0.5)
+            for sid in list(started):
+                if sid in results or sid in timed_out or time.time() - started[sid] <= timeout:
+                    continue
+                timed_out.add(sid)
+                if sid in conns:
+                    # Cancel running call, the worker finishes with ORA-01013
+                    try:
+                        conns[sid].cancel()
+                    except Exception:
+                        pass
+                if queue:
+                    start_worker()
+
+    for sid in sids:
+        if sid in timed_out:
+            state = 'connecting' if sid not in conns else 'gathering facts'
+            errors[sid] = 'Facts not gathered in {} seconds, timed out while {}'.format(timeout, state)
+        elif results[sid][1] is not None:
+            errors[sid] = str(results[sid][1]).strip()
+        else:
+            facts[sid] = results[sid][0]
+    for sid in sorted(errors):
+        module.warn('ORACLE_SID: {}: {}'.format(sid, errors[sid]))
+    return facts, errors, cached
+
+
 def main():
     module = AnsibleModule(
         argument_spec=dict(
@@ -283,76 +641,71 @@ def main():
             tablespaces=dict(default=False, type='bool'),
             temp=dict(default=False, type='bool'),
             redo=dict(default=None, choices=[None, "detail", "summary"]),
-            standby=dict(default=None, choices=[None, "detail", "summary"])
+            standby=dict(default=None, choices=[None, "detail", "summary"]),
+            all_local_instances=dict(default=False, type='bool'),
+            instance_concurrency=dict(default=4, type='int'),
+            instance_timeout=dict(default=60, type='int'),
+            gather_subset=dict(default=None, type='list'),
+            gather_timeout=dict(default=None, type='int'),
+            fact_cache_ttl=dict(default=0, type='int')
         ),
         supports_check_mode=True
     )
 
+    if module.params['all_local_instances']:
+        if module.check_mode:
+            module.exit_json(changed=False)
+        facts, errors, cached = gather_local_instances(module)
+        module.exit_json(msg='', changed=False, ansible_facts=facts, instance_errors=errors, cached=cached)
+
+    selected = selected_subsets(module)
+    ttl = module.params['fact_cache_ttl']
+    db = None
+    if ttl:
+        identity, sid = connection_identity(module)
+        path = facts_cache_path(module, identity, selected)
+        if sid:
+            # local instance, cache is valid while the same pmon process runs
+            pmon_pid = pmon_pids().get(sid)
+            db = cached_facts(module, path, pmon_pid) if pmon_pid else None
+            if db is not None:
+                module.exit_json(msg='', changed=False, ansible_facts={os.environ['ORACLE_SID']: db}, cached=True)
+        else:
+            db = cached_facts(module, path)
+
     # Connect to database
     conn = oracle_connect(module)
 
     if conn.version < "10.2":
         module.fail_json(msg="Database version must be 10gR2 or greater", changed=False)
     #
+    if module.params['gather_timeout']:
+        try:
+            conn.callTimeout = module.params['gather_timeout'] * 1000
+        except AttributeError:
+            pass  # Oracle Client older than 18c
+
+    if db is not None:
+        # remote database, cache is valid while DBID and instance startup time are the same
+        try:
+            db = cached_facts(module, path, cache_key=query_result(conn, CACHE_KEY_SQL, {})[0])
+        except Exception:
+            db = None
+        if db is not None:
+            module.exit_json(msg='', changed=False, ansible_facts={os.environ['ORACLE_SID']: db}, cached=True)
+    #
     if module.check_mode:
         module.exit_json(changed=False)
-    #
-    sid = os.environ['ORACLE_SID']
-    facts = {sid: {'version': conn.version}}
-    db = facts[sid]
-
-    if module.params["password_file"]:
-        password_file = detect_password_file(module)
-        db.update({'password_file': password_file})
-
-    if module.params["instance"]:
-        instance = query_instance(module, conn)
-        db.update({'database': instance})
-
-    if module.params["database"]:
-        database = query_database(module, conn)
-        db.update({'database': database})
-
-    if module.params["tablespaces"]:
-        tablespaces = query_tablespaces(module, conn)
-        db.update({'tablespaces': tablespaces})
-
-    if module.params["temp"]:
-        temp = query_temp(module, conn)
-        db.update({'temp': temp})
-
-    if module.params['userenv']:
-        userenv = query_userenv(module, conn)
-        db.update({sid: {'userenv': userenv}})
-
-    if module.params['redo']:
-        redo = query_redo(module, conn)
-        db.update({'redo': redo})
-
-    if module.params['standby']:
-        standby = query_standby(module, conn)
-        db.update({'standby': standby})
-
-    if module.params['option']:
-        option = star_query(conn, "v$option")
-        db.update({'option': option})
-
-    if module.params['parameter']:
-        parameters = query_params(module, conn)
-        db.update({'parameter': parameters})
-
-    rac = query_result(conn, "SELECT inst_id, instance_name, host_name, startup_time FROM gv$instance ORDER BY inst_id")
 
+    sid = os.environ['ORACLE_SID']
+    cache_key = {} if ttl else None
     try:
-        if database['CDB'] == 'YES':
-            pdb = query_result(conn, "SELECT con_id, rawtohex(guid) guid_hex, name, open_mode FROM v$pdbs ORDER BY name")
-        else:
-            pdb = []
-    except:
-        pdb = []
-
-    db.update({'rac': rac, 'pdb': pdb})
-    module.exit_json(msg='', changed=False, ansible_facts=facts)
+        db = gather_facts(module, conn, sid, selected=selected, cache_key=cache_key)
+    except Exception as e:
+        module.fail_json(msg='Fact gathering failed: {}'.format(e), changed=False)
+    if ttl:
+        store_facts(module, path, db, cache_key, pmon_pids().get(sid) if sid else None)
+    module.exit_json(msg='', changed=False, ansible_facts={sid: db}, cached=False)
 
 
 from ansible.module_utils.basic import *
@@ -367,8 +720,9 @@ from ansible.module_utils.basic import *
 #    pass
 
 try:
-    from ansible_collections.ibre5041.ansible_oracle_modules.plugins.module_utils.oracle_utils import oracle_connect
-    from ansible_collections.ibre5041.ansible_oracle_modules.plugins.module_utils.oracle_homes import oracle_homes
+    from ansible_collections.ibre5041.ansible_oracle_modules.plugins.module_utils.oracle_utils import oracle_connect, bequeath_connect
+    from ansible_collections.ibre5041.ansible_oracle_modules.plugins.module_utils.oracle_homes import oracle_homes, pmon_processes, private_cache_dir, write_private_json
+    from ansible_collections.ibre5041.ansible_oracle_modules.plugins.module_utils.oracle_session import session_settings
 except:    
     pass
 
@@ -275,12 +275,24 @@ def main():
     # Listener
     facts.update({'local_listener': local_listener()})
     facts.update({'scan_listener': list(scan_listener().values()) if iscrs else []})
-    # Databases
-    facts.update({'database_list': exec_program_lines([srvctl, 'config', 'database'])})
+    # Databases, srvctl is used only when the resource model could not be loaded
+    crs = crsModel.load(crsctl) if crsModel is not None else None
+    if crs:
+        databases = [r.get('DB_UNIQUE_NAME') or r.name.split('.')[1] for r in crs.of_type('ora.database.type')]
+    else:
+        databases = exec_program_lines([srvctl, 'config', 'database'])
+    facts.update({'database_list': databases})
     # Output
     module.exit_json(msg=", ".join(msg), changed=False, ansible_facts={"oracle_gi_facts": facts})
 
 
 from ansible.module_utils.basic import *
+
+# In these we do import from collections
+try:
+    from ansible_collections.ibre5041.ansible_oracle_modules.plugins.module_utils.oracle_crs import crsModel
+except ImportError:
+    crsModel = None
+
 if __name__ == '__main__':
     main()
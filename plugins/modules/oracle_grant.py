@@ -283,6 +283,7 @@ def ensure_grant(module, conn, schema, wanted_grant_list, object_privs, director
     if total_sql:
         for sql in total_sql:
             conn.execute_ddl(sql)
+        conn.flush()
         module.exit_json(msg=total_sql, changed=conn.changed, ddls=conn.ddls)
     else:
         msg = 'Nothing to do'
@@ -321,6 +322,7 @@ def remove_grant(module, conn, grantee, grants, object_privs, directory_privs, c
         # 01927, 00000, "cannot REVOKE privileges you did not grant"
         # 01952, 00000,  "system privileges not granted to '%s'"
         conn.execute_ddl(sql, ignore_errors=[1927, 1951, 1952])
+    conn.flush()
 
     msg = 'The grant(s) successfully removed from the schema/role %s' % grantee
     module.exit_json(msg=msg, changed=conn.changed, ddls=conn.ddls)
@@ -393,6 +395,9 @@ def main():
     if container:
         oc.execute_ddl('alter session set container = %s' % container)
 
+    # GRANT/REVOKE statements are shipped to the database in one PL/SQL block
+    oc.deferred = True
+
     if state == 'present':
         ensure_grant(module, oc, grantee, grants, object_privs, directory_privs, grant_mode, container)
     if state == 'REMOVEALL':
@@ -413,39 +413,7 @@ def main():
     if module.params['schedule_name'] and not re_name.match(module.params['schedule_name']):
         module.fail_json(msg="Invalid schedule name, must be SCHEMANAME.SCHEDULE_NAME")
     # Connect to database
-    hostname = module.params["hostname"]
-    port = module.params["port"]
-    service_name = module.params["service_name"]
-    user = module.params["user"]
-    password = module.params["password"]
-    mode = module.params["mode"]
-    wallet_connect = '/@%s' % service_name
-    try:
-        if (not user and not password ): # If neither user or password is supplied, the use of an oracle wallet is assumed
-            if mode == 'sysdba':
-                connect = wallet_connect
-                conn = cx_Oracle.connect(wallet_connect, mode=cx_Oracle.SYSDBA)
-            else:
-                connect = wallet_connect
-                conn = cx_Oracle.connect(wallet_connect)
-
-        elif (user and password ):
-            if mode == 'sysdba':
-                dsn = cx_Oracle.makedsn(host=hostname, port=port, service_name=service_name)
-                connect = dsn
-                conn = cx_Oracle.connect(user, password, dsn, mode=cx_Oracle.SYSDBA)
-            else:
-                dsn = cx_Oracle.makedsn(host=hostname, port=port, service_name=service_name)
-                connect = dsn
-                conn = cx_Oracle.connect(user, password, dsn)
-
-        elif (not(user) or not(password)):
-            module.fail_json(msg='Missing username or password for cx_Oracle')
-
-    except cx_Oracle.DatabaseError as exc:
-        error, = exc.args
-        msg[0] = 'Could not connect to database - %s, connect descriptor: %s' % (error.message, connect)
-        module.fail_json(msg=msg[0], changed=False)
+    conn = oracle_connect(module, sysdba_wallet=True)
     if conn.version < "10.2":
         module.fail_json(msg="Database version must be 10gR2 or greater", changed=False)
     #
@@ -489,5 +457,21 @@ def main():
 
 
 from ansible.module_utils.basic import *
+
+# In thise we do import from local project project sub-directory <project-dir>/module_utils
+# While this file is placed in <project-dir>/library
+# No colletions are used
+#try:
+#    from ansible.module_utils.oracle_utils import oracle_connect
+#except:
+#    pass
+
+# In thise we do import from collections
+try:
+    from ansible_collections.ibre5041.ansible_oracle_modules.plugins.module_utils.oracle_utils import oracle_connect
+except:
+    pass
+
+
 if __name__ == '__main__':
     main()
@@ -28,8 +28,23 @@ options:
     description: Return only databases which are OPEN
     required: false
     default: false
+  status_concurrency:
+    description:
+      - Number of instances whose status is queried in parallel
+      - Set to 1 to query instances one after another
+      - When executed as root by Python older than 3.9 instances are always queried one after another
+    required: false
+    default: 8
+    type: int
+  status_timeout:
+    description:
+      - Timeout in seconds of status query of a single instance, status of instance which does not respond is C(TIMEOUT)
+    required: false
+    default: 10
+    type: int
 notes:
   - Has to run either as root or oracle db owner
+  - Status of running instances is queried through bequeath connection when cx_Oracle is installed, otherwise using sqlplus
 requirements:
   - xml.dom
 author: 
@@ -85,6 +100,7 @@ import subprocess
 import socket
 from pwd import getpwuid
 from xml.dom import minidom
+from concurrent.futures import ThreadPoolExecutor
 
 from ansible.module_utils.basic import AnsibleModule
 
@@ -99,6 +115,7 @@ from ansible.module_utils.basic import AnsibleModule
 # In these we do import from collections
 try:
     from ansible_collections.ibre5041.ansible_oracle_modules.plugins.module_utils.oracle_homes import oracle_homes
+    from ansible_collections.ibre5041.ansible_oracle_modules.plugins.module_utils.oracle_utils import perf_enabled
 except:
     pass
 
@@ -459,6 +476,8 @@ def main():
             open_only = dict(default=False, type="bool"),
             writable_only = dict(default=False, type="bool"),
             homes = dict(default=None, choices=[None, 'all', 'client', 'server', 'crs', 'gateway']),
+            status_concurrency = dict(default=8, type="int"),
+            status_timeout = dict(default=10, type="int"),
             facts_item = dict()
          ),
         supports_check_mode=True
@@ -468,11 +487,15 @@ def main():
     open_only = module.params['open_only']
     writable_only = module.params['writable_only']
     homes = module.params['homes']
+    status_concurrency = max(1, module.params['status_concurrency'])
+    status_timeout = module.params['status_timeout']
+
+    if status_concurrency > 1 and not oracle_homes.demote_thread_safe():
+        # preexec_fn of Python < 3.9 can deadlock the child forked from a thread
+        status_concurrency = 1
 
-    h = oracle_homes(module)
-    h.list_crs_instances()
-    h.list_processes()
-    h.parse_oratab()
+    h = oracle_homes(module, cache=True)
+    h.discover()
 
     for sid in list(h.facts_item):
         try:
@@ -482,14 +505,26 @@ def main():
         except:
             pass
 
-        if h.facts_item[sid]["running"]:
-            status = h.query_db_status(oracle_owner = h.facts_item[sid]['owner']
-                                       , oracle_home = h.facts_item[sid]['ORACLE_HOME']
-                                       , oracle_sid = h.facts_item[sid]['ORACLE_SID'])
-            h.facts_item[sid]['status'] = status
-        else:
-            h.facts_item[sid]['status'] = ['DOWN']
-        
+    def query_status(sid):
+        # Failed status queries are reported by query_db_status as ['UNKNOWN']
+        if not h.facts_item[sid].get('owner'):
+            module.warn('ORACLE_SID: {} status query failed: owner of ORACLE_HOME {} not found'.format(
+                sid, h.facts_item[sid]['ORACLE_HOME']))
+            return ['UNKNOWN']
+        return h.query_db_status(oracle_owner = h.facts_item[sid]['owner']
+                                 , oracle_home = h.facts_item[sid]['ORACLE_HOME']
+                                 , oracle_sid = h.facts_item[sid]['ORACLE_SID']
+                                 , timeout = status_timeout)
+
+    # Instances are queried in parallel, results are merged in order of SIDs
+    running = sorted(sid for sid in h.facts_item if h.facts_item[sid]["running"])
+    with ThreadPoolExecutor(max_workers=status_concurrency) as executor:
+        statuses = dict(zip(running, executor.map(query_status, running)))
+    for sid in sorted(h.facts_item):
+        h.facts_item[sid]['status'] = statuses.get(sid, ['DOWN'])
+        if h.facts_item[sid]['status'] == ['TIMEOUT']:
+            module.warn('ORACLE_SID: {} did not respond in {}s'.format(sid, status_timeout))
+
     if running_only:
         for sid in list(h.facts_item):
             if not h.facts_item[sid]["running"]:
@@ -535,6 +570,10 @@ def main():
             elif homes == 'gateway' and h.homes[home]['home_type'] != 'gateway':
                 del h.homes[home]
 
+    if perf_enabled(module):
+        # Inventory files are not parsed when discovery was taken from cache
+        module.exit_json(oracle_list=h.facts_item, oracle_homes=h.homes, changed=False,
+                         perf={'discovery_cache': h.from_cache, 'parse_time': h.parse_time})
     module.exit_json(oracle_list=h.facts_item, oracle_homes=h.homes, changed=False)
 
 
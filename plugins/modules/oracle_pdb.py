@@ -23,9 +23,23 @@ options:
     default: None
     aliases: ['db']
   state:
-    description: The intended state of the pdb. status will just show the status of the pdb
+    description:
+      - The intended state of the pdb. status will just show the status of the pdb
+      - With pdb_name=all, status of all pdbs is returned as pdbs
     default: present
     choices: ['present','absent', 'status']
+  pool_min:
+    description: Minimal number of sessions in the session pool used to check several pdbs concurrently
+    required: false
+    default: 1
+  pool_max:
+    description: Maximal number of sessions in the session pool (number of pdbs checked concurrently)
+    required: false
+    default: 4
+  pool_increment:
+    description: Number of sessions added to the session pool when it grows
+    required: false
+    default: 1
   pdb_admin_username:
     description: The username for the pdb admin user
     required: false
@@ -105,6 +119,14 @@ EXAMPLES = '''
     state: status
   register: _oracle_pdb_status
 
+- name: Check the status of all pdbs, 8 pdbs at a time
+  oracle_pdb:
+    mode: sysdba
+    pdb_name: all
+    state: status
+    pool_max: 8
+  register: _oracle_pdbs_status
+
 - name: Unplug a pdb
   oracle_pdb:
     mode: sysdba    
@@ -125,6 +147,12 @@ EXAMPLES = '''
 import os
 
 
+PDB_PROPERTIES_SQL = "select property_name, property_value" \
+                     " from database_properties " \
+                     " where property_name in ('DEFAULT_TBS_TYPE','DEFAULT_PERMANENT_TABLESPACE','DEFAULT_TEMP_TABLESPACE', 'DBTIMEZONE') " \
+                     " order by 1"
+
+
 # Check if the pdb exists
 def check_pdb_exists(conn, pdb_name):
     sql = sql = 'select name, open_mode, restricted from v$pdbs where upper(name) = :pdb_name'
@@ -138,11 +166,7 @@ def check_pdb_exists(conn, pdb_name):
 
     conn.execute_ddl('ALTER SESSION SET CONTAINER = %s' % pdb_name, no_change=True)
 
-    sql = "select property_name, property_value" \
-          " from database_properties " \
-          " where property_name in ('DEFAULT_TBS_TYPE','DEFAULT_PERMANENT_TABLESPACE','DEFAULT_TEMP_TABLESPACE', 'DBTIMEZONE') " \
-          " order by 1"
-    prop = conn.execute_select(sql, None, fetchone=False)
+    prop = conn.execute_select(PDB_PROPERTIES_SQL, None, fetchone=False)
     result.update(dict(prop))
 
     sql = """
@@ -337,6 +361,37 @@ def check_pdb_status(conn, module):
     return result
 
 
+def check_all_pdbs_status(conn, module):
+    """Status of all PDBs, properties of open PDBs are queried concurrently over pooled sessions"""
+    sql = """
+    select name, con_id, con_uid, open_mode, restricted
+        , to_char(open_time,'HH24:MI:SS YYYY-MM-DD') as open_time
+        , recovery_status
+        , a.service_name
+    from v$pdbs
+    left outer join
+    (
+     select PDB, LISTAGG(NETWORK_NAME, ',') WITHIN GROUP(ORDER BY PDB) as service_name
+     from cdb_services group by PDB
+    ) a on a.pdb = v$pdbs.name
+    where name <> 'PDB$SEED'
+    order by name
+    """
+    pdbs = conn.execute_select_to_dict(sql)
+
+    def pdb_properties(session, container):
+        return dict(session.execute_select(PDB_PROPERTIES_SQL))
+
+    opened = [pdb['name'] for pdb in pdbs if pdb['open_mode'].startswith('READ')]
+    properties = conn.for_each_container(opened, pdb_properties)
+
+    result = {}
+    for pdb in pdbs:
+        pdb.update(properties.get(pdb['name'], {}))
+        result[pdb['name']] = pdb
+    return result
+
+
 def main():
     module = AnsibleModule(
         argument_spec = dict(
@@ -365,7 +420,10 @@ def main():
             default_tablespace_type = dict(default='smallfile', choices=['smallfile', 'bigfile']),
             default_tablespace  = dict(required=False),
             default_temp_tablespace = dict(required=False),
-            timezone            = dict(required=False)
+            timezone            = dict(required=False),
+            pool_min            = dict(type='int', default=1),
+            pool_max            = dict(type='int', default=4),
+            pool_increment      = dict(type='int', default=1)
         ),
         required_together=[['user', 'password'], ['pdb_admin_username', 'pdb_admin_password']],
         #mutually_exclusive=[['datafile_dest', 'file_name_convert']],
@@ -378,6 +436,11 @@ def main():
     state = module.params["state"]
 
     oc = oracleConnection(module)
+
+    if state == 'status' and pdb_name.lower() == 'all':
+        pdbs = check_all_pdbs_status(oc, module)
+        module.exit_json(msg='%d pluggable databases found' % len(pdbs), pdbs=pdbs, changed=False)
+
     pdb = check_pdb_exists(oc, pdb_name)
     if state in ['closed', 'opened', 'restricted', 'read_only']:
         if not pdb:
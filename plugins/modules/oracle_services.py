@@ -141,8 +141,8 @@ def check_service_exists(cursor, module, msg, oracle_home, name, database_name):
             msg = '%s' % (stdout)
             return True
     else:
-        sql = 'select lower(name) from dba_services where lower (name) = \'%s\'' % (name.lower())
-        if execute_sql_get(module, msg, cursor, sql):
+        sql = 'select lower(name) from dba_services where lower (name) = lower(:name)'
+        if execute_sql_get(module, msg, cursor, sql, {'name': name}):
             return True
         else:
             return False
@@ -370,10 +370,10 @@ def check_service_status(cursor, module, msg, oracle_home, name, database_name,
         sql = '''
             select lower(s.name)
             from v$active_services s
-            where lower(s.name) = \'%s\'
-              ''' % (name.lower())
+            where lower(s.name) = lower(:name)
+              '''
         #if execute_sql_get(module, msg, cursor, sql):
-        if execute_sql_get(module, msg, cursor, sql):
+        if execute_sql_get(module, msg, cursor, sql, {'name': name}):
             return True
         else:
             return False
@@ -460,11 +460,11 @@ def stop_service(cursor, module, msg, oracle_home, name, database_name):
 
 
 
-def execute_sql_get(module, msg, cursor, sql):
+def execute_sql_get(module, msg, cursor, sql, params=None):
 
     #module.exit_json(msg="In execute_sql_get", changed=False)
     try:
-        cursor.execute(sql)
+        cursor.execute(sql, params or {})
         result = (cursor.fetchone())
     except cx_Oracle.DatabaseError as exc:
         error, = exc.args
@@ -571,22 +571,7 @@ def main():
                 service_name  = pdb
                 database_name = pdb
 
-            wallet_connect = '/@%s' % service_name
-            try:
-                if (not user and not password ): # If neither user or password is supplied, the use of an oracle wallet is assumed
-                    connect = wallet_connect
-                    conn = cx_Oracle.connect(wallet_connect)
-                elif (user and password ):
-                    dsn = cx_Oracle.makedsn(host=hostname, port=port, service_name=service_name)
-                    connect = dsn
-                    conn = cx_Oracle.connect(user, password, dsn)
-                elif (not(user) or not(password)):
-                    module.fail_json(msg='Missing username or password for cx_Oracle')
-
-            except cx_Oracle.DatabaseError as exc:
-                    error, = exc.args
-                    msg = 'Could not connect to database - %s, connect descriptor: %s' % (error.message, connect)
-                    module.fail_json(msg=msg, changed=False)
+            conn = oracle_connect(module, service_name=service_name)
 
             cursor = conn.cursor()
 
@@ -660,5 +645,21 @@ def main():
 
 
 from ansible.module_utils.basic import *
+
+# In thise we do import from local project project sub-directory <project-dir>/module_utils
+# While this file is placed in <project-dir>/library
+# No colletions are used
+#try:
+#    from ansible.module_utils.oracle_utils import oracle_connect
+#except:
+#    pass
+
+# In thise we do import from collections
+try:
+    from ansible_collections.ibre5041.ansible_oracle_modules.plugins.module_utils.oracle_utils import oracle_connect
+except:
+    pass
+
+
 if __name__ == '__main__':
     main()
@@ -18,8 +18,134 @@ options:
     description: The sql you want to execute
     required: False
   script:
-    description: The script you want to execute. Doesn't handle selects
+    description:
+      - The script you want to execute, or @path of a script file on the target. Doesn't handle selects
+      - Split into statements like SQL*Plus does, SQL statements end with a semicolon or a line holding only a slash,
+        PL/SQL blocks and CREATE FUNCTION/PROCEDURE/PACKAGE/TRIGGER/TYPE with a slash line, both can be mixed
+      - SQL*Plus formatting commands (SET, PROMPT, SPOOL, COLUMN, ...) and WHENEVER SQLERROR EXIT are ignored with a warning,
+        EXEC[UTE] is executed as a PL/SQL block, EXIT ends the script
+      - The module fails on CONNECT, DISCONNECT, nested scripts (@, @@, START), substitution variables (DEFINE, ACCEPT, ...),
+        HOST and other WHENEVER commands
+      - Like in SQL*Plus, &name and &&name (also inside string literals) are substitution variables and fail the module,
+        after SET DEFINE OFF & is an ordinary character
     required: False
+  batch_dml:
+    description:
+      - Ship consecutive INSERT, UPDATE, DELETE and MERGE statements of script as anonymous PL/SQL blocks
+        (up to 100 statements per round trip) instead of one by one
+    required: False
+    default: False
+    type: bool
+  arraysize:
+    description: Number of rows fetched from the database per round trip (select only)
+    required: False
+    type: int
+  prefetchrows:
+    description: Number of rows prefetched by the execute call (select only, cx_Oracle 8+)
+    required: False
+    type: int
+  max_rows:
+    description: Fail if the select returns more rows than this
+    required: False
+    type: int
+  result_format:
+    description:
+      - Shape of data returned by select
+      - dict - list of dictionaries, one per row
+      - compact - dictionary with list of column names (columns) and list of row values (rows), much smaller for large results
+    required: False
+    default: dict
+    choices: ['dict', 'compact']
+  dest:
+    description:
+      - Path of a file on the target where rows of the select are written instead of returning them in data
+      - Rows are streamed from the cursor arraysize rows at a time, only row count, size, checksum and elapsed time are returned
+      - The file is replaced atomically, changed is False when its content did not change
+      - In check mode the select is not executed and the file is not written
+    required: False
+    type: path
+  dest_format:
+    description:
+      - Format of dest file
+      - csv - header line with column names followed by one line per row
+      - jsonl - one JSON object per row (JSON lines)
+    required: False
+    default: csv
+    choices: ['csv', 'jsonl']
+  compress:
+    description: Compress dest file with gzip (default True when dest ends with .gz)
+    required: False
+    type: bool
+  bulk_load:
+    description:
+      - Path of a data file on the target, sql (a DML statement with bind variables) is executed once for every row of it
+      - Rows are sent batch_size rows at a time using array DML, failed rows do not stop the load and are reported in errors
+      - Named binds (:name) take values of columns of the same name (case insensitive), positional binds (:1, :2) take
+        values in order of columns
+      - Each batch is committed (autocommit), rows loaded before a failure stay in the database
+      - In check mode the data file is read, but the statement is not executed
+    required: False
+    type: path
+  bulk_format:
+    description:
+      - Format of bulk_load file, .gz files are decompressed
+      - csv - header line with column names followed by one line per row, empty values are NULL
+      - jsonl - one JSON object (or array for positional binds) per line
+      - Default is jsonl for .jsonl and .json files (optionally .gz), csv otherwise
+    required: False
+    choices: ['csv', 'jsonl']
+  batch_size:
+    description: Number of rows of bulk_load file sent to the database in one round trip
+    required: False
+    default: 1000
+    type: int
+  max_errors:
+    description: Fail when more than this number of rows of bulk_load file could not be loaded
+    required: False
+    default: 0
+    type: int
+  tracking_table:
+    description:
+      - Name of a table ([schema.]table) recording scripts executed successfully, created when it does not exist
+      - A script (file path or inline) whose SHA-256 checksum is recorded as completed is skipped, changed is False
+      - When a previous run of the same script failed, execution resumes with the statement which failed
+      - Scripts are not tracked when not set
+    required: False
+  force:
+    description: Execute a tracked script from its first statement even when it completed or failed before
+    required: False
+    default: False
+    type: bool
+  background:
+    description:
+      - Submit sql or script as a one-off DBMS_SCHEDULER job and return its job_name immediately
+      - Statements are executed by EXECUTE IMMEDIATE in one PL/SQL block followed by commit, which must fit into 4000 characters
+      - The job drops itself when finished, its result is kept in dba_scheduler_job_run_details
+      - In check mode the job is not created
+    required: False
+    default: False
+    type: bool
+  job_name:
+    description:
+      - Name ([owner.]name) of the background job, generated when not set
+      - Without sql and script, return state of the job (status mode), the module fails when the job failed
+      - Status mode returns finished (True when the job ended), state, error, started and duration
+      - Use it with until/retries to wait for a background job
+    required: False
+  call_timeout:
+    description:
+      - Maximum time in seconds a single statement (or fetch) may take, 0 means no limit
+      - A statement running longer is cancelled and the module fails with timeout=True, the statement and elapsed time
+      - Can be set for all modules by ANSIBLE_ORACLE_CALL_TIMEOUT environment variable
+    required: False
+    type: int
+  perf:
+    description:
+      - Return timing of connect and timing, rows and round trips (measured in v$mystat) of every executed statement under perf key
+      - Can be enabled for all modules by setting ANSIBLE_ORACLE_PERF environment variable
+    required: False
+    default: False
+    type: bool
 notes:
   - cx_Oracle needs to be installed
   - Oracle client libraries need to be installed along with ORACLE_HOME settings.
@@ -47,7 +173,33 @@ EXAMPLES = '''
   become_user: "{{ oracle_owner }}"
   become_method: sudo
 
-# Execute several arbitrary SQL statements (each statement must end with a semicolon at end of line)
+# Fetch a large result set in compact columnar format
+- oracle_sql:
+    mode: sysdba
+    sql: "select owner, object_name, object_type from dba_objects"
+    arraysize: 1000
+    max_rows: 500000
+    result_format: compact
+  register: _oracle_objects
+
+# Stream a large select into a compressed CSV file on the database server
+- oracle_sql:
+    mode: sysdba
+    sql: "select owner, object_name, object_type, created from dba_objects"
+    arraysize: 5000
+    dest: /u01/export/objects.csv.gz
+  register: _oracle_export
+
+# Load reference data from a CSV file on the database server (header: code,name)
+- oracle_sql:
+    mode: sysdba
+    sql: "insert into app.countries (code, name) values (:code, :name)"
+    bulk_load: /u01/import/countries.csv
+    batch_size: 5000
+    max_errors: 10
+  register: _oracle_load
+
+# Execute several arbitrary SQL statements (each statement must end with a semicolon)
 - oracle_sql:
     hostname: "foo.server.net"
     username: "foo"
@@ -57,7 +209,7 @@ EXAMPLES = '''
         insert into foo (f1, f2) values ('ab', 'cd');
         update foo set f2 = 'fg' where f1 = 'ab';
 
-# Execute several arbitrary PL/SQL blocks (must end with a trailing slash)
+# Execute several arbitrary PL/SQL blocks (each must end with a line holding only a slash)
 - oracle_sql:
     hostname: "foo.server.net"
     username: "foo"
@@ -78,13 +230,40 @@ EXAMPLES = '''
     mode: sysdba
     script: '@/u01/scripts/create-all-the-procedures.sql'
 
+# Schema migration executed once, skipped while the file is unchanged, resumed after a failure
+- oracle_sql:
+    mode: sysdba
+    script: '@/u01/scripts/migration-042.sql'
+    tracking_table: system.ansible_script_history
+
+# Rebuild an index in the background and wait for it in a later task
+- oracle_sql:
+    mode: sysdba
+    sql: "alter index app.orders_ix rebuild online"
+    background: true
+  register: _rebuild
+
+- oracle_sql:
+    mode: sysdba
+    job_name: "{{ _rebuild.job_name }}"
+  register: _rebuild_status
+  until: _rebuild_status.finished
+  retries: 240
+  delay: 30
+
+# Data migration script, consecutive DML statements are executed 100 per round trip
+- oracle_sql:
+    mode: sysdba
+    script: '@/u01/scripts/migrate-reference-data.sql'
+    batch_dml: true
+
 # Execute SQL file included in playbook
 - oracle_sql:
     mode: sysdba
     script: "{{ lookup('file', role_path + '/files/role_script.sql') }}"
 '''
 
-import os, re
+import csv, gzip, hashlib, io, itertools, json, os, re, tempfile, time, uuid
 from ansible.module_utils.basic import AnsibleModule
 
 # In this case we do import from local project project sub-directory <project-dir>/module_utils
@@ -98,30 +277,379 @@ from ansible.module_utils.basic import AnsibleModule
 # In thise we do import from collections
 try:
     from ansible_collections.ibre5041.ansible_oracle_modules.plugins.module_utils.oracle_utils import oracleConnection
+    from ansible_collections.ibre5041.ansible_oracle_modules.plugins.module_utils.oracle_script import split_statements, is_dml, scriptError
 except:
     pass
 
 
 output_lines = []
 
+# Rows written to dest per batch when arraysize is not set
+DEST_BATCH_SIZE = 1000
+
+
+class checksumWriter:
+    """Binary file wrapper counting and checksumming (sha1, like Ansible's checksum) bytes written to the file"""
+
+    def __init__(self, f):
+        self.f = f
+        self.bytes = 0
+        self.sha1 = hashlib.sha1()
+
+    def write(self, data):
+        self.f.write(data)
+        self.bytes += len(data)
+        self.sha1.update(data)
+        return len(data)
+
+    def flush(self):
+        self.f.flush()
+
+
+def dest_value(value):
+    """Value of a column as written to dest file: LOBs are read, other non-JSON types become strings"""
+    if hasattr(value, 'read'):
+        value = value.read()
+    if isinstance(value, bytes):
+        return value.hex()
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return str(value)
+
+
+def write_dest(module, conn, sql, dest):
+    """Stream rows of the select into dest file, return dictionary of module results"""
+    dest_format = module.params['dest_format']
+    compress = module.params['compress']
+    if compress is None:
+        compress = dest.endswith('.gz')
+    batch_size = module.params['arraysize'] or DEST_BATCH_SIZE
+
+    started = time.time()
+    column_names, rows = conn.iter_select(sql, arraysize=batch_size, prefetchrows=module.params['prefetchrows'],
+                                          max_rows=module.params['max_rows'])
+    fd, tmp = tempfile.mkstemp(prefix='.%s.' % os.path.basename(dest), dir=os.path.dirname(dest) or '.')
+    count = 0
+    moved = False
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            writer = checksumWriter(f)
+            # mtime=0 and no file name in gzip header, so the same rows give the same checksum
+            out = gzip.GzipFile(filename='', mode='wb', fileobj=writer, mtime=0) if compress else writer
+            text = io.StringIO()
+            if dest_format == 'csv':
+                lines = csv.writer(text, lineterminator='\n')
+                lines.writerow(column_names)
+            while True:
+                batch = list(itertools.islice(rows, batch_size))
+                if not batch:
+                    break
+                for row in batch:
+                    values = [dest_value(value) for value in row]
+                    if dest_format == 'csv':
+                        lines.writerow(values)
+                    else:
+                        text.write(json.dumps(dict(zip(column_names, values)), default=str) + '\n')
+                count += len(batch)
+                out.write(text.getvalue().encode('utf-8'))
+                text.seek(0)
+                text.truncate()
+            if dest_format == 'csv' and count == 0:
+                out.write(text.getvalue().encode('utf-8'))
+            if compress:
+                out.close()
+        checksum = writer.sha1.hexdigest()
+        changed = not os.path.exists(dest) or module.sha1(dest) != checksum
+        if changed:
+            module.atomic_move(tmp, dest)
+            moved = True
+    finally:
+        # also when fail_json (SystemExit) is raised by the fetch: max_rows, call timeout, database error
+        if not moved and os.path.exists(tmp):
+            os.unlink(tmp)
+    return dict(changed=changed, dest=dest, rows=count, bytes=writer.bytes, checksum=checksum,
+                columns=column_names, elapsed=round(time.time() - started, 3))
+
+
+def parse_script(module, text):
+    """Statements of script, fail when it uses SQL*Plus commands which can not be executed"""
+    try:
+        return split_statements(text)
+    except scriptError as e:
+        module.fail_json(msg=str(e), changed=False)
 
-def execute_statements(conn, script):
+
+def execute_statements(module, conn, statements, skip=0):
     """Execute several statements.
 
-    This function determines if it's dealing with PL/SQL blocks or multi-statement queries. It cannot deal with both.
-    PL/SQL blocks is defined by a trailing slash (/).
-    If there is no trailing slash, it's considered multi-statement queries separated by a semicolon.
+    statements -- list returned by split_statements(), SQL statements and PL/SQL blocks can be mixed
+    skip -- number of statements (not counting SQL*Plus commands) which are not executed
+    With batch_dml consecutive DML statements are queued and shipped as blocks by conn.flush(),
+    any other statement flushes the queue before it is executed.
     """
     global output_lines
 
-    if re.search(r'/\s*$', script):  # If it's PL/SQL blocks
-        seperator = r'^\s*/\s*$'
-    else:  # If it's SQL statements
-        seperator = r';\s*$'
+    conn.deferred = module.params['batch_dml']
+    for statement in statements:
+        if statement.kind == 'sqlplus':
+            module.warn('SQL*Plus command at line %d ignored: %s' % (statement.line, statement.text))
+        elif skip:
+            skip -= 1
+        elif conn.deferred and is_dml(statement):
+            conn.execute_ddl(statement.text)
+        else:
+            output_lines += conn.execute_statement(statement.text)
+    conn.flush()
+    conn.deferred = False
+
+
+TRACKING_TABLE_RE = re.compile(r'^([a-z][\w$#]*\.)?[a-z][\w$#]*$', re.IGNORECASE)
+
+TRACKING_TABLE_DDL = """create table %s (
+    script varchar2(1000) not null,
+    checksum varchar2(64) not null,
+    status varchar2(10) not null,
+    statements_done number not null,
+    statements_total number not null,
+    started timestamp with time zone,
+    completed timestamp with time zone,
+    error varchar2(4000),
+    primary key (script, checksum))"""
+
+TRACKING_MERGE = """merge into %s t
+using (select :script script, :checksum checksum from dual) s
+on (t.script = s.script and t.checksum = s.checksum)
+when matched then update set t.status = :status, t.statements_done = :done, t.statements_total = :total, t.error = :error,
+    t.started = case when :status = 'RUNNING' then systimestamp else t.started end,
+    t.completed = case when :status = 'COMPLETED' then systimestamp end
+when not matched then insert (script, checksum, status, statements_done, statements_total, started, error)
+    values (s.script, s.checksum, :status, :done, :total, systimestamp, :error)"""
+
+
+def tracking_table_exists(module, conn, table):
+    """Create tracking table when it does not exist, return False when it does not exist (check mode)"""
+    owner, _, name = table.upper().rpartition('.')
+    sql = "select count(*) from all_tables where owner = nvl(:owner, sys_context('userenv', 'current_schema')) and table_name = :name"
+    if conn.execute_select(sql, {'owner': owner or None, 'name': name}, fetchone=True)[0]:
+        return True
+    conn.execute_ddl(TRACKING_TABLE_DDL % table, no_change=True)
+    return not module.check_mode
+
+
+def record_tracking(module, conn, table, script, checksum, status, done, total, error=None):
+    binds = {'script': script, 'checksum': checksum, 'status': status, 'done': done, 'total': total,
+             'error': error[:4000] if error else None}
+    _, errors = conn.execute_many(TRACKING_MERGE % table, [binds])
+    if errors:
+        module.fail_json(msg='Can not update %s: %s' % (table, errors[0][2]), code=errors[0][1], ddls=conn.ddls)
+
+
+def execute_tracked_script(module, conn, script, text):
+    """
+    Execute script unless the tracking table records it completed, resume it after the statement which failed last time.
+    Progress is recorded when the script starts, fails (the module fails) and completes.
+    """
+    table = module.params['tracking_table']
+    if not TRACKING_TABLE_RE.match(table):
+        module.fail_json(msg='Invalid tracking_table name: %s' % table, changed=False)
+    checksum = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    statements = parse_script(module, text)
+    total = len([s for s in statements if s.kind != 'sqlplus'])
+
+    skip = 0
+    if tracking_table_exists(module, conn, table):
+        sql = 'select status, statements_done from %s where script = :script and checksum = :checksum' % table
+        row = conn.execute_select(sql, {'script': script, 'checksum': checksum}, fetchone=True)
+        if row and not module.params['force']:
+            status, done = row
+            if status == 'COMPLETED':
+                module.exit_json(msg='Script %s (sha256 %s) already completed.' % (script, checksum), changed=False,
+                                 skipped=True, checksum=checksum, ddls=conn.ddls)
+            skip = int(done)
+
+    record_tracking(module, conn, table, script, checksum, 'RUNNING', skip, total)
+    executed = len(conn.ddls)
+    fail_json = module.fail_json
+
+    class trackingFailed(Exception):
+        pass
+
+    def tracking_failed(**kwargs):
+        raise trackingFailed(kwargs.get('msg'))
+
+    def record_failure(**kwargs):
+        # the original error is reported also when the session can not record it
+        module.fail_json = tracking_failed
+        done = skip + len(conn.ddls) - executed
+        try:
+            record_tracking(module, conn, table, script, checksum, 'FAILED', done, total, kwargs.get('msg'))
+        except trackingFailed as e:
+            module.warn('Failure of script not recorded in %s: %s' % (table, e))
+        module.fail_json = fail_json
+        kwargs.update(checksum=checksum, resume_from=done + 1 if done < total else None)
+        fail_json(**kwargs)
+
+    module.fail_json = record_failure
+    execute_statements(module, conn, statements, skip)
+    module.fail_json = fail_json
+    record_tracking(module, conn, table, script, checksum, 'COMPLETED', total, total)
+    return checksum, skip
+
+
+# Limit of job_action of DBMS_SCHEDULER.CREATE_JOB
+JOB_ACTION_MAX_LENGTH = 4000
+JOB_NAME_RE = re.compile(r'^([a-z][\w$#]*\.)?[a-z][\w$#]*$', re.IGNORECASE)
+
+CREATE_JOB = """begin
+  dbms_scheduler.create_job(job_name => :job_name, job_type => 'PLSQL_BLOCK', job_action => :job_action,
+                            enabled => true, auto_drop => true, comments => 'Submitted by Ansible oracle_sql');
+end;"""
+
+# Job (while it exists) and its latest run, in one round trip. Run details of an earlier job of the same name
+# must not be reported while the job exists and did not finish.
+JOB_STATUS_SQL = """select 'JOB' source, j.state, null error#, null additional_info,
+       to_char(j.last_start_date, 'YYYY-MM-DD"T"HH24:MI:SS TZH:TZM') started, null duration
+from dba_scheduler_jobs j
+where j.owner = nvl(:owner, sys_context('userenv', 'current_schema')) and j.job_name = :name
+union all
+select * from (
+  select 'RUN', d.status, d.error#, d.additional_info, to_char(d.actual_start_date, 'YYYY-MM-DD"T"HH24:MI:SS TZH:TZM'),
+         to_char(d.run_duration)
+  from dba_scheduler_job_run_details d
+  where d.owner = nvl(:owner, sys_context('userenv', 'current_schema')) and d.job_name = :name
+  order by d.actual_start_date desc nulls last, d.log_id desc
+) where rownum = 1"""
 
-    for query in re.split(seperator, script, flags=re.MULTILINE):
-        if query.strip():
-            output_lines += conn.execute_statement(query.strip())
+FINISHED_JOB_STATES = ('SUCCEEDED', 'FAILED', 'STOPPED', 'BROKEN', 'COMPLETED', 'DISABLED')
+
+
+def job_action(statements):
+    """PL/SQL block executing statements (texts) by EXECUTE IMMEDIATE, followed by commit"""
+    lines = ['begin']
+    for statement in statements:
+        lines.append("  execute immediate '%s';" % statement.replace("'", "''"))
+    lines.append('  commit;')
+    lines.append('end;')
+    return '\n'.join(lines)
+
+
+def submit_background(module, conn, statements):
+    """Create one-off scheduler job executing statements, return its name"""
+    job_name = module.params['job_name'] or 'ANSIBLE_SQL_%s' % uuid.uuid4().hex[:16].upper()
+    if not JOB_NAME_RE.match(job_name):
+        module.fail_json(msg='Invalid job_name: %s' % job_name, changed=False)
+    action = job_action(statements)
+    if len(action) > JOB_ACTION_MAX_LENGTH:
+        module.fail_json(msg='Background job action is %d characters long, limit is %d' % (len(action), JOB_ACTION_MAX_LENGTH),
+                         changed=False)
+    conn.execute_statement(CREATE_JOB, {'job_name': job_name.upper(), 'job_action': action})
+    return job_name.upper()
+
+
+def job_status(module, conn, job_name):
+    """Return dictionary of module results describing state of background job"""
+    if not JOB_NAME_RE.match(job_name):
+        module.fail_json(msg='Invalid job_name: %s' % job_name, changed=False)
+    owner, _, name = job_name.upper().rpartition('.')
+    rows = dict((row[0], row[1:]) for row in conn.execute_select(JOB_STATUS_SQL, {'owner': owner or None, 'name': name}))
+    if not rows:
+        return dict(changed=False, job_name=job_name, state='NOT_FOUND', finished=True, failed=True,
+                    msg='Job %s not found' % job_name)
+    if 'JOB' in rows and (rows['JOB'][0] not in FINISHED_JOB_STATES or 'RUN' not in rows):
+        state, code, info, started, duration = rows['JOB']
+        finished = state in FINISHED_JOB_STATES
+    else:
+        # dropped when finished (auto_drop), or finished and its run is the latest one
+        state, code, info, started, duration = rows['RUN']
+        finished = True
+    failed = finished and state != 'SUCCEEDED'
+    return dict(changed=False, job_name=job_name, state=state, finished=finished, failed=failed, error=code or None,
+                msg=info or 'Job %s %s' % (job_name, state.lower()), started=started, duration=duration)
+
+
+# Failed rows of bulk_load reported in module result, all of them are counted in error_count
+MAX_REPORTED_ERRORS = 100
+
+BIND_RE = re.compile(r'(?<![:\w]):(\w+)')
+
+
+def bind_names(sql):
+    """Names of bind variables of statement (lower case, in order of appearance), string literals and comments are skipped"""
+    text = re.sub(r"'[^']*'|--[^\n]*|/\*.*?\*/", ' ', sql, flags=re.DOTALL)
+    names = []
+    for name in BIND_RE.findall(text):
+        if name.lower() not in names:
+            names.append(name.lower())
+    return names
+
+
+def bulk_rows(path, bulk_format, binds):
+    """Yield bind values for every row of data file: dictionaries for named binds, lists for positional ones"""
+    positional = all(name.isdigit() for name in binds)
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8', newline='') as f:
+        if bulk_format == 'csv':
+            reader = csv.reader(f)
+            header = [name.strip().lower() for name in next(reader, [])]
+            missing = [name for name in binds if not positional and name not in header]
+            if missing:
+                raise ValueError('Bind variables %s not found in header of %s' % (', '.join(missing), path))
+            index = [header.index(name) for name in binds] if not positional else None
+            for line in reader:
+                if not line:
+                    continue
+                values = [value if value != '' else None for value in line]
+                if positional:
+                    yield values[:len(binds)]
+                else:
+                    yield dict((name, values[i] if i < len(values) else None) for name, i in zip(binds, index))
+        else:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    raise ValueError('Invalid JSON at line %d of %s: %s' % (number, path, e))
+                if isinstance(record, list):
+                    yield record[:len(binds)]
+                elif positional:
+                    raise ValueError('Positional binds need JSON arrays, line %d of %s' % (number, path))
+                else:
+                    record = dict((key.lower(), value) for key, value in record.items())
+                    yield dict((name, record.get(name)) for name in binds)
+
+
+def bulk_load(module, conn, sql, path):
+    """Execute DML statement for every row of data file using array DML, return dictionary of module results"""
+    bulk_format = module.params['bulk_format']
+    if bulk_format is None:
+        bulk_format = 'jsonl' if re.search(r'\.jsonl?(\.gz)?$', path) else 'csv'
+    batch_size = max(1, module.params['batch_size'])
+    binds = bind_names(sql)
+    if not binds:
+        module.fail_json(msg='bulk_load needs a statement with bind variables', changed=False)
+
+    started = time.time()
+    rows = bulk_rows(path, bulk_format, binds)
+    count = rowcount = batches = error_count = 0
+    errors = []
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            break
+        rowcounts, batch_errors = conn.execute_many(sql, batch)
+        rowcount += sum(rowcounts)
+        for offset, code, message in batch_errors:
+            error_count += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({'row': count + offset + 1, 'code': code, 'msg': message})
+        count += len(batch)
+        batches += 1
+    if count:
+        conn.ddls.append(sql if not module.check_mode else '--' + sql)
+    return dict(changed=conn.changed or (module.check_mode and count > 0), rows=count, rowcount=rowcount, batches=batches,
+                error_count=error_count, errors=errors, elapsed=round(time.time() - started, 3), ddls=conn.ddls)
 
 
 def main():
@@ -136,41 +664,118 @@ def main():
             oracle_home   = dict(required=False, aliases=['oh']),
 
             sql=dict(required=False),
-            script=dict(required=False),            
+            script=dict(required=False),
+            arraysize=dict(required=False, type='int'),
+            prefetchrows=dict(required=False, type='int'),
+            max_rows=dict(required=False, type='int'),
+            result_format=dict(default='dict', choices=['dict', 'compact']),
+            dest=dict(required=False, type='path'),
+            dest_format=dict(default='csv', choices=['csv', 'jsonl']),
+            compress=dict(required=False, type='bool'),
+            bulk_load=dict(required=False, type='path'),
+            bulk_format=dict(required=False, choices=['csv', 'jsonl']),
+            batch_size=dict(default=1000, type='int'),
+            max_errors=dict(default=0, type='int'),
+            call_timeout=dict(required=False, type='int'),
+            batch_dml=dict(default=False, type='bool'),
+            tracking_table=dict(required=False),
+            background=dict(default=False, type='bool'),
+            job_name=dict(required=False),
+            force=dict(default=False, type='bool'),
+            perf=dict(default=False, type='bool'),
         ),
         required_if=[('mode', 'normal', ('username', 'password', 'service_name'))],
-        required_one_of=[('sql', 'script')],
-        mutually_exclusive=[('sql', 'script')],
+        required_one_of=[('sql', 'script', 'job_name')],
+        mutually_exclusive=[('sql', 'script'), ('dest', 'bulk_load'), ('background', 'dest'), ('background', 'bulk_load'),
+                            ('background', 'tracking_table')],
         required_together=[('username', 'password')],
         supports_check_mode=True
     )
 
     script = module.params["script"]
     sql = module.params["sql"]
+    if module.params['dest'] and not sql:
+        module.fail_json(msg='dest can be used with a select statement (sql) only', changed=False)
+    if module.params['bulk_load'] and not sql:
+        module.fail_json(msg='bulk_load needs a DML statement in sql', changed=False)
     
     conn = oracleConnection(module)
 
+    # State of background job
+    if module.params['job_name'] and not sql and not script:
+        result = job_status(module, conn, module.params['job_name'])
+        if result['failed']:
+            module.fail_json(**result)
+        module.exit_json(**result)
+    # Statement or script executed by a scheduler job
+    if module.params['background']:
+        if sql and re.match(r'^\s*(select|with)\s+', sql, re.IGNORECASE):
+            module.fail_json(msg='A select statement can not be executed in background', changed=False)
+        if sql:
+            statements = [sql.rstrip().rstrip(';')]
+        else:
+            text = script
+            if script.startswith('@'):
+                try:
+                    with open(script.lstrip('@'), 'r') as f:
+                        text = f.read()
+                except IOError as e:
+                    module.fail_json(msg=str(e), changed=False)
+            statements = [s.text for s in parse_script(module, text) if s.kind != 'sqlplus']
+        job_name = submit_background(module, conn, statements)
+        module.exit_json(msg='Background job %s submitted.' % job_name, changed=True, job_name=job_name, ddls=conn.ddls)
+
+    # DML statement executed for every row of data file
+    if sql and module.params['bulk_load']:
+        try:
+            result = bulk_load(module, conn, sql.rstrip().rstrip(';'), module.params['bulk_load'])
+        except (IOError, OSError, ValueError, csv.Error) as e:
+            module.fail_json(msg='Can not read %s: %s' % (module.params['bulk_load'], e), changed=conn.changed, ddls=conn.ddls)
+        msg = '%d rows of %s loaded in %d batches, %d failed.' % (result['rows'] - result['error_count'], module.params['bulk_load'],
+                                                                 result['batches'], result['error_count'])
+        if result['error_count'] > module.params['max_errors']:
+            module.fail_json(msg=msg + ' More than max_errors (%d) rows failed.' % module.params['max_errors'], **result)
+        module.exit_json(msg=msg, **result)
     # Single SELECT or DML, ALTER, DROP, ... statement
-    if sql:
-        if re.match(r'^\s*(select|with)\s+', sql, re.IGNORECASE):
-            result = conn.execute_select_to_dict(sql.rstrip().rstrip(';'))
+    elif sql:
+        if re.match(r'^\s*(select|with)\s+', sql, re.IGNORECASE) and module.params['dest']:
+            if module.check_mode:
+                module.exit_json(msg='Select statement not executed in check mode.', changed=True, dest=module.params['dest'])
+            try:
+                result = write_dest(module, conn, sql.rstrip().rstrip(';'), module.params['dest'])
+            except (IOError, OSError) as e:
+                module.fail_json(msg='Can not write %s: %s' % (module.params['dest'], e), changed=False)
+            module.exit_json(msg='Select statement executed, %d rows written.' % result['rows'], **result)
+        elif module.params['dest']:
+            module.fail_json(msg='dest can be used with a select statement (sql) only', changed=False)
+        elif re.match(r'^\s*(select|with)\s+', sql, re.IGNORECASE):
+            result = conn.execute_select_to_dict(sql.rstrip().rstrip(';'),
+                                                 arraysize=module.params['arraysize'],
+                                                 prefetchrows=module.params['prefetchrows'],
+                                                 max_rows=module.params['max_rows'],
+                                                 compact=module.params['result_format'] == 'compact')
             module.exit_json(msg='Select statement executed.', changed=False, data=result)
         else:
             conn.execute_ddl(sql.rstrip().rstrip(';'))
             module.exit_json(msg='SQL executed: %s' % (sql), changed=True, ddls=conn.ddls)
-    # SQL script embeded in .yaml playbook
-    elif script and not script.startswith('@'):
-        execute_statements(conn, script)
-        module.exit_json(msg='DML or DDL statements executed.', changed=True, ddls=conn.ddls, output_lines=output_lines)
-    # SQL file
+    # SQL script embeded in .yaml playbook, or SQL file
     else:
-        try:
+        if script.startswith('@'):
             file_name = script.lstrip('@')
-            with open(file_name, 'r') as f:
-                execute_statements(conn, f.read())
-            module.exit_json(msg='DML or DDL statements executed.', changed=True, ddls=conn.ddls, output_lines=output_lines)
-        except IOError as e:
-            module.fail_json(msg=str(e), changed=False)
+            try:
+                with open(file_name, 'r') as f:
+                    text = f.read()
+            except IOError as e:
+                module.fail_json(msg=str(e), changed=False)
+        else:
+            file_name = 'inline'
+            text = script
+        if module.params['tracking_table']:
+            checksum, skipped = execute_tracked_script(module, conn, file_name, text)
+            module.exit_json(msg='DML or DDL statements executed.', changed=True, ddls=conn.ddls, output_lines=output_lines,
+                             checksum=checksum, skipped=False, resumed_from=skipped + 1 if skipped else None)
+        execute_statements(module, conn, parse_script(module, text))
+        module.exit_json(msg='DML or DDL statements executed.', changed=True, ddls=conn.ddls, output_lines=output_lines)
 
     module.exit_json(msg="Unhandled exit", changed=False)
 
@@ -50,6 +50,13 @@ options:
   maxsize:
     description: If autoextend, the maximum size of the datafile (1M, 50M, 1G etc). If empty, defaults to database limits
     aliases: ['max']
+  call_timeout:
+    description:
+      - Maximum time in seconds a single statement may take (e.g. add datafile waiting on a lock), 0 means no limit
+      - A statement running longer is cancelled and the module fails with timeout=True, the statement and elapsed time
+      - Requires Oracle Client 18c or newer
+    required: False
+    type: int
 notes:
   - cx_Oracle needs to be installed
 requirements: [ "cx_Oracle" ]
@@ -135,6 +142,7 @@ EXAMPLES = '''
     nextsize: "1M"
     maxsize: "10M"
 '''
+import time
 
 try:
     import cx_Oracle
@@ -147,13 +155,13 @@ else:
 # Check if the tablespace exists
 def check_tablespace_exists(module, msg, cursor, tablespace):
 
-    sql = 'select tablespace_name, status from dba_tablespaces where tablespace_name = upper(\'%s\')' % tablespace
+    sql = 'select tablespace_name, status from dba_tablespaces where tablespace_name = upper(:tablespace)'
 
     global tsname
     global status
 
     try:
-        cursor.execute(sql)
+        cursor.execute(sql, {'tablespace': tablespace})
         #result = cursor.fetchone()[0]
         result = cursor.fetchall()
         count = cursor.rowcount
@@ -357,8 +365,8 @@ def ensure_tablespace_state (module,msg,cursor,tablespace, state, datafile, numf
         maxsize = 'unlimited'
 
 
-    statussql = 'select status from dba_tablespaces where tablespace_name = upper(\'%s\')' % (tablespace)
-    current_status = execute_sql_get(module,msg,cursor,statussql)
+    statussql = 'select status from dba_tablespaces where tablespace_name = upper(:tablespace)'
+    current_status = execute_sql_get(module,msg,cursor,statussql, {'tablespace': tablespace})
     wanted_status,enforcesql = map_status(state,current_status[0][0])
     # msg = 'ws: %s, curr: %s, sql: %s' % (wanted_status,current_status,enforcesql)
     # module.exit_json(msg=msg,changed=False)
@@ -367,8 +375,8 @@ def ensure_tablespace_state (module,msg,cursor,tablespace, state, datafile, numf
         alter_tbs_list.append(sql)
 
     alter_tbs_sql = 'alter tablespace %s' % (tablespace)
-    numfiles_curr_sql = 'select count(*) from %s where tablespace_name = upper(\'%s\')' % (dfsource,tablespace)
-    numfiles_curr_ = execute_sql_get(module,msg,cursor,numfiles_curr_sql)
+    numfiles_curr_sql = 'select count(*) from %s where tablespace_name = upper(:tablespace)' % (dfsource)
+    numfiles_curr_ = execute_sql_get(module,msg,cursor,numfiles_curr_sql, {'tablespace': tablespace})
     crfiles = numfiles_curr_[0][0]
     #module.exit_json(msg=skip_datafile, changed=False)
 
@@ -637,9 +645,9 @@ def get_tablespace_files(module, msg, cursor, tablespace):
 
     sql = 'select f.file_name from dba_data_files f, dba_tablespaces d '
     sql += 'where f.tablespace_name = d.tablespace_name '
-    sql += 'and d.tablespace_name = upper(\'%s\')' % tablespace
+    sql += 'and d.tablespace_name = upper(:tablespace)'
     try:
-            cursor.execute(sql)
+            cursor.execute(sql, {'tablespace': tablespace})
             result = cursor.fetchall()
     except cx_Oracle.DatabaseError as exc:
             error, = exc.args
@@ -697,10 +705,10 @@ def drop_tablespace(msg, cursor, tablespace):
 
     return True
 
-def execute_sql_get(module, msg, cursor, sql):
+def execute_sql_get(module, msg, cursor, sql, params=None):
 
     try:
-        cursor.execute(sql)
+        cursor.execute(sql, params or {})
         result = (cursor.fetchall())
     except cx_Oracle.DatabaseError as exc:
         error, = exc.args
@@ -710,10 +718,16 @@ def execute_sql_get(module, msg, cursor, sql):
     return result
 
 def execute_sql(module, msg, cursor, sql):
+    started = time.time()
     try:
         cursor.execute(sql)
     except cx_Oracle.DatabaseError as exc:
         error, = exc.args
+        if is_call_timeout(error):
+            elapsed = round(time.time() - started, 3)
+            call_timeout = session_settings(module)['call_timeout']  # module param or ANSIBLE_ORACLE_CALL_TIMEOUT
+            msg = 'Call timeout of %s seconds exceeded, statement cancelled after %s seconds' % (call_timeout, elapsed)
+            module.fail_json(msg=msg, timeout=True, call_timeout=call_timeout, request=sql, elapsed=elapsed, changed=False)
         msg = 'Something went wrong while executing - %s sql: %s' % (error.message, sql)
         module.fail_json(msg=msg, changed=False)
         return False
@@ -746,6 +760,7 @@ def main():
             autoextend    = dict(default=False, type='bool'),
             nextsize      = dict(required=False, aliases=['next']),
             maxsize       = dict(required=False, aliases=['max']),
+            call_timeout  = dict(required=False, type='int'),
         ),
         mutually_exclusive = [['datafile','numfiles']],
         supports_check_mode=True
@@ -807,6 +822,7 @@ from ansible.module_utils.basic import *
 # In thise we do import from collections
 try:
     from ansible_collections.ibre5041.ansible_oracle_modules.plugins.module_utils.oracle_utils import oracle_connect
+    from ansible_collections.ibre5041.ansible_oracle_modules.plugins.module_utils.oracle_session import is_call_timeout, session_settings
 except:
     pass
     
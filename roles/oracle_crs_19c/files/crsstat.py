@@ -13,6 +13,12 @@ except ImportError:
     psutil = None
 # psutil = None
 
+# Resource model of ansible_oracle_modules collection, copied next to this script by role oracle_crs_19c
+try:
+    from oracle_crs import crsModel, instance_server, instance_state
+except ImportError:
+    crsModel = None
+
 """
 The MIT License (MIT)
 
@@ -166,6 +172,34 @@ def get_crs_status(statopt, grid_home=None, test=False):
     return out
 
 
+def get_model_resources(grid_home=None):
+    """
+    using crsModel (single crsctl stat res -f) to get the resource attributes
+    :rtype: list of dict
+    :return: list of resources sorted by basetype
+    """
+    if not grid_home:
+        grid_home = get_gridhome()
+    model = crsModel.load(os.path.join(grid_home, 'bin', 'crsctl'))
+    resources = []
+    for res in model.resources.values():
+        metas = []
+        for instance in res.instances:
+            meta = dict(instance)
+            meta.setdefault('TARGET', '')
+            meta.setdefault('STATE_DETAILS', '')
+            meta['NODE'] = instance_server(instance) or ''
+            meta['FSTATE'] = instance_state(instance)
+            metas.append(meta)
+        resources.append({'NAME': res.name,
+                          'TYPE': res.type,
+                          'BASETYPE': res.basetype,
+                          'FTYPE': '{}:{}'.format(decode_types(res.type), res.basetype),
+                          'NODE_CNT': len(metas),
+                          'NODE_STATUS': metas})
+    return sorted(resources, key=itemgetter('BASETYPE'), reverse=True)
+
+
 def get_resource_attributes(test=False):
     """
     using crsctl status resource  to get the resource attributes
@@ -173,6 +207,8 @@ def get_resource_attributes(test=False):
     :return: list of resources sorted by basetype
 
     """
+    if crsModel is not None and not test:
+        return get_model_resources()
     res_basetypes = get_resource_basetypes(test=test)
     resources = []
     resource = {}
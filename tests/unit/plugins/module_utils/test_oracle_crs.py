@@ -0,0 +1,78 @@
+"""
+Parsing of crsctl stat res -f output into crsModel.
+"""
+
+import importlib.util
+import os
+
+MODULE_UTILS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', '..', 'plugins', 'module_utils')
+
+spec = importlib.util.spec_from_file_location('oracle_crs', os.path.join(MODULE_UTILS_DIR, 'oracle_crs.py'))
+oracle_crs = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(oracle_crs)
+
+# Cluster database with two instances, one per block repeating NAME, and local listener in verbose layout
+CRSCTL_OUTPUT = """NAME=ora.orcl.db
+TYPE=ora.database.type
+DB_UNIQUE_NAME=ORCL
+ORACLE_HOME=/u01/app/oracle/product/19.0.0/dbhome_1
+GEN_USR_ORA_INST_NAME@SERVERNAME(node1)=ORCL1
+GEN_USR_ORA_INST_NAME@SERVERNAME(node2)=ORCL2
+USR_ORA_INST_NAME=
+ID=ora.orcl.db 1 1
+LAST_SERVER=node1
+STATE=ONLINE on node1
+TARGET=ONLINE
+CARDINALITY_ID=1
+
+NAME=ora.orcl.db
+TYPE=ora.database.type
+ID=ora.orcl.db 2 1
+LAST_SERVER=node2
+STATE=OFFLINE
+TARGET=ONLINE
+CARDINALITY_ID=2
+
+NAME=ora.LISTENER.lsnr
+TYPE=ora.listener.type
+LAST_SERVER=node1
+STATE=ONLINE on node1
+TARGET=ONLINE
+CARDINALITY_ID=node1
+
+LAST_SERVER=node2
+STATE=INTERMEDIATE on node2
+TARGET=ONLINE
+CARDINALITY_ID=node2
+
+NAME=ora.asm
+TYPE=ora.asm.type
+GEN_USR_ORA_INST_NAME=+ASM
+"""
+
+
+def test_resources_and_instances():
+    model = oracle_crs.crsModel.parse(CRSCTL_OUTPUT)
+    assert sorted(model.resources) == ['ora.LISTENER.lsnr', 'ora.asm', 'ora.orcl.db']
+    db = model.resource('ora.orcl.db')
+    assert db['ORACLE_HOME'] == '/u01/app/oracle/product/19.0.0/dbhome_1'
+    assert [i['LAST_SERVER'] for i in db.instances] == ['node1', 'node2']
+    assert db.basetype == 'cluster'
+    assert model.resource('ora.LISTENER.lsnr').basetype == 'local'
+    assert [oracle_crs.instance_state(i) for i in model.resource('ora.LISTENER.lsnr').instances] == ['ONLINE', 'INTERMEDIATE']
+
+
+def test_indexes():
+    model = oracle_crs.crsModel.parse(CRSCTL_OUTPUT)
+    assert model.database('orcl').name == 'ora.orcl.db'
+    assert model.instance('ORCL2').name == 'ora.orcl.db'
+    assert model.instance('+ASM').name == 'ora.asm'
+    assert model.instance('+ASM', types=('ora.database.type',)) is None
+    assert [r.name for r in model.on_server('node2')] == ['ora.orcl.db', 'ora.LISTENER.lsnr']
+    assert [r.name for r in model.of_type('ora.database.type', 'ora.asm.type')] == ['ora.asm', 'ora.orcl.db']
+
+
+def test_empty_output():
+    model = oracle_crs.crsModel.parse('')
+    assert len(model) == 0
+    assert model.instance('ORCL') is None
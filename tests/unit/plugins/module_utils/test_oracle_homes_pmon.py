@@ -0,0 +1,141 @@
+"""
+pmon scanner of oracle_homes on a synthetic /proc tree.
+
+Run as a script to print scan time versus process count:
+    python tests/unit/plugins/module_utils/test_oracle_homes_pmon.py [count ...]
+The reference scan is the former glob of /proc/[0-9]*/cmdline. Note that on a synthetic tree reading cmdline
+is as cheap as reading comm; on a real host reading /proc/<pid>/cmdline has to access memory of the process
+(mmap lock), which is where most of the time of the reference scan goes on busy database hosts.
+"""
+
+import glob
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pytest
+
+MODULE_UTILS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', '..', 'plugins', 'module_utils')
+
+
+def _load_oracle_homes():
+    spec = importlib.util.spec_from_file_location('oracle_homes', os.path.join(MODULE_UTILS_DIR, 'oracle_homes.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+oracle_homes = _load_oracle_homes()
+
+# (comm, cmdline, exe) of pmon processes, comm is truncated to 15 characters by the kernel
+PMONS = [
+    ('ora_pmon_ORCL', 'ora_pmon_ORCL', '/u01/app/oracle/product/19.0.0/dbhome_1/bin/oracle'),
+    ('ora_pmon_LONGSI', 'ora_pmon_LONGSID_1', '/u01/app/oracle/product/21.0.0/dbhome_1/bin/oracle'),
+    ('asm_pmon_+ASM', 'asm_pmon_+ASM', '/u01/app/19.0.0/grid/bin/oracle'),
+]
+
+OTHERS = [
+    ('oracleORCL', 'oracleORCL (LOCAL=NO)'),
+    ('ora_p001_ORCL', 'ora_p001_ORCL'),
+    ('bash', '-bash'),
+    ('sshd', '/usr/sbin/sshd\x00-D'),
+]
+
+
+def make_proc_tree(root, count):
+    """Create count fake processes below root, the first ones are pmon processes of PMONS"""
+    for pid in range(1, count + 1):
+        piddir = os.path.join(root, str(pid))
+        os.mkdir(piddir)
+        if pid <= len(PMONS):
+            comm, cmdline, exe = PMONS[pid - 1]
+            os.symlink(exe, os.path.join(piddir, 'exe'))
+        else:
+            comm, cmdline = OTHERS[pid % len(OTHERS)]
+        with open(os.path.join(piddir, 'comm'), 'w') as f:
+            f.write(comm + '\n')
+        with open(os.path.join(piddir, 'cmdline'), 'w') as f:
+            f.write(cmdline + '\x00')
+    for name in ('self', 'meminfo', 'sys'):
+        open(os.path.join(root, name), 'w').close()
+
+
+def reference_scan(root):
+    """Former implementation: read cmdline of every process"""
+    found = []
+    for cmd_line_file in glob.glob(os.path.join(root, '[0-9]*', 'cmdline')):
+        with open(cmd_line_file) as x:
+            cmd_line = x.read().rstrip('\x00')
+        if cmd_line.startswith(oracle_homes.PMON_PREFIXES):
+            found.append((os.path.dirname(cmd_line_file), cmd_line))
+    return found
+
+
+@pytest.fixture
+def proc_root(tmp_path):
+    make_proc_tree(str(tmp_path), 200)
+    return str(tmp_path)
+
+
+def test_pmon_processes(proc_root):
+    found = sorted(oracle_homes.pmon_processes(proc_root))
+    assert found == sorted(reference_scan(proc_root))
+    assert sorted(cmd_line for _, cmd_line in found) == sorted(cmdline for _, cmdline, _ in PMONS)
+
+
+def test_running_instances_full_sid_from_cmdline(proc_root):
+    instances = oracle_homes.oracle_homes.running_instances(proc_root)
+    assert instances == {
+        'ORCL': '/u01/app/oracle/product/19.0.0/dbhome_1',
+        'LONGSID_1': '/u01/app/oracle/product/21.0.0/dbhome_1',
+        '+ASM': '/u01/app/19.0.0/grid',
+    }
+
+
+def test_running_instances_cache(proc_root, tmp_path, monkeypatch):
+    monkeypatch.setattr(oracle_homes.tempfile, 'tempdir', str(tmp_path / 'tmp'))
+    os.mkdir(str(tmp_path / 'tmp'))
+    instances = oracle_homes.oracle_homes.running_instances(proc_root, cache=True)
+    # cached PIDs still run: served from the cache without scanning /proc
+    monkeypatch.setattr(oracle_homes, 'pmon_processes', lambda proc_root: iter(()))
+    assert oracle_homes.oracle_homes.running_instances(proc_root, cache=True) == instances
+    # pmon of ORCL is gone
+    os.unlink(os.path.join(proc_root, '1', 'cmdline'))
+    assert oracle_homes.oracle_homes.running_instances(proc_root, cache=True) == {}
+
+
+def test_vanished_process_is_skipped(proc_root):
+    os.unlink(os.path.join(proc_root, '1', 'cmdline'))
+    os.unlink(os.path.join(proc_root, '2', 'comm'))
+    assert [cmd_line for _, cmd_line in oracle_homes.pmon_processes(proc_root)] == ['asm_pmon_+ASM']
+
+
+def test_missing_proc_root(tmp_path):
+    assert list(oracle_homes.pmon_processes(str(tmp_path / 'missing'))) == []
+
+
+def benchmark(counts, repeat=3):
+    print('%10s %14s %14s' % ('processes', 'cmdline [ms]', 'comm [ms]'))
+    for count in counts:
+        root = tempfile.mkdtemp(prefix='proc')
+        try:
+            make_proc_tree(root, count)
+            timings = []
+            for scan in (reference_scan, lambda r: list(oracle_homes.pmon_processes(r))):
+                best = None
+                for _ in range(repeat):
+                    started = time.time()
+                    scan(root)
+                    elapsed = time.time() - started
+                    best = elapsed if best is None else min(best, elapsed)
+                timings.append(best * 1000)
+            print('%10d %14.1f %14.1f' % (count, timings[0], timings[1]))
+        finally:
+            shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    benchmark([int(c) for c in sys.argv[1:]] or [1000, 5000, 20000])
@@ -0,0 +1,125 @@
+"""
+Splitting of SQL*Plus scripts into statements by oracle_script.split_statements.
+"""
+
+import importlib.util
+import os
+
+import pytest
+
+MODULE_UTILS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', '..', 'plugins', 'module_utils')
+
+spec = importlib.util.spec_from_file_location('oracle_script', os.path.join(MODULE_UTILS_DIR, 'oracle_script.py'))
+oracle_script = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(oracle_script)
+
+split_statements = oracle_script.split_statements
+
+MIXED_SCRIPT = """set serveroutput on
+-- comment; with semicolon
+insert into t values ('a;b', q'[it's; ]');
+update t set x = 1 /* ; */ where y = 'it''s;';
+create or replace
+package body p as
+  procedure x is begin null; end;
+end;
+/
+begin
+  dbms_output.put_line('
+/
+');
+end;
+/
+exec dbms_stats.gather_table_stats('A', 'B');
+select 1 from dual
+/
+set transaction read only;
+delete from t; delete from "a;b";
+"""
+
+
+def test_mixed_script():
+    statements = split_statements(MIXED_SCRIPT)
+    assert [(s.kind, s.line) for s in statements] == [
+        ('sqlplus', 1), ('sql', 2), ('sql', 4), ('plsql', 5), ('plsql', 10), ('plsql', 16), ('sql', 17), ('sql', 19),
+        ('sql', 20), ('sql', 20)]
+    assert statements[1].text == "-- comment; with semicolon\ninsert into t values ('a;b', q'[it's; ]')"
+    assert statements[2].text == "update t set x = 1 /* ; */ where y = 'it''s;'"
+    assert statements[3].text == 'create or replace\npackage body p as\n  procedure x is begin null; end;\nend;'
+    assert statements[4].text == "begin\n  dbms_output.put_line('\n/\n');\nend;"
+    assert statements[5].text == "begin dbms_stats.gather_table_stats('A', 'B'); end;"
+    assert statements[6].text == 'select 1 from dual'
+    assert statements[7].text == 'set transaction read only'
+    assert statements[9].text == 'delete from "a;b"'
+
+
+@pytest.mark.parametrize('script', [
+    'create or replace trigger t before insert on x for each row begin :new.id := 1; end;\n/\n',
+    'CREATE OR REPLACE EDITIONABLE FUNCTION f RETURN NUMBER IS BEGIN RETURN 1; END;\n/',
+    'create type t as object (x number);\n/\n',
+    'declare\n  x number;\nbegin\n  x := 1;\nend;\n/\n',
+    '<<outer>>\nbegin\n  null;\nend;',
+])
+def test_plsql_ends_with_slash(script):
+    statements = split_statements(script)
+    assert len(statements) == 1
+    assert statements[0].kind == 'plsql'
+    assert statements[0].text.lower().rstrip().endswith(';')
+
+
+def test_q_quote_delimiters():
+    statements = split_statements("select q'{a;}' from dual; select q'!b;'!' from dual; select nq'<c;>' from dual;")
+    assert [s.text for s in statements] == ["select q'{a;}' from dual", "select q'!b;'!' from dual",
+                                            "select nq'<c;>' from dual"]
+
+
+def test_comment_only_and_empty():
+    assert split_statements('') == []
+    assert split_statements('-- nothing\n/* to do; */\n/\n') == []
+
+
+@pytest.mark.parametrize('text, dml', [
+    ('insert into t values (1)', True),
+    ('/* x */ merge into t using s on (1 = 1) when matched then update set x = 1', True),
+    ('-- purge\ndelete from t', True),
+    ('update t set x = 1', True),
+    ('create table t (x number)', False),
+    ('select 1 from dual', False),
+])
+def test_is_dml(text, dml):
+    assert oracle_script.is_dml(oracle_script.scriptStatement(text, 'sql', 1)) == dml
+
+
+@pytest.mark.parametrize('command', [
+    'connect app/pw', 'conn / as sysdba', 'disconnect', '@other.sql', '@@child.sql', 'start other.sql',
+    'define x = 1', 'accept x prompt "X: "', 'host rm -f x', '!ls', 'whenever sqlerror continue',
+])
+def test_unsupported_commands_fail(command):
+    with pytest.raises(oracle_script.scriptError, match='line 2'):
+        split_statements('select 1 from dual;\n%s\ncreate table foo (x number);\n' % command)
+
+
+def test_formatting_commands_and_exit():
+    statements = split_statements('whenever sqlerror exit failure\nset echo on\ncolumn x format a10\n'
+                                  'select 1 from dual;\nexit\ndrop table foo;\n')
+    assert [s.kind for s in statements] == ['sqlplus', 'sqlplus', 'sqlplus', 'sql']
+
+
+
+@pytest.mark.parametrize('statement', [
+    "insert into t values ('&name');", 'select &&col from dual;', 'select * from t where x = &1;',
+    "exec p('&x');", "begin p(q'[it's &x]'); end;\n/", "insert into t values ('a\n&name');",
+])
+def test_substitution_variables_fail(statement):
+    with pytest.raises(oracle_script.scriptError, match='Substitution variable at line [23]'):
+        split_statements('select 1 from dual;\n%s\n' % statement)
+
+
+def test_substitution_disabled_or_in_comment():
+    statements = split_statements("-- R&D\nselect 1 /* &x */ from dual;\nset define off\n"
+                                  "insert into t values ('&name');\nset define on\nselect 'a & b' from dual;\n"
+                                  "set define ^\nselect '&x' from dual;\n")
+    assert [s.kind for s in statements] == ['sql', 'sqlplus', 'sql', 'sqlplus', 'sql', 'sqlplus', 'sql']
+    assert statements[2].text == "insert into t values ('&name')"
+    with pytest.raises(oracle_script.scriptError, match='line 2'):
+        split_statements("set define ^\nselect '^x' from dual;\n")
@@ -0,0 +1,142 @@
+"""
+Lookup queries of modules must use bind variables, values formatted into the SQL text
+make every object/host combination a distinct hard parse.
+
+Detects SELECT statements where a value is formatted into a quoted SQL literal:
+    'select ... where name = \'%s\'' % name
+    "select ... where name = '{}'".format(name)
+    "select ... where name = '" + name + "'"
+    f"select ... where name = '{name}'"
+Formatting identifiers (table names) or generated bind placeholders is not reported.
+"""
+
+import ast
+import glob
+import os
+import re
+import warnings
+
+import pytest
+
+MODULES_DIR = os.path.join(os.path.dirname(__file__), '..', '..', '..', '..', 'plugins', 'modules')
+
+SELECT_RE = re.compile(r'\bselect\b', re.IGNORECASE)
+QUOTED_PLACEHOLDER_RE = re.compile(r"'(%[-0-9.]*[sdif]|%\(\w+\)[sdif]|\{[^{}]*\})'")
+
+# (module file, text of statement) of statements which are not executed through a database cursor
+ALLOWED = {
+    # user supplied query wrapped into dbms_xmlgen for a SQL*Plus script, quotes are escaped
+    ('oracle_sqldba.py', 'dbms_xmlgen.getxml'),
+}
+
+
+def _string(node):
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return None
+
+
+def _add_operands(node):
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+        return _add_operands(node.left) + _add_operands(node.right)
+    return [node]
+
+
+def _text(node):
+    """All string constants of an expression"""
+    return ' '.join(s for s in (_string(n) for n in ast.walk(node)) if s)
+
+
+def _interpolations(node):
+    """Line numbers where a value is formatted into a quoted SQL literal within expression node"""
+    found = set()
+    for n in ast.walk(node):
+        template = None
+        if isinstance(n, ast.BinOp) and isinstance(n.op, ast.Mod):
+            template = _string(n.left)
+        elif isinstance(n, ast.Call) and isinstance(n.func, ast.Attribute) and n.func.attr == 'format':
+            template = _string(n.func.value)
+        if template and QUOTED_PLACEHOLDER_RE.search(template):
+            found.add(n.lineno)
+        elif isinstance(n, ast.BinOp) and isinstance(n.op, ast.Add):
+            strings = [_string(o) for o in _add_operands(n)]
+            if any(s is not None and s.endswith("'") and strings[i + 1] is None for i, s in enumerate(strings[:-1])):
+                found.add(n.lineno)
+        elif isinstance(n, ast.JoinedStr):
+            parts = n.values
+            if any(isinstance(part, ast.FormattedValue) and (_string(parts[i - 1]) or '').endswith("'")
+                   for i, part in enumerate(parts[1:], 1)):
+                found.add(n.lineno)
+    return found
+
+
+def _statements(tree):
+    """Yield expressions forming one SQL statement: a value assigned to a variable together with values
+    appended to it later (sql = 'select ...'; sql += "where x = '%s'" % x), and every other expression on its own"""
+    scopes = [tree] + [n for n in ast.walk(tree) if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))]
+    for scope in scopes:
+        assignments = [n for n in ast.walk(scope) if isinstance(n, (ast.Assign, ast.AugAssign))]
+        statements = []
+        current = {}
+        for n in sorted(assignments, key=lambda n: (n.lineno, n.col_offset)):
+            if isinstance(n, ast.Assign) and len(n.targets) == 1 and isinstance(n.targets[0], ast.Name):
+                current[n.targets[0].id] = [n.value]
+                statements.append(current[n.targets[0].id])
+            elif isinstance(n, ast.AugAssign) and isinstance(n.op, ast.Add) and isinstance(n.target, ast.Name):
+                current.setdefault(n.target.id, []).append(n.value)
+        for values in statements:
+            yield values
+    for n in ast.walk(tree):
+        if isinstance(n, ast.expr):
+            yield [n]
+
+
+def literal_selects(source):
+    """Return list of (line number, statement text) of SELECT statements with values interpolated into quoted literals"""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')  # invalid escape sequences in module sources
+        tree = ast.parse(source)
+    found = {}
+    for values in _statements(tree):
+        text = ' '.join(_text(v) for v in values)
+        if not SELECT_RE.search(text):
+            continue
+        for v in values:
+            for line in _interpolations(v):
+                found.setdefault(line, text)
+    return sorted(found.items())
+
+
+MODULES = sorted(glob.glob(os.path.join(MODULES_DIR, '*.py')))
+
+
+@pytest.mark.parametrize('path', MODULES, ids=[os.path.basename(p) for p in MODULES])
+def test_no_literal_selects(path):
+    with open(path) as f:
+        lines = literal_selects(f.read())
+    name = os.path.basename(path)
+    offending = [line for line, text in lines if not any(name == n and allowed in text for n, allowed in ALLOWED)]
+    assert offending == [], 'SELECT with interpolated literal in %s at line(s) %s, use bind variables' % (name, offending)
+
+
+@pytest.mark.parametrize('source', [
+    "sql = 'select 1 from dual where x = \\'%s\\'' % x",
+    "sql = \"select 1 from dual where x = '{}'\".format(x)",
+    "sql = \"select 1 from dual where x = upper('\" + x + \"')\"",
+    "sql = f\"select 1 from dual where x = '{x}'\"",
+    "sql = '''select 1\n from dual\n where x = '%(x)s' ''' % {'x': x}",
+    "def f(x):\n    sql = 'select 1 from dual '\n    sql += \"where x = '%s'\" % x\n",
+])
+def test_detects_literal_select(source):
+    assert literal_selects(source)
+
+
+@pytest.mark.parametrize('source', [
+    "sql = 'select 1 from dual where x = :x'",
+    "sql = 'select count(*) from %s where x = :x' % view",
+    "sql = 'select 1 from dual where x in (%s)' % ','.join(binds)",
+    "sql = \"alter tablespace %s add datafile '%s'\" % (ts, f)",
+    "def f(x):\n    sql = 'alter diskgroup %s ' % x\n    sql += \"add disk '%s'\" % x\n    c = 'select 1 from dual'\n",
+])
+def test_accepts_bind_select(source):
+    assert not literal_selects(source)